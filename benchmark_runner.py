@@ -1,18 +1,219 @@
 import json
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.orc as orc
+import pyarrow.parquet as pq
+
+from format_converter import (FormatConverter, decode_dictionaries, orc_dictionary_threshold, sweep_variants,
+                              variant_id, write_variant)
+from column_statistics import column_profile, column_sketches, load_file_statistics
+from query_plan import REFERENCE_QUERY, QueryPlanner, is_reference_query, load_workload_queries
+from timing_harness import TimingHarness, timed
+from file_inspector import inspect_file
+from orc_metadata import read_orc_column_sizes, read_orc_metadata, stats_usable, stripe_may_match
+from workload_config import COLUMN_KINDS, WORKLOADS, column_kinds, load_workload_config, workload_dataset_path
+
+# Columns per projection subset: a short default, since each width is scanned for
+# every column kind; FULL_PROJECTION_WIDTHS (with per-column scans) is the full sweep.
+PROJECTION_WIDTHS = (1, 5)
+FULL_PROJECTION_WIDTHS = (1, 2, 5, 10, 20)
+
+# Parts of benchmark_workload. The defaults are what the figures, the preliminary
+# results and the paper comparison read: `selection` times only the reference-shaped
+# queries (range on a float_int column), `query_plan` every query the config plans.
+# The others multiply the runtime and are opt-in.
+SUITES = ("layout", "full_scan", "selection", "query_plan", "projection", "write", "io_strategies", "aggregation")
+DEFAULT_SUITES = ("layout", "full_scan", "selection")
+
+# What a full scan converts the decoded Arrow table into:
+#   arrow  - nothing, pure format decode
+#   numpy  - one ndarray per column, zero-copy where Arrow allows it
+#   pandas - a DataFrame materialized with df.values (the original benchmark)
+SCAN_ENGINES = ("arrow", "numpy", "pandas")
+
+# warm: iterations run back to back on whatever is cached; cold: the file is evicted
+# from the page cache before every iteration
+CACHE_MODES = ("warm", "cold")
+
+# Reader I/O strategies; ORC has no pre-buffering or read_dictionary option, so only
+# buffered and mmap apply to it. With no strategy the library defaults are used.
+IO_STRATEGIES = ("buffered", "pre_buffer", "mmap", "read_dictionary")
+ORC_IO_STRATEGIES = ("buffered", "mmap")
+
+# Aggregation functions the workload configs may declare, as pyarrow.compute calls
+AGGREGATE_FUNCTIONS = {
+    'count': lambda column: pc.count(column).as_py(),
+    'sum': lambda column: pc.sum(column).as_py(),
+    'avg': lambda column: pc.mean(column).as_py(),
+    'std': lambda column: pc.stddev(column).as_py(),
+    'min': lambda column: pc.min_max(column)['min'].as_py(),
+    'max': lambda column: pc.min_max(column)['max'].as_py(),
+}
+
+# single: one write_table call; streaming: a ParquetWriter/ORCWriter fed batch by batch
+WRITE_MODES = ("single", "streaming")
+WRITE_BATCH_ROWS = 64 * 1024
+
+# Scale-factor sweep: geometric row counts, and the metrics fitted as power laws of
+# the row count. A cost growing faster than rows^SUPERLINEAR_EXPONENT over the largest
+# SCALE_TAIL_POINTS points (a rate falling faster than rows^-(SUPERLINEAR_EXPONENT - 1))
+# is flagged; small points are dominated by fixed overheads, so the tail decides.
+SCALE_ROW_COUNTS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+# Scale points scan with the arrow engine, so one curve never mixes engines and no
+# point converts to pandas. Above SCALE_IN_MEMORY_MAX_ROWS only the pushdown selection
+# is timed: the in-memory one needs the whole file as a DataFrame.
+SCALE_SCAN_ENGINE = "arrow"
+SCALE_IN_MEMORY_MAX_ROWS = 1_000_000
+SCALE_METRICS = {
+    'file_size_mb': 'cost',
+    'scan_time_ms': 'cost',
+    'scan_rows_per_sec': 'rate',
+    'selection_time_ms': 'cost',
+    'pushdown_time_ms': 'cost',
+}
+SUPERLINEAR_EXPONENT = 1.1
+SCALE_TAIL_POINTS = 3
+# What a sweep variant is judged on, all lower-is-better
+SWEEP_OBJECTIVES = ('file_size_mb', 'scan_time_ms', 'write_time_ms')
+
+
+def _read_io_counters() -> Dict:
+    """Per-process I/O counters from /proc/self/io, or an empty dict where unavailable."""
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except OSError:
+        return {}
+
+
+def evict_from_page_cache(filepath: str) -> bool:
+    """Drop a file's pages from the OS page cache (no root needed); False where unsupported."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        # Dirty pages are not dropped, so flush anything still being written back first.
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        return True
+    finally:
+        os.close(fd)
+
+
+def _scaling_levels(limit: int) -> list:
+    """1, 2, 4, ... up to and including `limit`."""
+    levels = [1]
+    while levels[-1] * 2 < limit:
+        levels.append(levels[-1] * 2)
+    if limit > 1:
+        levels.append(limit)
+    return levels
+
+
+def _timed_reads(runner: "BenchmarkRunner", filepath: str, n_reads: int, arrow_threads: int) -> Dict:
+    """One independent reader: `n_reads` full decodes of a file, timed individually."""
+    # Only takes effect in a worker process; thread-pool readers share the parent's setting.
+    pa.set_cpu_count(arrow_threads)
+    latencies = []
+    rows = 0
+    start = time.perf_counter()
+    for _ in range(n_reads):
+        read_start = time.perf_counter()
+        table = runner._read_table(filepath)
+        latencies.append(time.perf_counter() - read_start)
+        rows += table.num_rows
+    # perf_counter is CLOCK_MONOTONIC on Linux, so spans compare across processes.
+    return {'start': start, 'end': time.perf_counter(), 'latencies': latencies, 'rows': rows}
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak-RSS mark for this process (Linux), so VmHWM measures from now."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _read_memory_status() -> Dict:
+    """Current (VmRSS) and peak (VmHWM) resident memory in bytes, or {} where unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f)
+        return {key: int(fields[key].split()[0]) * 1024 for key in ("VmRSS", "VmHWM")}
+    except (OSError, KeyError):
+        return {}
+
+
+def scale_row_counts(max_rows: int = SCALE_ROW_COUNTS[-1]) -> tuple:
+    """Geometric row counts (x10 from the first of SCALE_ROW_COUNTS) up to `max_rows`."""
+    counts = []
+    n_rows = SCALE_ROW_COUNTS[0]
+    while n_rows <= max_rows:
+        counts.append(n_rows)
+        n_rows *= 10
+    return tuple(counts)
+
+
+def fit_power_law(rows: list, values: list) -> Dict:
+    """Least-squares fit of values = coefficient * rows^exponent in log-log space."""
+    x = np.log(np.asarray(rows, dtype=float))
+    y = np.log(np.asarray(values, dtype=float))
+    exponent, intercept = np.polyfit(x, y, 1)
+    residual = y - (exponent * x + intercept)
+    total = np.sum((y - y.mean()) ** 2)
+    return {
+        'exponent': float(exponent),
+        'coefficient': float(np.exp(intercept)),
+        'r_squared': float(1 - np.sum(residual ** 2) / total) if total > 0 else 1.0,
+    }
+
+
+def mark_pareto_optimal(variants: list, objectives: tuple = SWEEP_OBJECTIVES) -> list:
+    """Set `pareto_optimal` on each variant: no other is at least as good on every objective and better on one."""
+    for v in variants:
+        v['pareto_optimal'] = not any(
+            all(o[k] <= v[k] for k in objectives) and any(o[k] < v[k] for k in objectives)
+            for o in variants
+        )
+    return variants
 
 
 class BenchmarkRunner:
-    def __init__(self, data_dir: str = "data", results_dir: str = "results", environment: str = None, row_count: int = 1000):
+    def __init__(self, data_dir: str = "data", results_dir: str = "results", environment: str = None, row_count: int = None,
+                 scan_engine: str = "pandas", cache_mode: str = "warm", io_strategy: str = None,
+                 harness: TimingHarness = None, config_dir: str = "configs",
+                 projection_widths: tuple = PROJECTION_WIDTHS, projection_per_column: bool = False,
+                 suites: tuple = DEFAULT_SUITES):
+        if scan_engine not in SCAN_ENGINES:
+            raise ValueError(f"Unsupported scan engine: {scan_engine}")
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported cache mode: {cache_mode}")
+        if io_strategy is not None and io_strategy not in IO_STRATEGIES:
+            raise ValueError(f"Unsupported I/O strategy: {io_strategy}")
+        unknown = set(suites) - set(SUITES)
+        if unknown:
+            raise ValueError(f"Unsupported suites: {sorted(unknown)}")
         self.data_dir = data_dir
         self.results_dir = results_dir
+        # None: the rows in each workload's config
         self.row_count = row_count
+        self.scan_engine = scan_engine
+        self.cache_mode = cache_mode
+        self.io_strategy = io_strategy
+        self.harness = harness or TimingHarness()
+        self.config_dir = config_dir
+        self.projection_widths = tuple(projection_widths)
+        self.projection_per_column = projection_per_column
+        self.suites = tuple(s for s in SUITES if s in suites)
         os.makedirs(results_dir, exist_ok=True)
         
         if environment is None:
@@ -29,63 +230,648 @@ class BenchmarkRunner:
     def measure_file_size(self, filepath: str) -> float:
         return os.path.getsize(filepath) / (1024 * 1024)
 
-    def _read_file(self, filepath: str):
+    def _read_file(self, filepath: str, columns: list = None):
         """Read file based on extension."""
         if filepath.endswith('.parquet'):
-            return pd.read_parquet(filepath)
+            return pd.read_parquet(filepath, columns=columns)
         elif filepath.endswith('.orc'):
-            return orc.read_table(filepath).to_pandas()
+            return orc.read_table(filepath, columns=columns).to_pandas()
         else:
             raise ValueError(f"Unsupported file format: {filepath}")
 
-    def measure_full_scan(self, filepath: str, iterations: int = 5) -> Dict:
-        times = []
-        for _ in range(iterations):
+    def _read_table(self, filepath: str, columns: list = None, io_strategy: str = None) -> pa.Table:
+        """Decode file into an Arrow table, optionally projecting columns."""
+        io_strategy = io_strategy or self.io_strategy
+        if filepath.endswith('.parquet'):
+            if io_strategy is None:
+                return pq.read_table(filepath, columns=columns)
+            options = {'memory_map': io_strategy == "mmap", 'pre_buffer': io_strategy != "buffered"}
+            if io_strategy == "read_dictionary":
+                schema = pq.read_schema(filepath)
+                options['read_dictionary'] = [
+                    f.name for f in schema if pa.types.is_string(f.type) or pa.types.is_large_string(f.type)
+                    or pa.types.is_dictionary(f.type)
+                ]
+            return pq.read_table(filepath, columns=columns, **options)
+        elif filepath.endswith('.orc'):
+            if io_strategy is None:
+                return orc.read_table(filepath, columns=columns)
+            if io_strategy not in ORC_IO_STRATEGIES:
+                raise ValueError(f"I/O strategy {io_strategy} does not apply to ORC")
+            source = pa.memory_map(filepath) if io_strategy == "mmap" else pa.OSFile(filepath)
+            with source:
+                return orc.ORCFile(source).read(columns=columns)
+        else:
+            raise ValueError(f"Unsupported file format: {filepath}")
+
+    def measure_io_strategies(self, filepath: str, iterations: int = 5) -> Dict:
+        """Full-file decode latency and resident-memory cost under each reader I/O strategy."""
+        # rss_delta_mb: memory still held after the read; peak_rss_delta_mb: the high-water mark during it.
+        # arrow_allocated_mb counts memory-pool buffers only, so it drops for zero-copy reads.
+        strategies = ORC_IO_STRATEGIES if filepath.endswith('.orc') else IO_STRATEGIES
+        results = {}
+        for strategy in strategies:
+            rss_deltas = []
+            peak_deltas = []
+            allocated = []
+
+            def read_once():
+                can_track = _reset_peak_rss()
+                before = _read_memory_status()
+                pool_before = pa.total_allocated_bytes()
+                start = time.perf_counter()
+                table = self._read_table(filepath, io_strategy=strategy)
+                elapsed = time.perf_counter() - start
+                after = _read_memory_status()
+                allocated.append(pa.total_allocated_bytes() - pool_before)
+                if before and after:
+                    rss_deltas.append(after['VmRSS'] - before['VmRSS'])
+                    if can_track:
+                        peak_deltas.append(after['VmHWM'] - before['VmRSS'])
+                del table
+                return elapsed
+
+            results[strategy] = self.harness.report(self.harness.run(read_once, iterations))
+            results[strategy].update({
+                'arrow_allocated_mb': np.mean(allocated) / (1024 * 1024),
+                'rss_delta_mb': np.mean(rss_deltas) / (1024 * 1024) if rss_deltas else None,
+                'peak_rss_delta_mb': max(peak_deltas) / (1024 * 1024) if peak_deltas else None
+            })
+        return results
+
+    def _column_disk_bytes(self, filepath: str) -> Dict[str, int]:
+        if filepath.endswith('.parquet'):
+            metadata = pq.ParquetFile(filepath).metadata
+            sizes = dict.fromkeys(metadata.schema.names, 0)
+            for rg in range(metadata.num_row_groups):
+                row_group = metadata.row_group(rg)
+                for i in range(row_group.num_columns):
+                    chunk = row_group.column(i)
+                    sizes[chunk.path_in_schema] += chunk.total_compressed_size
+            return sizes
+        return read_orc_column_sizes(filepath)
+
+    def _write_table(self, table: pa.Table, path: str, format_type: str, mode: str, batch_rows: int):
+        if format_type == "orc":
+            dictionary = any(pa.types.is_dictionary(field.type) for field in table.schema)
+            table = decode_dictionaries(table)
+            options = {'dictionary_key_size_threshold': orc_dictionary_threshold(dictionary)}
+
+        if mode == "single":
+            if format_type == "parquet":
+                pq.write_table(table, path)
+            else:
+                orc.write_table(table, path, **options)
+            return
+
+        if format_type == "parquet":
+            writer = pq.ParquetWriter(path, table.schema)
+        else:
+            writer = orc.ORCWriter(path, **options)
+        with writer:
+            for batch in table.to_batches(max_chunksize=batch_rows):
+                writer.write(pa.Table.from_batches([batch]))
+
+    def measure_write(self, table: pa.Table, format_type: str, mode: str = "single",
+                      iterations: int = 5, batch_rows: int = WRITE_BATCH_ROWS) -> Dict:
+        """Time encoding an in-memory Arrow table to Parquet or ORC (throughput over its in-memory size)."""
+        if format_type not in ("parquet", "orc"):
+            raise ValueError(f"Unsupported format: {format_type}")
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode: {mode}")
+
+        path = os.path.join(self.data_dir, f".write_benchmark.{format_type}")
+        peaks = []
+
+        def write_once():
+            can_track = _reset_peak_rss()
+            before = _read_memory_status()
             start = time.perf_counter()
-            df = self._read_file(filepath)
-            _ = df.values
-            end = time.perf_counter()
-            times.append(end - start)
+            self._write_table(table, path, format_type, mode, batch_rows)
+            elapsed = time.perf_counter() - start
+            after = _read_memory_status()
+            if can_track and before and after:
+                peaks.append(after['VmHWM'] - before['VmRSS'])
+            return elapsed
 
-        return {
-            'mean_time_ms': np.mean(times) * 1000,
-            'std_time_ms': np.std(times) * 1000,
-            'rows_per_sec': len(df) / np.mean(times)
+        try:
+            run = self.harness.run(write_once, iterations)
+            output_size = os.path.getsize(path)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+        mean_time = np.mean(run['samples']['total'])
+        results = {
+            'format': format_type,
+            'mode': mode,
+            'batch_rows': batch_rows if mode == "streaming" else None,
         }
+        results.update(self.harness.report(run))
+        results.update({
+            'mb_per_sec': table.nbytes / (1024 * 1024) / mean_time,
+            'rows_per_sec': table.num_rows / mean_time,
+            'peak_rss_mb': max(peaks) / (1024 * 1024) if peaks else None,
+            'output_size_mb': output_size / (1024 * 1024)
+        })
+        return results
 
-    def measure_selection_query(self, filepath: str, column: str,
-                                selectivity: float, iterations: int = 5) -> Dict:
-        df = self._read_file(filepath)
+    def _numeric_columns(self, filepath: str) -> list:
+        if filepath.endswith('.parquet'):
+            schema = pq.read_schema(filepath)
+        else:
+            schema = orc.ORCFile(filepath).schema
+        return [f.name for f in schema if pa.types.is_integer(f.type) or pa.types.is_floating(f.type)]
+
+    def _metadata_aggregates(self, filepath: str, columns: list) -> Dict:
+        """Aggregates answerable from file statistics alone, as {column: {function: value}}."""
+        # Parquet row groups give count/min/max; ORC file statistics add sum (and so avg).
+        answers = {}
+        if filepath.endswith('.parquet'):
+            metadata = pq.read_metadata(filepath)
+            indices = {metadata.schema.column(i).name: i for i in range(metadata.num_columns)}
+            for name in columns:
+                count, mins, maxes, complete = 0, [], [], True
+                for rg in range(metadata.num_row_groups):
+                    stats = metadata.row_group(rg).column(indices[name]).statistics
+                    if stats is None:
+                        complete = False
+                        break
+                    count += stats.num_values
+                    if stats.has_min_max:
+                        mins.append(stats.min)
+                        maxes.append(stats.max)
+                    elif stats.num_values:
+                        complete = False
+                answers[name] = {}
+                if complete:
+                    answers[name]['count'] = count
+                    if mins:
+                        answers[name].update({'min': min(mins), 'max': max(maxes)})
+            return answers
+
+        file_stats = read_orc_metadata(filepath)['file_statistics']
+        for name in columns:
+            stats = file_stats.get(name)
+            answers[name] = {}
+            if stats is None:
+                continue
+            answers[name]['count'] = stats['num_values']
+            if stats_usable(stats):
+                answers[name].update({'min': stats['min'], 'max': stats['max']})
+            if stats['sum'] is not None and stats['sum'] == stats['sum']:
+                answers[name]['sum'] = stats['sum']
+                if stats['num_values']:
+                    answers[name]['avg'] = stats['sum'] / stats['num_values']
+        return answers
+
+    def measure_aggregation(self, filepath: str, functions: list, iterations: int = 5) -> Dict:
+        """Run aggregate `functions` over every numeric column, via pyarrow.compute and via file statistics."""
+        unknown = [f for f in functions if f not in AGGREGATE_FUNCTIONS]
+        if unknown:
+            raise ValueError(f"Unsupported aggregation functions: {unknown}")
+        columns = self._numeric_columns(filepath)
+
+        computed = {}
+
+        def compute_once():
+            start = time.perf_counter()
+            table = self._read_table(filepath, columns=columns)
+            for name in columns:
+                computed[name] = {f: AGGREGATE_FUNCTIONS[f](table[name]) for f in functions}
+            return time.perf_counter() - start
+
+        answered = {}
+
+        def metadata_once():
+            start = time.perf_counter()
+            answered.update(self._metadata_aggregates(filepath, columns))
+            return time.perf_counter() - start
+
+        results = {'functions': functions, 'columns': columns}
+        for path, query in (('compute', compute_once), ('metadata', metadata_once)):
+            io_before = _read_io_counters()
+            run = self.harness.run(query, iterations)
+            io_after = _read_io_counters()
+            calls = len(run['samples']['total']) + len(run['warmup'])
+            results[path] = self.harness.report(run)
+            results[path]['bytes_read'] = (io_after['rchar'] - io_before['rchar']) // calls \
+                if io_before and io_after else None
 
-        sorted_vals = df[column].dropna().sort_values()
-        threshold_idx = int(len(sorted_vals) * selectivity)
-        threshold = sorted_vals.iloc[threshold_idx]
+        disk_bytes = self._column_disk_bytes(filepath)
+        results['compute']['bytes_touched'] = sum(disk_bytes[name] for name in columns)
+        if filepath.endswith('.parquet'):
+            metadata = pq.read_metadata(filepath)
+            results['metadata']['bytes_touched'] = metadata.serialized_size + 8
+        else:
+            results['metadata']['bytes_touched'] = read_orc_metadata(filepath)['tail_bytes']
+
+        results['metadata']['unanswered'] = [
+            f for f in functions if not all(f in answered[name] for name in columns)
+        ]
+        # An empty or all-null column aggregates to None, which only None matches.
+        results['metadata']['matches_compute'] = all(
+            computed[name][f] is None and value is None
+            or computed[name][f] is not None and value is not None
+            and bool(np.isclose(computed[name][f], value, rtol=1e-9))
+            for name in columns for f, value in answered[name].items() if f in functions
+        )
+        return results
+
+    def _predicate_value(self, filepath: str, column: str, predicate: str, selectivity: float):
+        """Predicate operand for `selectivity`, from the column's sketch in the statistics sidecar."""
+        sketch = column_sketches(load_file_statistics(filepath))[column]
+        if predicate == "range":
+            return sketch.threshold(selectivity)
+        if predicate == "equality":
+            return sketch.equality_value(selectivity)[0]
+        if predicate == "in_list":
+            return sketch.in_list(selectivity)[0]
+        return None
+
+    def _pandas_mask(self, series: pd.Series, predicate: str, value) -> pd.Series:
+        if predicate == "is_null":
+            return series.isna()
+        if predicate == "equality":
+            return series == value
+        if predicate == "in_list":
+            return series.isin(value)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Unordered categoricals do not support <, and their categories are in
+            # dictionary order rather than string order: compare the categories
+            # themselves, then look each row's code up (code -1, null, never matches).
+            below = np.append(np.asarray(series.cat.categories < value), False)
+            return pd.Series(below[series.cat.codes.to_numpy()], index=series.index)
+        return series < value
+
+    def _predicate_expression(self, column: str, predicate: str, value) -> pc.Expression:
+        field = pc.field(column)
+        if predicate == "is_null":
+            return field.is_null()
+        if predicate == "equality":
+            return field == value
+        if predicate == "in_list":
+            return field.isin(value)
+        return field < value
+
+    def _convert_table(self, table: pa.Table, engine: str):
+        if engine == "arrow":
+            return table
+        elif engine == "numpy":
+            return [column.to_numpy() for column in table.columns]
+        elif engine == "pandas":
+            return table.to_pandas().values
+        else:
+            raise ValueError(f"Unsupported scan engine: {engine}")
+
+    def measure_full_scan(self, filepath: str, iterations: int = 5, engine: str = None,
+                          cache_mode: str = None) -> Dict:
+        """Time decoding the whole file and converting it with the scan engine, separately."""
+        engine = engine or self.scan_engine
+        cache_mode = cache_mode or self.cache_mode
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported cache mode: {cache_mode}")
+
+        disk_bytes = []
+        evicted = [cache_mode == "cold"]
+        num_rows = []
 
-        times = []
-        for _ in range(iterations):
+        def scan_once():
+            if cache_mode == "cold":
+                evicted[0] = evict_from_page_cache(filepath) and evicted[0]
+            io_before = _read_io_counters()
             start = time.perf_counter()
-            result = df[df[column] < threshold]
-            _ = result.values
+            table = self._read_table(filepath)
+            decoded = time.perf_counter()
+            _ = self._convert_table(table, engine)
             end = time.perf_counter()
-            times.append(end - start)
+            io_after = _read_io_counters()
+            if io_before and io_after:
+                disk_bytes.append(io_after['read_bytes'] - io_before['read_bytes'])
+            num_rows.append(table.num_rows)
+            return {'decode': decoded - start, 'conversion': end - decoded}
 
-        return {
-            'mean_time_ms': np.mean(times) * 1000,
+        run = self.harness.run(scan_once, iterations)
+        times = run['samples']['total']
+        first_read = run['warmup'][0] if run['warmup'] else times[0]
+        steady = times if run['warmup'] or len(times) == 1 else times[1:]
+
+        results = {'engine': engine, 'cache_mode': cache_mode, 'cache_evicted': evicted[0]}
+        results.update(self.harness.report(run))
+        results.update({
+            'rows_per_sec': num_rows[-1] / np.mean(times),
+            'first_read_time_ms': first_read * 1000,
+            'steady_state_mean_time_ms': np.mean(steady) * 1000,
+            'steady_state_std_time_ms': np.std(steady) * 1000,
+            'decode_rows_per_sec': num_rows[-1] / np.mean(run['samples']['decode']),
+            'disk_bytes_read': float(np.mean(disk_bytes)) if disk_bytes else None,
+            'file_bytes': os.path.getsize(filepath)
+        })
+        for phase in ('decode', 'conversion'):
+            summary = self.harness.summarize(run['samples'][phase], prefix=f'{phase}_')
+            summary.pop(f'{phase}_samples_ms')
+            results.update(summary)
+        return results
+
+    def measure_projection_scan(self, filepath: str, columns: list, iterations: int = 5) -> Dict:
+        """Time decoding only `columns`; throughput is over the decoded Arrow bytes."""
+        tables = []
+
+        def read_once():
+            start = time.perf_counter()
+            tables[:] = [self._read_table(filepath, columns=columns)]
+            return time.perf_counter() - start
+
+        run = self.harness.run(read_once, iterations)
+        table = tables[0]
+        mean_time = np.mean(run['samples']['total'])
+        results = {'columns': columns, 'n_columns': len(columns)}
+        results.update(self.harness.report(run))
+        results.update({
+            'bytes_decoded': table.nbytes,
+            'mb_per_sec': table.nbytes / (1024 * 1024) / mean_time,
+            'rows_per_sec': table.num_rows / mean_time
+        })
+        return results
+
+    def dataset_path(self, workload: str, format_type: str) -> str:
+        return workload_dataset_path(workload, format_type, self.data_dir, self.row_count, self.config_dir)
+
+    def _column_kinds(self, filepath: str, names: list) -> Dict[str, str]:
+        """Column kinds from the config of the workload the file was generated for."""
+        workload = os.path.basename(filepath).split('_')[0]
+        return column_kinds(load_workload_config(workload, self.config_dir), names)
+
+    def benchmark_projection(self, filepath: str, iterations: int = 5, widths: tuple = None,
+                             per_column: bool = None) -> Dict:
+        """Scan the first N columns of each kind (and of all) per width, plus every column alone with `per_column`."""
+        widths = widths or self.projection_widths
+        per_column = self.projection_per_column if per_column is None else per_column
+        if filepath.endswith('.parquet'):
+            names = pq.ParquetFile(filepath).schema_arrow.names
+        else:
+            names = orc.ORCFile(filepath).schema.names
+        kinds = self._column_kinds(filepath, names)
+        disk_bytes = self._column_disk_bytes(filepath)
+
+        subsets = []
+        for kind in COLUMN_KINDS + ('mixed',):
+            candidates = names if kind == 'mixed' else [n for n in names if kinds[n] == kind]
+            for width in widths:
+                if width > len(candidates):
+                    break
+                result = self.measure_projection_scan(filepath, candidates[:width], iterations)
+                result['kind'] = kind
+                subsets.append(result)
+
+        if not per_column:
+            return {'subsets': subsets}
+
+        columns = []
+        for name in names:
+            result = self.measure_projection_scan(filepath, [name], iterations)
+            columns.append({
+                'column': name,
+                'kind': kinds[name],
+                'mean_time_ms': result['mean_time_ms'],
+                'bytes_decoded': result['bytes_decoded'],
+                'bytes_on_disk': disk_bytes.get(name),
+                'mb_per_sec': result['mb_per_sec']
+            })
+
+        per_kind = {}
+        for kind in COLUMN_KINDS:
+            cols = [c for c in columns if c['kind'] == kind]
+            if not cols:
+                continue
+            total_ms = sum(c['mean_time_ms'] for c in cols)
+            decoded = sum(c['bytes_decoded'] for c in cols)
+            per_kind[kind] = {
+                'columns': len(cols),
+                'mean_time_ms_per_column': total_ms / len(cols),
+                'bytes_decoded': decoded,
+                'bytes_on_disk': sum(c['bytes_on_disk'] or 0 for c in cols),
+                'mb_per_sec': decoded / (1024 * 1024) / (total_ms / 1000)
+            }
+
+        return {'subsets': subsets, 'per_column': columns, 'per_kind': per_kind}
+
+    def measure_selection_query(self, filepath: str, column: str, selectivity: float, iterations: int = 5,
+                                predicate: str = "range", value=None, df: pd.DataFrame = None) -> Dict:
+        """Time a predicate over the file loaded into pandas (`df` reuses a loaded DataFrame)."""
+        if value is None and predicate != "is_null":
+            value = self._predicate_value(filepath, column, predicate, selectivity)
+        if df is None:
+            df = self._read_file(filepath)
+        series = df[column]
+
+        results = {'mode': 'in_memory', 'predicate': predicate}
+        results.update(self.harness.report(
+            self.harness.run(timed(lambda: df[self._pandas_mask(series, predicate, value)].values), iterations)
+        ))
+        results.update({
             'selectivity': selectivity,
-            'rows_selected': len(result),
-            'column': column
+            'rows_selected': int(self._pandas_mask(series, predicate, value).sum()),
+            'column': column,
+            'value': value
+        })
+        return results
+
+    def _pushdown_read_parquet(self, filepath: str, expression: pc.Expression, column: str,
+                               predicate: str, value) -> pa.Table:
+        return pq.read_table(filepath, filters=expression)
+
+    def _pushdown_read_orc(self, filepath: str, expression: pc.Expression, column: str,
+                           predicate: str, value) -> pa.Table:
+        stripe_stats = read_orc_metadata(filepath)['stripe_statistics']
+        # An OSFile rather than the default memory map, so the reads show up in bytes_read.
+        with pa.OSFile(filepath) as source:
+            orc_file = orc.ORCFile(source)
+            batches = [
+                orc_file.read_stripe(i)
+                for i, stats in enumerate(stripe_stats)
+                if stripe_may_match(stats.get(column), value, predicate)
+            ]
+            table = pa.Table.from_batches(batches, schema=orc_file.schema)
+        return table.filter(expression)
+
+    def _pruning_stats(self, filepath: str, column: str, value, predicate: str = "range") -> Dict:
+        """Count the row groups (Parquet) or stripes (ORC) the predicate lets a reader skip."""
+        if filepath.endswith('.parquet'):
+            metadata = pq.ParquetFile(filepath).metadata
+            col_idx = metadata.schema.names.index(column)
+            skipped = 0
+            bytes_scanned = 0
+            for rg in range(metadata.num_row_groups):
+                row_group = metadata.row_group(rg)
+                stats = row_group.column(col_idx).statistics
+                if stats is not None:
+                    stats = {
+                        'min': stats.min if stats.has_min_max else None,
+                        'max': stats.max if stats.has_min_max else None,
+                        'num_values': stats.num_values,
+                        'has_null': not stats.has_null_count or stats.null_count > 0,
+                    }
+                if not stripe_may_match(stats, value, predicate):
+                    skipped += 1
+                else:
+                    bytes_scanned += sum(row_group.column(i).total_compressed_size
+                                         for i in range(row_group.num_columns))
+            return {'pruning_unit': 'row_group', 'units_total': metadata.num_row_groups,
+                    'units_skipped': skipped, 'bytes_scanned': bytes_scanned}
+
+        orc_metadata = read_orc_metadata(filepath)
+        skipped = 0
+        bytes_scanned = 0
+        for stripe, stats in zip(orc_metadata['stripes'], orc_metadata['stripe_statistics']):
+            if stripe_may_match(stats.get(column), value, predicate):
+                bytes_scanned += stripe['index_length'] + stripe['data_length'] + stripe['footer_length']
+            else:
+                skipped += 1
+        return {'pruning_unit': 'stripe', 'units_total': len(orc_metadata['stripes']),
+                'units_skipped': skipped, 'bytes_scanned': bytes_scanned}
+
+    def measure_pushdown_selection(self, filepath: str, column: str, selectivity: float, iterations: int = 5,
+                                   predicate: str = "range", value=None) -> Dict:
+        """Time a predicate end to end, letting the reader prune with file statistics."""
+        # Parquet prunes row groups in pq.read_table(filters=...); ORC reads only the stripes that can match.
+        if value is None and predicate != "is_null":
+            value = self._predicate_value(filepath, column, predicate, selectivity)
+        expression = self._predicate_expression(column, predicate, value)
+        if filepath.endswith('.parquet'):
+            read_query = self._pushdown_read_parquet
+        elif filepath.endswith('.orc'):
+            read_query = self._pushdown_read_orc
+        else:
+            raise ValueError(f"Unsupported file format: {filepath}")
+
+        bytes_read = []
+        rows_selected = []
+
+        def query_once():
+            io_before = _read_io_counters()
+            start = time.perf_counter()
+            result = read_query(filepath, expression, column, predicate, value)
+            elapsed = time.perf_counter() - start
+            io_after = _read_io_counters()
+            if io_before:
+                bytes_read.append(io_after['rchar'] - io_before['rchar'])
+            rows_selected.append(result.num_rows)
+            return elapsed
+
+        results = {'mode': 'pushdown', 'predicate': predicate}
+        results.update(self.harness.report(self.harness.run(query_once, iterations)))
+        results.update({
+            'selectivity': selectivity,
+            'rows_selected': rows_selected[-1],
+            'column': column,
+            'value': value,
+            'bytes_read': int(np.mean(bytes_read)) if bytes_read else None,
+            'file_bytes': os.path.getsize(filepath),
+        })
+        results.update(self._pruning_stats(filepath, column, value, predicate))
+        return results
+
+    def _benchmark_writes(self, workload: str, format_type: str) -> Dict:
+        """Write benchmarks for one format, encoding the workload as loaded from its Parquet file."""
+        table = pq.read_table(self.dataset_path(workload, "parquet"))
+        return {mode: self.measure_write(table, format_type, mode) for mode in WRITE_MODES}
+
+    def measure_thread_scaling(self, filepath: str, max_threads: int = None, iterations: int = 5) -> Dict:
+        """Single-reader scan latency as Arrow's CPU thread pool grows from 1 to `max_threads`."""
+        original = pa.cpu_count()
+        results = {}
+        try:
+            for threads in _scaling_levels(max_threads or os.cpu_count() or 1):
+                pa.set_cpu_count(threads)
+                num_rows = []
+                run = self.harness.run(timed(lambda: num_rows.append(self._read_table(filepath).num_rows)),
+                                       iterations)
+                results[threads] = self.harness.report(run)
+                results[threads]['rows_per_sec'] = num_rows[-1] / np.mean(run['samples']['total'])
+        finally:
+            pa.set_cpu_count(original)
+        return results
+
+    def measure_concurrent_readers(self, filepaths: list, max_readers: int = None, pool: str = "thread",
+                                   reads_per_reader: int = 5, arrow_threads: int = 1) -> Dict:
+        """Aggregate throughput and per-read latency with 1..`max_readers` concurrent readers."""
+        # Reader i scans filepaths[i % len(filepaths)]; the span runs from the first start to the last finish.
+        if pool not in ("thread", "process"):
+            raise ValueError(f"Unsupported pool: {pool}")
+        executor_class = ThreadPoolExecutor if pool == "thread" else ProcessPoolExecutor
+        original = pa.cpu_count()
+        results = {}
+        try:
+            pa.set_cpu_count(arrow_threads)
+            for readers in _scaling_levels(max_readers or os.cpu_count() or 1):
+                with executor_class(max_workers=readers) as executor:
+                    futures = [
+                        executor.submit(_timed_reads, self, filepaths[i % len(filepaths)],
+                                        reads_per_reader, arrow_threads)
+                        for i in range(readers)
+                    ]
+                    runs = [f.result() for f in futures]
+
+                latencies = np.concatenate([run['latencies'] for run in runs])
+                span = max(run['end'] for run in runs) - min(run['start'] for run in runs)
+                results[readers] = {
+                    'rows_per_sec': sum(run['rows'] for run in runs) / span,
+                    'p50_time_ms': np.percentile(latencies, 50) * 1000,
+                    'p99_time_ms': np.percentile(latencies, 99) * 1000,
+                    'mean_time_ms': np.mean(latencies) * 1000
+                }
+        finally:
+            pa.set_cpu_count(original)
+        return results
+
+    def run_scaling_benchmarks(self, formats: list = None, max_concurrency: int = None) -> Dict:
+        """Sweep Arrow threads and concurrent readers per format and save the curves."""
+        if formats is None:
+            formats = ["parquet"]
+        workloads = WORKLOADS
+        all_results = {}
+
+        for fmt in formats:
+            paths = [self.dataset_path(w, fmt) for w in workloads]
+            paths = [p for p in paths if os.path.exists(p)]
+            if not paths:
+                continue
+            print(f"Scaling benchmarks: {fmt}")
+            all_results[fmt] = {
+                'file': os.path.basename(paths[0]),
+                'arrow_threads': self.measure_thread_scaling(paths[0], max_concurrency),
+                'concurrent_readers': {
+                    pool: {
+                        'same_file': self.measure_concurrent_readers(paths[:1], max_concurrency, pool),
+                        'different_files': self.measure_concurrent_readers(paths, max_concurrency, pool)
+                    }
+                    for pool in ("thread", "process")
+                }
+            }
+
+            for pool, curves in all_results[fmt]['concurrent_readers'].items():
+                for target, curve in curves.items():
+                    for readers, r in curve.items():
+                        print(f"  {pool:<8} {target:<16} readers={readers:<3} {r['rows_per_sec']:>14,.0f} rows/s "
+                              f"p50={r['p50_time_ms']:.2f}ms p99={r['p99_time_ms']:.2f}ms")
+
+        metadata = {
+            'environment': self.environment,
+            'cpu_count': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': all_results
         }
+        output_file = os.path.join(self.results_dir, f"scaling_results_{self.environment}.json")
+        with open(output_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        return output_file
 
     def benchmark_workload(self, workload: str, format_type: str = "parquet") -> Dict:
-        """Benchmark a workload for a specific format (parquet or orc)."""
-        if format_type == "parquet":
-            filepath = os.path.join(self.data_dir,
-                                    f"{workload}_r{self.row_count}_c20_generated.parquet")
-        elif format_type == "orc":
-            filepath = os.path.join(self.data_dir,
-                                   f"{workload}_r{self.row_count}_c20_generated.orc")
-        else:
+        """Benchmark a workload for a specific format (parquet or orc), running the runner's suites."""
+        if format_type not in ("parquet", "orc"):
             raise ValueError(f"Unsupported format: {format_type}")
+        filepath = self.dataset_path(workload, format_type)
 
         if not os.path.exists(filepath):
             return None
@@ -94,32 +880,184 @@ class BenchmarkRunner:
             'workload': workload,
             'format': format_type,
             'environment': self.environment,
+            'suites': list(self.suites),
             'file_size_mb': self.measure_file_size(filepath),
-            'full_scan': self.measure_full_scan(filepath),
-            'selection_queries': []
         }
+        if 'layout' in self.suites:
+            results['layout'] = inspect_file(filepath)
+        if 'full_scan' in self.suites:
+            results['full_scan'] = self.measure_full_scan(filepath)
+        if 'projection' in self.suites:
+            results['projection'] = self.benchmark_projection(filepath)
+        if 'write' in self.suites:
+            results['write'] = self._benchmark_writes(workload, format_type)
+        if 'io_strategies' in self.suites:
+            results['io_strategies'] = self.measure_io_strategies(filepath)
+        if 'aggregation' in self.suites:
+            results['aggregation_queries'] = [
+                self.measure_aggregation(filepath, query['functions'])
+                for query in load_workload_queries(self.config_dir, workload)
+                if query.get('type') == 'aggregation'
+            ]
 
-        df = self._read_file(filepath)
-        
-        if 'col_0' in df.columns:
-            test_column = 'col_0'
-        else:
-            test_column = df.columns[0]
+        statistics = load_file_statistics(filepath)
+        results['column_statistics'] = column_profile(statistics)
+        if not {'selection', 'query_plan'} & set(self.suites):
+            return results
 
-        for selectivity in [0.01, 0.1, 0.5]:
-            sel_results = self.measure_selection_query(
-                filepath, test_column, selectivity
-            )
-            results['selection_queries'].append(sel_results)
+        results['selection_queries'] = []
+        results['pushdown_queries'] = []
+        df = self._read_file(filepath)
+        queries = QueryPlanner(self.config_dir).plan(workload, column_sketches(statistics))
+        if 'query_plan' not in self.suites:
+            queries = [q for q in queries if is_reference_query(q)]
+        for query in queries:
+            plan = {k: query[k] for k in ('column', 'selectivity', 'predicate', 'value')}
+            selection = self.measure_selection_query(filepath, df=df, **plan)
+            pushdown = self.measure_pushdown_selection(filepath, **plan)
+            for result in (selection, pushdown):
+                result.update({'column_kind': query['column_kind'],
+                               'planned_selectivity': query['planned_selectivity']})
+            results['selection_queries'].append(selection)
+            results['pushdown_queries'].append(pushdown)
 
         return results
 
+    def measure_scale_point(self, filepath: str, iterations: int = 5) -> Dict:
+        """The scale-sweep metrics of one file: size, full scan and the reference selection."""
+        statistics = load_file_statistics(filepath)
+        sketches = column_sketches(statistics)
+        kinds = self._column_kinds(filepath, list(sketches))
+        column = next(name for name in sketches if kinds[name] == REFERENCE_QUERY['column_kind'])
+        selectivity = REFERENCE_QUERY['selectivity']
+        value = sketches[column].threshold(selectivity)
+        in_memory = statistics['num_rows'] <= SCALE_IN_MEMORY_MAX_ROWS
+
+        scan = self.measure_full_scan(filepath, iterations, engine=SCALE_SCAN_ENGINE)
+        selection = None
+        if in_memory:
+            selection = self.measure_selection_query(filepath, column, selectivity, iterations, value=value)
+        pushdown = self.measure_pushdown_selection(filepath, column, selectivity, iterations, value=value)
+        return {
+            'num_rows': statistics['num_rows'],
+            'file_size_mb': self.measure_file_size(filepath),
+            'scan_engine': SCALE_SCAN_ENGINE,
+            'scan_time_ms': scan['mean_time_ms'],
+            'scan_p99_time_ms': scan['p99_time_ms'],
+            'scan_rows_per_sec': scan['rows_per_sec'],
+            'selection_time_ms': selection['mean_time_ms'] if selection else None,
+            'pushdown_time_ms': pushdown['mean_time_ms'],
+            'pushdown_bytes_read': pushdown.get('bytes_read'),
+        }
+
+    def fit_scaling(self, points: list) -> Dict:
+        """Power-law fit of every SCALE_METRICS metric over the scale points that measured it."""
+        points = sorted(points, key=lambda p: p['num_rows'])
+        fits = {}
+        for metric, kind in SCALE_METRICS.items():
+            measured = [p for p in points if p.get(metric) is not None]
+            rows = [p['num_rows'] for p in measured]
+            values = [p[metric] for p in measured]
+            if len(measured) < 2 or min(values) <= 0:
+                continue
+            fit = fit_power_law(rows, values)
+            tail = max(0, len(measured) - SCALE_TAIL_POINTS)
+            fit['tail_exponent'] = fit_power_law(rows[tail:], values[tail:])['exponent']
+            if kind == 'cost':
+                fit['super_linear'] = fit['tail_exponent'] > SUPERLINEAR_EXPONENT
+            else:
+                fit['super_linear'] = fit['tail_exponent'] < 1 - SUPERLINEAR_EXPONENT
+            fits[metric] = fit
+        return fits
+
+    def benchmark_sweep(self, workload: str, grid: Dict = None, keep_files: bool = False) -> Dict:
+        """Rewrite a workload under every sweep variant, time writing and scanning each and mark the Pareto front."""
+        converter = FormatConverter(self.data_dir, self.row_count)
+        source = self.dataset_path(workload, "parquet")
+        if not os.path.exists(source):
+            return None
+        table = pq.read_table(source)
+
+        variants = []
+        for fmt in ("parquet", "orc"):
+            for variant in sweep_variants(fmt, grid):
+                name = variant_id(variant)
+                path = os.path.join(converter.sweep_dir(workload), f"{name}.{fmt}")
+                write = self.harness.report(self.harness.run(lambda: write_variant(table, path, variant)))
+                scan = self.measure_full_scan(path)
+                variants.append({
+                    'id': name,
+                    'settings': variant,
+                    'file_size_mb': self.measure_file_size(path),
+                    'write_time_ms': write['mean_time_ms'],
+                    'write_p99_time_ms': write['p99_time_ms'],
+                    'scan_p99_time_ms': scan['p99_time_ms'],
+                    'scan_time_ms': scan['mean_time_ms'],
+                    'decode_time_ms': scan['decode_mean_time_ms'],
+                })
+                if not keep_files:
+                    os.remove(path)
+
+        mark_pareto_optimal(variants)
+        return {
+            'workload': workload,
+            'variants': variants,
+            'pareto': [v['id'] for v in sorted(variants, key=lambda v: v['file_size_mb']) if v['pareto_optimal']]
+        }
+
+    def run_sweep(self, workloads: list = None, grid: Dict = None) -> Dict:
+        """Run the encoding/compression sweep and save it with the Pareto table per workload."""
+        if workloads is None:
+            workloads = WORKLOADS
+        all_results = {}
+
+        for workload in workloads:
+            print(f"Sweeping {workload}...")
+            result = self.benchmark_sweep(workload, grid)
+            if result is None:
+                continue
+            all_results[workload] = result
+
+            by_id = {v['id']: v for v in result['variants']}
+            print(f"  {'variant':<48} {'size MB':>9} {'scan ms':>9} {'write ms':>9}")
+            for name in result['pareto']:
+                v = by_id[name]
+                print(f"  {name:<48} {v['file_size_mb']:>9.3f} {v['scan_time_ms']:>9.2f} {v['write_time_ms']:>9.2f}")
+
+        metadata = {
+            'environment': self.environment,
+            'scan_engine': self.scan_engine,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': all_results
+        }
+        output_file = os.path.join(self.results_dir, f"sweep_results_{self.environment}.json")
+        with open(output_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        return output_file
+
+    def save_scale_sweep(self, curves: Dict, row_counts: tuple) -> str:
+        """Write scale-sweep points and fits to scale_sweep_results_<environment>.json."""
+        metadata = {
+            'environment': self.environment,
+            'scan_engine': SCALE_SCAN_ENGINE,
+            'in_memory_max_rows': SCALE_IN_MEMORY_MAX_ROWS,
+            'cache_mode': self.cache_mode,
+            'row_counts': list(row_counts),
+            'superlinear_exponent': SUPERLINEAR_EXPONENT,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': curves
+        }
+        output_file = os.path.join(self.results_dir, f"scale_sweep_results_{self.environment}.json")
+        with open(output_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+        return output_file
+
     def run_all_benchmarks(self, formats: list = None) -> Dict:
         """Run benchmarks for all workloads and formats."""
         if formats is None:
             formats = ["parquet"]
         
-        workloads = ["core", "bi", "classic", "geo", "log", "ml"]
+        workloads = WORKLOADS
         all_results = {}
 
         for workload in workloads:
@@ -135,8 +1073,18 @@ class BenchmarkRunner:
             if workload_results:
                 all_results[workload] = workload_results
 
+        self.save_results(all_results)
+        return all_results
+
+    def save_results(self, all_results: Dict) -> str:
+        """Write results with the run settings to benchmark_results_<environment>.json."""
         metadata = {
             'environment': self.environment,
+            'scan_engine': self.scan_engine,
+            'cache_mode': self.cache_mode,
+            'io_strategy': self.io_strategy,
+            'arrow_cpu_count': pa.cpu_count(),
+            'arrow_io_thread_count': pa.io_thread_count(),
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
             'results': all_results
         }
@@ -144,5 +1092,4 @@ class BenchmarkRunner:
         output_file = os.path.join(self.results_dir, f"benchmark_results_{self.environment}.json")
         with open(output_file, 'w') as f:
             json.dump(metadata, f, indent=2)
-
-        return all_results
+        return output_file
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+import pyarrow.parquet as pq
+
+# Per-file column statistics, computed in one streaming pass and cached in a JSON
+# sidecar next to the data file (<file>.stats.json). A sidecar is reused while the
+# file's size and mtime match; if they do not, the content hash decides.
+SIDECAR_SUFFIX = ".stats.json"
+SIDECAR_VERSION = 2
+STATS_BATCH_ROWS = 1 << 20
+
+SKETCH_SIZE = 10000
+SAMPLE_SEED = 42
+QUANTILE_POINTS = 1001
+# Frequent values kept per column, which also caps planned IN-lists
+MAX_IN_LIST = 256
+
+
+class NDVSketch:
+    """K-minimum-values estimate of the distinct values seen across update() calls."""
+
+    def __init__(self, k: int = 4096):
+        self.k = k
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def update(self, values: np.ndarray):
+        """Keep the smallest distinct value hashes."""
+        hashes = pd.util.hash_array(values)
+        if len(self.hashes) == self.k:
+            hashes = hashes[hashes < self.hashes[-1]]
+        if not len(hashes):
+            return
+        hashes = np.sort(hashes)
+        hashes = hashes[np.r_[True, hashes[1:] != hashes[:-1]]][:self.k]
+        self.hashes = np.union1d(self.hashes, hashes)[:self.k]
+
+    def estimate(self) -> int:
+        if len(self.hashes) < self.k:
+            return len(self.hashes)
+        return int((self.k - 1) * 2.0 ** 64 / float(self.hashes[-1]))
+
+    def relative_error(self) -> float:
+        """Relative standard error of estimate(); 0 while fewer than k distinct values were seen (exact)."""
+        if len(self.hashes) < self.k:
+            return 0.0
+        return 1.0 / np.sqrt(self.k - 2)
+
+
+class QuantileSketch:
+    """Sampled quantiles and frequent values of a column, turning selectivities into predicate values."""
+
+    def __init__(self, quantiles: list, frequent_values: list, frequencies: list, null_fraction: float = 0.0):
+        self.quantiles = quantiles
+        self.frequent_values = frequent_values
+        self.frequencies = np.asarray(frequencies, dtype=float)
+        self.null_fraction = null_fraction
+
+    @classmethod
+    def from_sample(cls, sample, null_fraction: float = 0.0) -> "QuantileSketch":
+        """Sketch from a uniform sample of the non-null values."""
+        if pa.types.is_dictionary(sample.type):
+            sample = sample.cast(sample.type.value_type)
+        sorted_values = sample.take(pc.sort_indices(sample)).to_pylist()
+        quantiles = []
+        if sorted_values:
+            positions = np.minimum((np.arange(QUANTILE_POINTS) / (QUANTILE_POINTS - 1) * len(sorted_values))
+                                   .astype(np.int64), len(sorted_values) - 1)
+            quantiles = [sorted_values[i] for i in positions]
+
+        # Most frequent first, ties by value: value_counts lists values in order of first
+        # appearance, which depends on how the file was cut into batches or stripes, and
+        # the Parquet and ORC files of a workload must plan the same predicates.
+        counts = pc.value_counts(sample)
+        by_frequency = pa.table({'values': counts.field('values'), 'counts': counts.field('counts')})
+        order = pc.sort_indices(by_frequency, sort_keys=[('counts', 'descending'), ('values', 'ascending')])
+        order = order[:MAX_IN_LIST]
+        frequent_values = counts.field('values').take(order).to_pylist()
+        frequencies = counts.field('counts').take(order).to_numpy() / max(len(sample), 1)
+        return cls(quantiles, frequent_values, frequencies.tolist(), null_fraction)
+
+    @classmethod
+    def from_values(cls, values, size: int = SKETCH_SIZE, seed: int = SAMPLE_SEED) -> "QuantileSketch":
+        """Sketch a whole in-memory column by sampling up to `size` of its non-null values."""
+        values = pa.chunked_array([values]) if isinstance(values, pa.Array) else values
+        non_null = pc.drop_null(values)
+        rng = np.random.default_rng(seed)
+        n = len(non_null)
+        indices = np.sort(rng.choice(n, size=min(size, n), replace=False))
+        sample = non_null.take(pa.array(indices, type=pa.int64())).combine_chunks()
+        return cls.from_sample(sample, values.null_count / len(values) if len(values) else 0.0)
+
+    def to_dict(self) -> Dict:
+        return {
+            'quantiles': self.quantiles,
+            'frequent_values': self.frequent_values,
+            'frequencies': self.frequencies.tolist(),
+            'null_fraction': self.null_fraction,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        return cls(data['quantiles'], data['frequent_values'], data['frequencies'], data['null_fraction'])
+
+    def threshold(self, selectivity: float):
+        """Value below which `selectivity` of the non-null values fall."""
+        if not self.quantiles:
+            return None
+        return self.quantiles[int(round(selectivity * (len(self.quantiles) - 1)))]
+
+    def equality_value(self, selectivity: float) -> Tuple[object, float]:
+        """The sampled value whose frequency is closest to `selectivity`, and that frequency."""
+        if not self.frequent_values:
+            return None, 0.0
+        idx = int(np.argmin(np.abs(self.frequencies - selectivity)))
+        return self.frequent_values[idx], float(self.frequencies[idx])
+
+    def in_list(self, selectivity: float, max_values: int = MAX_IN_LIST) -> Tuple[list, float]:
+        """Most frequent values whose combined frequency stays within `selectivity`."""
+        values = []
+        total = 0.0
+        for value, frequency in zip(self.frequent_values, self.frequencies):
+            if len(values) == max_values:
+                break
+            if total + frequency <= selectivity:
+                values.append(value)
+                total += frequency
+        if not values:
+            value, frequency = self.equality_value(selectivity)
+            return ([value] if value is not None else []), frequency
+        return values, total
+
+
+def sidecar_path(filepath: str) -> str:
+    return filepath + SIDECAR_SUFFIX
+
+
+def file_hash(filepath: str, chunk_bytes: int = 1 << 20) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_batches(filepath: str, batch_rows: int) -> Iterator[pa.RecordBatch]:
+    if filepath.endswith('.parquet'):
+        yield from pq.ParquetFile(filepath).iter_batches(batch_size=batch_rows)
+    elif filepath.endswith('.orc'):
+        orc_file = orc.ORCFile(filepath)
+        for i in range(orc_file.nstripes):
+            yield orc_file.read_stripe(i)
+    else:
+        raise ValueError(f"Unsupported file format: {filepath}")
+
+
+class _ColumnAccumulator:
+    """Null count, min/max, NDV sketch and a bottom-k uniform sample for one column."""
+
+    def __init__(self, rng: np.random.Generator, sample_size: int = SKETCH_SIZE):
+        self.rng = rng
+        self.sample_size = sample_size
+        self.n_rows = 0
+        self.null_count = 0
+        self.min = None
+        self.max = None
+        self.ndv = NDVSketch()
+        self.sample_keys = np.empty(0)
+        self.sample = None
+
+    def update(self, column: pa.Array):
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        self.n_rows += len(column)
+        self.null_count += column.null_count
+        values = pc.drop_null(column)
+        if not len(values):
+            return
+
+        bounds = pc.min_max(values)
+        lo, hi = bounds['min'].as_py(), bounds['max'].as_py()
+        if lo is not None:
+            self.min = lo if self.min is None else min(self.min, lo)
+            self.max = hi if self.max is None else max(self.max, hi)
+        self.ndv.update(values.to_numpy(zero_copy_only=False))
+
+        # Bottom-k sampling: every value draws a random key and the k smallest keys
+        # seen so far form a uniform sample without replacement.
+        keys = self.rng.random(len(values))
+        if len(self.sample_keys) == self.sample_size:
+            keep = np.flatnonzero(keys < self.sample_keys.max())
+        else:
+            keep = np.arange(len(values))
+        if not len(keep):
+            return
+        candidates = values.take(pa.array(keep, type=pa.int64()))
+        keys = np.concatenate([self.sample_keys, keys[keep]])
+        sample = candidates if self.sample is None else pa.concat_arrays([self.sample, candidates])
+        if len(keys) > self.sample_size:
+            smallest = np.argpartition(keys, self.sample_size - 1)[:self.sample_size]
+            keys = keys[smallest]
+            sample = sample.take(pa.array(smallest, type=pa.int64()))
+        self.sample_keys = keys
+        self.sample = sample
+
+    def finish(self, field: pa.Field) -> Dict:
+        null_fraction = self.null_count / self.n_rows if self.n_rows else 0.0
+        sample = self.sample if self.sample is not None else pa.array([], type=field.type)
+        stats = {
+            'type': str(field.type),
+            'num_values': self.n_rows - self.null_count,
+            'null_count': self.null_count,
+            'min': self.min,
+            'max': self.max,
+            'ndv': self.ndv.estimate(),
+            'sample_size': len(sample),
+        }
+        stats.update(QuantileSketch.from_sample(sample, null_fraction).to_dict())
+        return stats
+
+
+def compute_file_statistics(filepath: str, batch_rows: int = STATS_BATCH_ROWS) -> Dict:
+    """Column statistics of a Parquet or ORC file in one pass over its record batches."""
+    if filepath.endswith('.parquet'):
+        schema = pq.read_schema(filepath)
+    else:
+        schema = orc.ORCFile(filepath).schema
+    accumulators = {
+        name: _ColumnAccumulator(np.random.default_rng([SAMPLE_SEED, i]))
+        for i, name in enumerate(schema.names)
+    }
+
+    num_rows = 0
+    for batch in _iter_batches(filepath, batch_rows):
+        num_rows += batch.num_rows
+        for name, column in zip(batch.schema.names, batch.columns):
+            accumulators[name].update(column)
+
+    stat = os.stat(filepath)
+    return {
+        'version': SIDECAR_VERSION,
+        'file': os.path.basename(filepath),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': file_hash(filepath),
+        'num_rows': num_rows,
+        'columns': {name: acc.finish(schema.field(name)) for name, acc in accumulators.items()},
+    }
+
+
+def load_file_statistics(filepath: str, refresh: bool = False) -> Dict:
+    """Column statistics for `filepath`, from its sidecar when still valid, else recomputed and cached."""
+    path = sidecar_path(filepath)
+    if not refresh and os.path.exists(path):
+        with open(path, 'r') as f:
+            cached = json.load(f)
+        stat = os.stat(filepath)
+        if cached.get('version') == SIDECAR_VERSION:
+            if cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                return cached
+            if cached['size'] == stat.st_size and cached['hash'] == file_hash(filepath):
+                # Touched but unchanged: keep the statistics, remember the new mtime.
+                cached['mtime_ns'] = stat.st_mtime_ns
+                with open(path, 'w') as f:
+                    json.dump(cached, f)
+                return cached
+
+    statistics = compute_file_statistics(filepath)
+    with open(path, 'w') as f:
+        json.dump(statistics, f)
+    return statistics
+
+
+def column_sketches(statistics: Dict) -> Dict[str, QuantileSketch]:
+    """QuantileSketch per column, in file column order, from loaded statistics."""
+    return {name: QuantileSketch.from_dict(stats) for name, stats in statistics['columns'].items()}
+
+
+def column_profile(statistics: Dict) -> Dict:
+    """Statistics without the sketches, compact enough for results JSON and reports."""
+    keys = ('type', 'num_values', 'null_count', 'min', 'max', 'ndv')
+    return {
+        'num_rows': statistics['num_rows'],
+        'columns': {name: {k: stats[k] for k in keys} for name, stats in statistics['columns'].items()},
+    }
+
+
+def zone_overlaps(mins, maxs) -> np.ndarray:
+    """For each zone (row group or stripe), the fraction of the other zones whose [min, max] intersects its own."""
+    mins, maxs = np.asarray(mins), np.asarray(maxs)
+    n = len(mins)
+    if n < 2:
+        return np.zeros(n)
+    sorted_mins, sorted_maxs = np.sort(mins), np.sort(maxs)
+    disjoint = ((n - np.searchsorted(sorted_mins, maxs, side='right'))
+                + np.searchsorted(sorted_maxs, mins, side='left'))
+    return (n - 1 - disjoint) / (n - 1)
@@ -13,6 +13,8 @@ from typing import Dict, List, Optional
 import matplotlib.pyplot as plt
 import numpy as np
 
+from query_plan import is_reference_query
+
 
 def load_our_results(results_file: str = "results/benchmark_results_bare-metal.json") -> Dict:
     """Load our benchmark results."""
@@ -45,14 +47,14 @@ def extract_our_metrics(results: Dict) -> Dict:
             sel_10 = next(
                 q['mean_time_ms'] 
                 for q in results[wl]['parquet']['selection_queries'] 
-                if abs(q['selectivity'] - 0.1) < 0.01
+                if abs(q['selectivity'] - 0.1) < 0.01 and is_reference_query(q)
             )
             metrics['selection_latency_10pct']['parquet'].append(sel_10)
             
             sel_10 = next(
                 q['mean_time_ms'] 
                 for q in results[wl]['orc']['selection_queries'] 
-                if abs(q['selectivity'] - 0.1) < 0.01
+                if abs(q['selectivity'] - 0.1) < 0.01 and is_reference_query(q)
             )
             metrics['selection_latency_10pct']['orc'].append(sel_10)
     
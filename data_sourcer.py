@@ -1,56 +1,33 @@
-import pandas as pd
-import numpy as np
+import argparse
 import os
 import shutil
-from typing import Dict, List, Optional
+from typing import Dict
 import json
 
+from column_statistics import load_file_statistics
+from format_converter import convert_to_parquet, csv_column_names
+from workload_config import WORKLOADS, column_kinds, column_types, load_workload_config
+from workload_generator import DEFAULT_BATCH_SIZE, WorkloadGenerator
+
+# Base datasets are staged as Arrow IPC files (typed, memory-mappable); CSV on request
+STAGING_FORMATS = ("arrow", "csv")
+
 class DataSourcer:
-    def __init__(self):
-        self.workloads = ["core", "bi", "classic", "geo", "log", "ml"]
-        self.workload_configs = {
-            "core": {"ndv_range": (0.01, 0.9), "null_range": (0.0, 0.3), "skew_types": ["uniform", "zipf"]},
-            "bi": {"ndv_range": (0.001, 0.5), "null_range": (0.0, 0.4), "skew_types": ["zipf", "hotspot"]},
-            "classic": {"ndv_range": (0.1, 0.9), "null_range": (0.0, 0.1), "skew_types": ["uniform", "hotspot"]},
-            "geo": {"ndv_range": (0.01, 0.5), "null_range": (0.0, 0.2), "skew_types": ["uniform", "zipf"]},
-            "log": {"ndv_range": (0.001, 0.3), "null_range": (0.0, 0.15), "skew_types": ["zipf", "hotspot"]},
-            "ml": {"ndv_range": (0.1, 0.9), "null_range": (0.0, 0.1), "skew_types": ["uniform", "hotspot"]}
-        }
+    def __init__(self, config_dir: str = "configs"):
+        self.config_dir = config_dir
+        self.workloads = list(WORKLOADS)
     
-    def generate_synthetic_dataset(self, workload: str, output_dir: str = "data") -> str:
-        np.random.seed(42)
-        n_rows, n_cols = 1000000, 20
-        
-        data = {}
-        config = self.workload_configs[workload]
-        
-        for i in range(n_cols):
-            ndv_ratio = np.random.uniform(*config["ndv_range"])
-            null_ratio = np.random.uniform(*config["null_range"])
-            ndv = max(1, int(n_rows * ndv_ratio))
-            
-            if i % 3 == 0:
-                values = np.random.randint(0, ndv, n_rows).astype(float)
-            elif i % 3 == 1:
-                values = np.random.uniform(0, ndv, n_rows)
-            else:
-                unique_vals = [f'str_{j}' for j in range(ndv)]
-                values = np.random.choice(unique_vals, n_rows)
-            
-            if null_ratio > 0:
-                null_indices = np.random.choice(n_rows, size=int(n_rows * null_ratio), replace=False)
-                if isinstance(values[0], str):
-                    values[null_indices] = None
-                else:
-                    values[null_indices] = np.nan
-            
-            data[f'col_{i}'] = values
-        
-        df = pd.DataFrame(data)
-        os.makedirs(output_dir, exist_ok=True)
-        filepath = os.path.join(output_dir, f"{workload}_r{n_rows}_c{n_cols}.csv")
-        df.to_csv(filepath, index=False)
-        print(f"Generated {workload} dataset: {filepath} ({df.shape})")
+    def generate_synthetic_dataset(self, workload: str, output_dir: str = "data", n_rows: int = None,
+                                   batch_size: int = DEFAULT_BATCH_SIZE, output_format: str = "arrow") -> str:
+        """Stage the workload's dataset with the WorkloadGenerator (rows default to the config's)."""
+        if output_format not in STAGING_FORMATS:
+            raise ValueError(f"Unsupported staging format: {output_format}")
+        metadata = WorkloadGenerator(self.config_dir).write_workload_streaming(
+            workload, n_rows, output_dir, batch_size, formats=(output_format,)
+        )
+        filepath = metadata[f'{output_format}_file']
+
+        print(f"Generated {workload} dataset: {filepath} ({metadata['shape']})")
         return filepath
     
     def clean_data_dir(self, output_dir: str = "data"):
@@ -60,38 +37,39 @@ class DataSourcer:
         os.makedirs(output_dir, exist_ok=True)
 
 class DataPreprocessor:
-    def __init__(self):
-        self.workload_configs = {
-            "core": {"ndv_range": (0.01, 0.9), "null_range": (0.0, 0.3), "skew_types": ["uniform", "zipf"]},
-            "bi": {"ndv_range": (0.001, 0.5), "null_range": (0.0, 0.4), "skew_types": ["zipf", "hotspot"]},
-            "classic": {"ndv_range": (0.1, 0.9), "null_range": (0.0, 0.1), "skew_types": ["uniform", "hotspot"]},
-            "geo": {"ndv_range": (0.01, 0.5), "null_range": (0.0, 0.2), "skew_types": ["uniform", "zipf"]},
-            "log": {"ndv_range": (0.001, 0.3), "null_range": (0.0, 0.15), "skew_types": ["zipf", "hotspot"]},
-            "ml": {"ndv_range": (0.1, 0.9), "null_range": (0.0, 0.1), "skew_types": ["uniform", "hotspot"]}
-        }
+    def __init__(self, config_dir: str = "configs"):
+        self.config_dir = config_dir
     
-    def _calculate_ndv_ratio(self, series: pd.Series) -> float:
-        return series.nunique() / len(series)
+    def _calculate_ndv_ratio(self, column_stats: Dict, num_rows: int) -> float:
+        return column_stats['ndv'] / num_rows
     
-    def _calculate_null_ratio(self, series: pd.Series) -> float:
-        return series.isnull().sum() / len(series)
+    def _calculate_null_ratio(self, column_stats: Dict, num_rows: int) -> float:
+        return column_stats['null_count'] / num_rows
     
     def process_workload(self, filepath: str) -> Dict:
-        df = pd.read_csv(filepath)
-        output_file = filepath.replace(".csv", "_processed.parquet")
-        df.to_parquet(output_file, index=False)
-        
+        """Stream a staged dataset (Arrow IPC or CSV) into Parquet and validate its ratios from the sidecar."""
         workload_type = os.path.basename(filepath).split('_')[0]
-        config = self.workload_configs.get(workload_type, {})
+        workload_config = load_workload_config(workload_type, self.config_dir)
+        csv_types = None
+        if filepath.endswith('.csv'):
+            # Type inference only sees the first block, so pin the generated column types.
+            csv_types = column_types(workload_config, csv_column_names(filepath))
+        output_file = convert_to_parquet(filepath, os.path.splitext(filepath)[0] + "_processed.parquet",
+                                         csv_types)
+        statistics = load_file_statistics(output_file)
+        num_rows = statistics['num_rows']
+        
+        config = workload_config.get('characteristics', {})
+        kinds = column_kinds(workload_config, list(statistics['columns']))
         
         validation_passed = True
         issues = []
-        for col_name in df.columns:
-            series = df[col_name]
-            ndv_ratio = self._calculate_ndv_ratio(series)
-            null_ratio = self._calculate_null_ratio(series)
+        for col_name, column_stats in statistics['columns'].items():
+            ndv_ratio = self._calculate_ndv_ratio(column_stats, num_rows)
+            null_ratio = self._calculate_null_ratio(column_stats, num_rows)
             
-            if "ndv_range" in config and not (config["ndv_range"][0] <= ndv_ratio <= config["ndv_range"][1]):
+            # As in WorkloadGenerator.validate_distributions, noise makes noisy_float values nearly all distinct
+            if kinds[col_name] != 'noisy_float' and "ndv_range" in config and not (config["ndv_range"][0] <= ndv_ratio <= config["ndv_range"][1]):
                 issues.append(f"Column {col_name}: NDV ratio {ndv_ratio:.3f} outside expected range {config['ndv_range']}")
                 validation_passed = False
             if "null_range" in config and not (config["null_range"][0] <= null_ratio <= config["null_range"][1]):
@@ -103,8 +81,8 @@ class DataPreprocessor:
             "output_file": output_file,
             "validation": {
                 "workload_type": workload_type,
-                "shape": list(df.shape),
-                "columns_analyzed": len(df.columns),
+                "shape": [num_rows, len(statistics['columns'])],
+                "columns_analyzed": len(statistics['columns']),
                 "validation_passed": validation_passed,
                 "issues": issues
             },
@@ -114,6 +92,10 @@ class DataPreprocessor:
         return result
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate and preprocess the base datasets")
+    parser.add_argument("--csv", action="store_true", help="Stage the datasets as CSV instead of Arrow IPC")
+    args = parser.parse_args()
+
     sourcer = DataSourcer()
     preprocessor = DataPreprocessor()
     
@@ -124,7 +106,7 @@ def main():
     generated_files = []
     
     for workload in sourcer.workloads:
-        filepath = sourcer.generate_synthetic_dataset(workload)
+        filepath = sourcer.generate_synthetic_dataset(workload, output_format="csv" if args.csv else "arrow")
         generated_files.append(filepath)
     
     print(f"\nProcessing {len(generated_files)} datasets...")
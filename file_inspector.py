@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from column_statistics import zone_overlaps
+from orc_metadata import read_orc_column_layout, read_orc_metadata, stats_usable
+
+# Looks inside a written file: how its bytes split over columns and encodings, and
+# how well the min/max statistics of its row groups (Parquet) or stripes (ORC)
+# separate the data. Everything comes from footers and stripe footers, except the
+# decompressed sizes of compressed ORC files, read from their streams' chunk headers.
+
+
+def _overlap_summary(mins: List, maxs: List) -> Dict:
+    """Mean min/max overlap of the zones with statistics; None for fewer than two."""
+    overlaps = zone_overlaps(mins, maxs)
+    return {
+        'zones_with_stats': len(overlaps),
+        'min_max_overlap': float(overlaps.mean()) if len(overlaps) > 1 else None,
+    }
+
+
+def _encoding_totals(columns: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Columns and bytes per encoding combination, so size differences can be traced to encodings."""
+    totals = {}
+    for stats in columns.values():
+        key = "+".join(stats['encodings'])
+        entry = totals.setdefault(key, {'columns': 0, 'compressed_bytes': 0, 'uncompressed_bytes': 0})
+        entry['columns'] += 1
+        entry['compressed_bytes'] += stats['compressed_bytes']
+        entry['uncompressed_bytes'] += stats['uncompressed_bytes']
+    return totals
+
+
+def _summarize(layout: Dict) -> Dict:
+    columns = layout['columns']
+    overlaps = [c['min_max_overlap'] for c in columns.values() if c['min_max_overlap'] is not None]
+    compressed = sum(c['compressed_bytes'] for c in columns.values())
+    uncompressed = sum(c['uncompressed_bytes'] for c in columns.values())
+    layout.update({
+        'compressed_bytes': compressed,
+        'uncompressed_bytes': uncompressed,
+        'compression_ratio': uncompressed / compressed if compressed else None,
+        'dictionary_bytes': sum(c['dictionary_bytes'] for c in columns.values()),
+        'mean_min_max_overlap': float(np.mean(overlaps)) if overlaps else None,
+        'encodings': _encoding_totals(columns),
+    })
+    return layout
+
+
+def inspect_parquet(filepath: str) -> Dict:
+    """Per-column bytes, encodings, dictionary pages and row-group overlap from the Parquet footer."""
+    metadata = pq.ParquetFile(filepath).metadata
+    columns = {}
+    bounds = {}
+    for rg in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg)
+        for i in range(row_group.num_columns):
+            chunk = row_group.column(i)
+            name = chunk.path_in_schema
+            stats = columns.setdefault(name, {
+                'compressed_bytes': 0, 'uncompressed_bytes': 0, 'encodings': [],
+                'compression': chunk.compression, 'dictionary_bytes': 0, 'dictionary_chunks': 0,
+            })
+            stats['compressed_bytes'] += chunk.total_compressed_size
+            stats['uncompressed_bytes'] += chunk.total_uncompressed_size
+            for encoding in chunk.encodings:
+                if encoding not in stats['encodings']:
+                    stats['encodings'].append(encoding)
+            if chunk.has_dictionary_page:
+                stats['dictionary_bytes'] += chunk.data_page_offset - chunk.dictionary_page_offset
+                stats['dictionary_chunks'] += 1
+
+            mins, maxs = bounds.setdefault(name, ([], []))
+            if chunk.is_stats_set and chunk.statistics.has_min_max:
+                mins.append(chunk.statistics.min)
+                maxs.append(chunk.statistics.max)
+
+    for name, stats in columns.items():
+        stats.update(_overlap_summary(*bounds[name]))
+
+    return _summarize({
+        'format': 'parquet',
+        'file_bytes': os.path.getsize(filepath),
+        'num_rows': metadata.num_rows,
+        'zone': 'row_group',
+        'num_zones': metadata.num_row_groups,
+        'columns': columns,
+    })
+
+
+def inspect_orc(filepath: str) -> Dict:
+    """Per-column data-stream bytes, encodings, dictionaries and stripe overlap from the ORC footers."""
+    metadata = read_orc_metadata(filepath)
+    columns = {}
+    for name, stats in read_orc_column_layout(filepath, metadata).items():
+        mins, maxs = [], []
+        for stripe_stats in metadata['stripe_statistics']:
+            column = stripe_stats.get(name)
+            if not stats_usable(column):
+                continue
+            mins.append(column['min'])
+            maxs.append(column['max'])
+        columns[name] = {
+            'compressed_bytes': stats['compressed_bytes'],
+            'uncompressed_bytes': stats['uncompressed_bytes'],
+            'encodings': sorted(stats['encodings']),
+            'compression': metadata['compression'],
+            'dictionary_bytes': stats['dictionary_bytes'],
+            'dictionary_entries': stats['dictionary_entries'],
+        }
+        columns[name].update(_overlap_summary(mins, maxs))
+
+    return _summarize({
+        'format': 'orc',
+        'file_bytes': os.path.getsize(filepath),
+        'num_rows': metadata['num_rows'],
+        'zone': 'stripe',
+        'num_zones': len(metadata['stripes']),
+        'columns': columns,
+    })
+
+
+def inspect_file(filepath: str) -> Dict:
+    if filepath.endswith('.parquet'):
+        return inspect_parquet(filepath)
+    if filepath.endswith('.orc'):
+        return inspect_orc(filepath)
+    raise ValueError(f"Unsupported file format: {filepath}")
+
+
+def print_layout(filepath: str, layout: Dict):
+    ratio = layout['compression_ratio'] or 0.0
+    overlap = layout['mean_min_max_overlap']
+    print(f"{filepath}: {layout['num_rows']:,} rows, {layout['num_zones']} {layout['zone']}(s), "
+          f"{layout['compressed_bytes']:,} / {layout['uncompressed_bytes']:,} bytes (x{ratio:.2f})")
+    print(f"  Dictionary bytes: {layout['dictionary_bytes']:,}"
+          + (f", mean min/max overlap: {overlap:.2f}" if overlap is not None else ""))
+    for encoding, totals in layout['encodings'].items():
+        print(f"  {encoding:<40} {totals['columns']:>3} cols {totals['compressed_bytes']:>14,} bytes")
+    for name, stats in layout['columns'].items():
+        col_overlap = stats['min_max_overlap']
+        print(f"    {name:<8} {stats['compressed_bytes']:>12,} / {stats['uncompressed_bytes']:>12,} bytes  "
+              f"dict {stats['dictionary_bytes']:>10,}  "
+              f"overlap {'-' if col_overlap is None else f'{col_overlap:.2f}':>5}  {'+'.join(stats['encodings'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the row-group / stripe layout of Parquet and ORC files")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--json", action="store_true", help="Print the raw layout as JSON")
+    args = parser.parse_args()
+
+    for filepath in args.files:
+        layout = inspect_file(filepath)
+        if args.json:
+            print(json.dumps({filepath: layout}, indent=2, default=str))
+        else:
+            print_layout(filepath, layout)
+
+
+if __name__ == "__main__":
+    main()
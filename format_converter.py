@@ -1,33 +1,195 @@
+import csv
+import itertools
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List
 
-import pandas as pd
 import pyarrow as pa
+import pyarrow.csv as pa_csv
 import pyarrow.orc as orc
+import pyarrow.parquet as pq
 
+from workload_config import WORKLOADS, workload_dataset_path
 
-def convert_to_orc(parquet_file: str) -> str:
-    df = pd.read_parquet(parquet_file)
+# Default encoding/compression matrix for the sweep. Codecs are (name, level);
+# ORC cannot set a compression level, so its zstd variants collapse into one.
+# The ORC counterparts of row-group and page size are stripe size and
+# compression block size.
+SWEEP_GRID = {
+    'codec': [('none', None), ('snappy', None), ('zstd', 1), ('zstd', 3), ('zstd', 9),
+              ('lz4', None), ('gzip', None)],
+    'dictionary': [True, False],
+    'parquet_row_group_rows': [64 * 1024, 1024 * 1024],
+    'parquet_page_bytes': [64 * 1024, 1024 * 1024],
+    'orc_stripe_bytes': [8 * 1024 * 1024, 64 * 1024 * 1024],
+    'orc_block_bytes': [64 * 1024, 256 * 1024],
+}
+
+CONVERT_BATCH_ROWS = 1 << 20
+
+ORC_CODECS = {'none': 'uncompressed', 'snappy': 'snappy', 'zstd': 'zstd', 'lz4': 'lz4', 'gzip': 'zlib'}
+
+
+def decode_dictionaries(table: pa.Table) -> pa.Table:
+    """Cast dictionary columns to their value type; the Arrow ORC writer rejects them."""
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+    return table
+
+
+def orc_dictionary_threshold(dictionary_encoding: bool) -> float:
+    """ORC writer setting that always (1.0) or never (0.0) dictionary-encodes strings."""
+    return 1.0 if dictionary_encoding else 0.0
+
+
+def convert_to_orc(parquet_file: str, dictionary_encoding: bool = None,
+                   batch_rows: int = CONVERT_BATCH_ROWS) -> str:
+    """Stream Parquet record batches into an ORC writer; memory is bounded by `batch_rows`."""
     orc_file = parquet_file.replace('.parquet', '.orc')
+    parquet = pq.ParquetFile(parquet_file)
+    if dictionary_encoding is None:
+        dictionary_encoding = any(pa.types.is_dictionary(field.type) for field in parquet.schema_arrow)
 
-    table = pa.Table.from_pandas(df)
-    orc.write_table(table, orc_file)
+    with orc.ORCWriter(orc_file,
+                       dictionary_key_size_threshold=orc_dictionary_threshold(dictionary_encoding)) as writer:
+        for batch in parquet.iter_batches(batch_size=batch_rows):
+            writer.write(decode_dictionaries(pa.Table.from_batches([batch])))
 
     return orc_file
 
 
+def iter_staged_batches(path: str, column_types: Dict[str, pa.DataType] = None) -> Iterator[pa.RecordBatch]:
+    """Record batches of a staged dataset (memory-mapped Arrow IPC, or streamed CSV) without loading it whole."""
+    if path.endswith(('.arrow', '.feather')):
+        with pa.memory_map(path) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+    elif path.endswith('.csv'):
+        reader = pa_csv.open_csv(
+            path,
+            read_options=pa_csv.ReadOptions(block_size=64 << 20, use_threads=True),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types or {}),
+        )
+        for batch in reader:
+            yield batch
+    else:
+        raise ValueError(f"Unsupported staging format: {path}")
+
+
+def csv_column_names(path: str) -> List[str]:
+    with open(path, 'r', newline='') as f:
+        return next(csv.reader(f))
+
+
+def convert_to_parquet(source: str, parquet_file: str = None,
+                       column_types: Dict[str, pa.DataType] = None) -> str:
+    """Stream a staged Arrow IPC or CSV dataset into a Parquet file next to it."""
+    if parquet_file is None:
+        parquet_file = os.path.splitext(source)[0] + '.parquet'
+    writer = None
+    try:
+        for batch in iter_staged_batches(source, column_types):
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_file, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+    return parquet_file
+
+
+def sweep_variants(format_type: str, grid: Dict = None) -> List[Dict]:
+    """Expand the sweep grid into the distinct writer settings for one format."""
+    grid = {**SWEEP_GRID, **(grid or {})}
+    if format_type == 'parquet':
+        sizes = itertools.product(grid['parquet_row_group_rows'], grid['parquet_page_bytes'])
+        size_keys = ('row_group_rows', 'page_bytes')
+    elif format_type == 'orc':
+        sizes = itertools.product(grid['orc_stripe_bytes'], grid['orc_block_bytes'])
+        size_keys = ('stripe_bytes', 'block_bytes')
+    else:
+        raise ValueError(f"Unsupported format: {format_type}")
+
+    variants = []
+    seen = set()
+    for (codec, level), dictionary, size in itertools.product(grid['codec'], grid['dictionary'], list(sizes)):
+        if format_type == 'orc':
+            level = None
+        variant = {'format': format_type, 'codec': codec, 'level': level, 'dictionary': dictionary}
+        variant.update(zip(size_keys, size))
+        key = tuple(variant.items())
+        if key not in seen:
+            seen.add(key)
+            variants.append(variant)
+    return variants
+
+
+def variant_id(variant: Dict) -> str:
+    codec = variant['codec'] + (str(variant['level']) if variant['level'] is not None else '')
+    parts = [variant['format'], codec, 'dict' if variant['dictionary'] else 'plain']
+    if variant['format'] == 'parquet':
+        parts += [f"rg{variant['row_group_rows']}", f"page{variant['page_bytes']}"]
+    else:
+        parts += [f"stripe{variant['stripe_bytes']}", f"block{variant['block_bytes']}"]
+    return '-'.join(parts)
+
+
+def write_variant(table: pa.Table, path: str, variant: Dict) -> float:
+    """Write `table` with the variant's settings and return the write time in seconds."""
+    if variant['format'] == 'parquet':
+        start = time.perf_counter()
+        pq.write_table(
+            table, path,
+            compression=variant['codec'],
+            compression_level=variant['level'],
+            use_dictionary=variant['dictionary'],
+            row_group_size=variant['row_group_rows'],
+            data_page_size=variant['page_bytes'],
+        )
+        return time.perf_counter() - start
+
+    table = decode_dictionaries(table)
+    start = time.perf_counter()
+    orc.write_table(
+        table, path,
+        compression=ORC_CODECS[variant['codec']],
+        dictionary_key_size_threshold=orc_dictionary_threshold(variant['dictionary']),
+        stripe_size=variant['stripe_bytes'],
+        compression_block_size=variant['block_bytes'],
+    )
+    return time.perf_counter() - start
+
+
 class FormatConverter:
-    def __init__(self, data_dir: str = "data", row_count: int = 1000):
+    def __init__(self, data_dir: str = "data", row_count: int = None):
         self.data_dir = data_dir
+        # None: the rows in each workload's config
         self.row_count = row_count
 
-    def convert_all_workloads(self):
-        workloads = ["core", "bi", "classic", "geo", "log", "ml"]
-
-        for workload in workloads:
-            parquet_file = os.path.join(
-                self.data_dir,
-                f"{workload}_r{self.row_count}_c20_generated.parquet"
-            )
-            if os.path.exists(parquet_file):
-                orc_file = convert_to_orc(parquet_file)
-                print(f"Converted {workload}: {orc_file}")
+    def parquet_path(self, workload: str) -> str:
+        return workload_dataset_path(workload, "parquet", self.data_dir, self.row_count)
+
+    def sweep_dir(self, workload: str) -> str:
+        path = os.path.join(self.data_dir, "sweep", workload)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def convert_all_workloads(self, jobs: int = None):
+        """Convert every generated workload to ORC, one process per workload (`jobs=1` runs serially)."""
+        parquet_files = {w: self.parquet_path(w) for w in WORKLOADS if os.path.exists(self.parquet_path(w))}
+        if not parquet_files:
+            return
+
+        jobs = min(jobs or os.cpu_count() or 1, len(parquet_files))
+        if jobs == 1:
+            for workload, parquet_file in parquet_files.items():
+                print(f"Converted {workload}: {convert_to_orc(parquet_file)}")
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            pending = {w: executor.submit(convert_to_orc, f) for w, f in parquet_files.items()}
+            for workload, future in pending.items():
+                print(f"Converted {workload}: {future.result()}")
@@ -15,10 +15,19 @@ import os
 from datetime import datetime
 from typing import Dict
 
-from benchmark_runner import BenchmarkRunner
-from data_sourcer import DataSourcer
-from format_converter import FormatConverter
-from workload_generator import WorkloadGenerator
+from pipeline import build_benchmark_pipeline
+from query_plan import REFERENCE_QUERY, is_reference_query, load_workload_queries
+from timing_harness import DEFAULT_MAX_ITERATIONS, DEFAULT_MIN_ITERATIONS, DEFAULT_TARGET_CI_WIDTH, DEFAULT_WARMUP
+
+# Preliminary numbers come from small datasets; main.py runs the configs' full row counts
+PRELIMINARY_ROWS = 1000
+
+
+def _selectivity_grid(workload: str, config_dir: str = "configs") -> str:
+    """The selectivities a workload's config declares for its selection queries."""
+    selectivities = sorted({s for query in load_workload_queries(config_dir, workload)
+                            if query.get('type') == 'selection' for s in query.get('selectivity', [])})
+    return ", ".join(f"{s:.0%}" for s in selectivities) or "none"
 
 
 def generate_summary_report(results: Dict, output_file: str = "results/preliminary_results_summary.md"):
@@ -37,7 +46,8 @@ def generate_summary_report(results: Dict, output_file: str = "results/prelimina
         f.write("For each workload, we measure:\n")
         f.write("- **File Size**: **Compression efficiency**\n")
         f.write("- **Full Scan Performance**: **Throughput** (rows/sec) and **latency** (ms)\n")
-        f.write("- **Selection Query Performance**: **Latency** at different selectivities (1%, 10%, 50%)\n\n")
+        f.write("- **Selection Query Performance**: **Latency** of the predicates planned from each workload's "
+                "config, in memory and pushed down into the reader\n\n")
         
         f.write("## Results Summary\n\n")
         
@@ -58,6 +68,39 @@ def generate_summary_report(results: Dict, output_file: str = "results/prelimina
         
         f.write("\n")
         
+        # Where the bytes go, from the footers (file_inspector)
+        f.write("### Storage Layout\n\n")
+        f.write("| Workload | Format | Row Groups / Stripes | Compressed (MB) | Uncompressed (MB) | "
+                "Dictionary (MB) | Min/Max Overlap |\n")
+        f.write("|----------|--------|----------------------|-----------------|-------------------|"
+                "-----------------|-----------------|\n")
+        
+        mb = 1024 * 1024
+        for workload in sorted(results.keys()):
+            for fmt in ['parquet', 'orc']:
+                layout = results[workload].get(fmt, {}).get('layout')
+                if layout:
+                    overlap = layout['mean_min_max_overlap']
+                    f.write(f"| {workload} | {fmt} | {layout['num_zones']} | {layout['compressed_bytes'] / mb:.2f} | "
+                            f"{layout['uncompressed_bytes'] / mb:.2f} | {layout['dictionary_bytes'] / mb:.2f} | "
+                            f"{'N/A' if overlap is None else f'{overlap:.2f}'} |\n")
+        
+        f.write("\n")
+        
+        f.write("### Bytes by Encoding\n\n")
+        f.write("| Workload | Format | Encodings | Columns | Compressed (MB) |\n")
+        f.write("|----------|--------|-----------|---------|-----------------|\n")
+        
+        for workload in sorted(results.keys()):
+            for fmt in ['parquet', 'orc']:
+                layout = results[workload].get(fmt, {}).get('layout')
+                if layout:
+                    for encoding, totals in layout['encodings'].items():
+                        f.write(f"| {workload} | {fmt} | {encoding} | {totals['columns']} | "
+                                f"{totals['compressed_bytes'] / mb:.2f} |\n")
+        
+        f.write("\n")
+        
         # Full scan performance
         f.write("### Full Scan Performance\n\n")
         f.write("| Workload | Format | Throughput (rows/sec) | Latency (ms) |\n")
@@ -83,7 +126,7 @@ def generate_summary_report(results: Dict, output_file: str = "results/prelimina
                 if fmt in results[workload]:
                     queries = results[workload][fmt]['selection_queries']
                     # Find query with 0.1 selectivity
-                    sel_query = next((q for q in queries if abs(q['selectivity'] - 0.1) < 0.01), None)
+                    sel_query = next((q for q in queries if abs(q['selectivity'] - 0.1) < 0.01 and is_reference_query(q)), None)
                     if sel_query:
                         latency = sel_query['mean_time_ms']
                         rows = sel_query['rows_selected']
@@ -91,15 +134,40 @@ def generate_summary_report(results: Dict, output_file: str = "results/prelimina
         
         f.write("\n")
         
+        # Data profile from the per-file statistics sidecars
+        f.write("### Data Profile (Parquet files)\n\n")
+        f.write("| Workload | Rows | Mean NDV Ratio | Mean Null Ratio |\n")
+        f.write("|----------|------|----------------|-----------------|\n")
+        
+        for workload in sorted(results.keys()):
+            profile = results[workload].get('parquet', {}).get('column_statistics')
+            if profile:
+                n_rows = profile['num_rows']
+                columns = profile['columns'].values()
+                ndv_ratio = sum(c['ndv'] for c in columns) / (len(columns) * n_rows)
+                null_ratio = sum(c['null_count'] for c in columns) / (len(columns) * n_rows)
+                f.write(f"| {workload} | {n_rows:,} | {ndv_ratio:.4f} | {null_ratio:.4f} |\n")
+        
+        f.write("\n")
+        
         # Detailed results
         f.write("## Detailed Results\n\n")
         f.write("For complete detailed results including all selectivities and statistics, ")
         f.write("see `results/benchmark_results.json`.\n\n")
         
         f.write("## Notes\n\n")
-        f.write("- Results are based on 5 iterations per measurement\n")
-        f.write("- All workloads use 1,000 rows and 20 columns\n")
-        f.write("- Selection queries test column `col_0` with varying selectivity thresholds\n")
+        f.write(f"- Each measurement runs {DEFAULT_WARMUP} warmup iteration(s), then {DEFAULT_MIN_ITERATIONS} to "
+                f"{DEFAULT_MAX_ITERATIONS} timed iterations, stopping once the 95% bootstrap CI of the mean is "
+                f"within {DEFAULT_TARGET_CI_WIDTH:.0%} of it\n")
+        f.write(f"- All workloads use {PRELIMINARY_ROWS:,} rows and 20 columns\n")
+        f.write("- Selection queries run range, equality, IN-list and IS NULL predicates on the first column of "
+                "each column kind a workload's config lists; operands come from the column's sampled quantiles "
+                "and most frequent values\n")
+        f.write(f"- The 10% table is the reference query: a {REFERENCE_QUERY['selectivity']:.0%} "
+                f"{REFERENCE_QUERY['predicate']} predicate on the first {REFERENCE_QUERY['column_kind']} column\n")
+        f.write("- Configured selectivities: "
+                + "; ".join(f"{workload} {_selectivity_grid(workload)}" for workload in sorted(results.keys()))
+                + "\n")
         f.write("- These are preliminary results; full-scale benchmarks will use larger datasets\n\n")
     
     print(f"\nSummary report saved to: {output_file}")
@@ -111,54 +179,11 @@ def main():
     print("PRELIMINARY RESULTS GENERATION")
     print("=" * 60)
     
-    # Step 1: Ensure data is generated
-    print("\n[1/5] Checking data generation...")
-    sourcer = DataSourcer()
-    data_files_exist = all(
-        os.path.exists(os.path.join("data", f"{w}_r1000_c20_generated.parquet"))
-        for w in ["core", "bi", "classic", "geo", "log", "ml"]
-    )
-    
-    if not data_files_exist:
-        print("  Generating base datasets...")
-        sourcer.clean_data_dir()
-        for workload in sourcer.workloads:
-            sourcer.generate_synthetic_dataset(workload)
-    else:
-        print("  ✓ Data files already exist")
-    
-    # Step 2: Ensure workloads are generated
-    print("\n[2/5] Checking workload generation...")
-    workload_files_exist = all(
-        os.path.exists(os.path.join("data", f"{w}_r1000_c20_generated.parquet"))
-        for w in ["core", "bi", "classic", "geo", "log", "ml"]
-    )
-    
-    if not workload_files_exist:
-        print("  Generating workloads...")
-        generator = WorkloadGenerator()
-        generator.generate_all_workloads()
-    else:
-        print("  ✓ Workload files already exist")
-    
-    # Step 3: Convert to ORC
-    print("\n[3/5] Converting formats...")
-    converter = FormatConverter()
-    orc_files_exist = all(
-        os.path.exists(os.path.join("data", f"{w}_r1000_c20_generated.orc"))
-        for w in ["core", "bi", "classic", "geo", "log", "ml"]
-    )
-    
-    if not orc_files_exist:
-        print("  Converting Parquet to ORC...")
-        converter.convert_all_workloads()
-    else:
-        print("  ✓ ORC files already exist")
-    
-    # Step 4: Run benchmarks
-    print("\n[4/5] Running benchmarks...")
-    runner = BenchmarkRunner()
-    results = runner.run_all_benchmarks(formats=["parquet", "orc"])
+    # Steps 1-4: generate, convert and benchmark, reusing every stage whose
+    # config, seed, row count and library versions are unchanged
+    print("\n[1-4/5] Generating, converting and benchmarking (cached stages are skipped)...")
+    pipeline = build_benchmark_pipeline(n_rows=PRELIMINARY_ROWS)
+    results = pipeline.run(targets=["results"])["results"]
     
     # Step 5: Generate summary report
     print("\n[5/5] Generating summary report...")
@@ -1,42 +1,44 @@
-from data_sourcer import DataSourcer, DataPreprocessor
-from workload_generator import WorkloadGenerator
-from format_converter import FormatConverter
-from benchmark_runner import BenchmarkRunner
-from visualizer import BenchmarkVisualizer
+import argparse
+
+from benchmark_runner import DEFAULT_SUITES, SCALE_ROW_COUNTS, SUITES, scale_row_counts
+from data_sourcer import DataSourcer
+from pipeline import build_benchmark_pipeline, build_scale_sweep_pipeline
 
 
 def main():
-    print("=== Phase 1: Data Generation ===")
-    sourcer = DataSourcer()
-    sourcer.clean_data_dir()
-
-    print("\n=== Phase 2: Workload Generation ===")
-    generator = WorkloadGenerator()
-    generator.generate_all_workloads()
-
-    print("\n=== Phase 3: Format Conversion ===")
-    converter = FormatConverter()
-    converter.convert_all_workloads()
-
-    print("\n=== Phase 4: Benchmarking ===")
-    runner = BenchmarkRunner()
-    all_results = runner.run_all_benchmarks(formats=["parquet", "orc"])
-    
-    # Extract parquet and orc results for visualization
-    parquet_results = {w: r.get("parquet", {}) for w, r in all_results.items() if "parquet" in r}
-    orc_results = {w: r.get("orc", {}) for w, r in all_results.items() if "orc" in r}
-
-    print("\n=== Phase 5: Visualization ===")
-    visualizer = BenchmarkVisualizer()
-    if parquet_results and orc_results:
-        visualizer.plot_file_sizes(parquet_results, orc_results)
-        visualizer.plot_full_scan_performance(parquet_results, orc_results)
-        visualizer.plot_selection_latency(parquet_results, orc_results)
+    parser = argparse.ArgumentParser(description="Generate, convert, benchmark and plot all workloads")
+    parser.add_argument("--rows", type=int, default=None, help="Rows per workload (default: rows in each config)")
+    parser.add_argument("--workloads", nargs="+", default=None, help="Workloads to run (default: all)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes for generating columns and converting to ORC (default: 1, serial)")
+    parser.add_argument("--suites", default=",".join(DEFAULT_SUITES),
+                        help=f"Comma-separated benchmark suites, or 'all' (default: %(default)s; "
+                             f"available: {', '.join(SUITES)})")
+    parser.add_argument("--force", action="store_true", help="Rerun every stage, ignoring the cache")
+    parser.add_argument("--clean", action="store_true", help="Delete the data directory (and its cache) first")
+    parser.add_argument("--scale-sweep", action="store_true",
+                        help="Benchmark each workload at geometric row counts and fit scaling curves")
+    parser.add_argument("--max-rows", type=int, default=SCALE_ROW_COUNTS[-1],
+                        help="Largest row count of the scale sweep (x10 steps from 1,000; past the default "
+                             "the arrow scans need RAM for the whole decoded file)")
+    args = parser.parse_args()
+
+    if args.clean:
+        DataSourcer().clean_data_dir()
+
+    # Each stage reruns only when its config, seed, row count, library versions or
+    # an upstream stage changed; everything else comes from data/.pipeline.
+    if args.scale_sweep:
+        row_counts = scale_row_counts(args.max_rows)
+        pipeline = build_scale_sweep_pipeline(row_counts, workloads=args.workloads)
     else:
-        print("  Skipping visualization - missing results for one or both formats")
+        suites = SUITES if args.suites == "all" else tuple(args.suites.split(","))
+        pipeline = build_benchmark_pipeline(n_rows=args.rows, workloads=args.workloads, jobs=args.jobs,
+                                            suites=suites)
+    pipeline.run(force=args.force)
 
     print("\nBenchmark complete! Check results/ and figures/ directories.")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,370 @@
+import os
+import struct
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+
+# pyarrow.orc exposes row/stripe counts but not the column statistics stored in the
+# file tail, so this module decodes the tail directly. Only the fields the benchmarks
+# use are extracted; see https://orc.apache.org/specification/ORCv1/ for the layout.
+
+COMPRESSION_KINDS = {0: "NONE", 1: "ZLIB", 2: "SNAPPY", 3: "LZO", 4: "LZ4", 5: "ZSTD"}
+
+COLUMN_ENCODINGS = {0: "DIRECT", 1: "DICTIONARY", 2: "DIRECT_V2", 3: "DICTIONARY_V2"}
+
+# Stream kinds that hold column data, as opposed to row indexes and bloom filters
+STREAM_KINDS = {
+    0: "PRESENT", 1: "DATA", 2: "LENGTH", 3: "DICTIONARY_DATA", 4: "DICTIONARY_COUNT",
+    5: "SECONDARY", 6: "ROW_INDEX", 7: "BLOOM_FILTER", 8: "BLOOM_FILTER_UTF8",
+}
+
+TYPE_KINDS = {
+    0: "boolean", 1: "byte", 2: "short", 3: "int", 4: "long", 5: "float", 6: "double",
+    7: "string", 8: "binary", 9: "timestamp", 10: "list", 11: "map", 12: "struct",
+    13: "union", 14: "decimal", 15: "date", 16: "varchar", 17: "char", 18: "timestamp_instant",
+}
+
+_TAIL_READ_SIZE = 16 * 1024
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _parse_message(buf: bytes) -> Dict[int, List]:
+    """Decode one protobuf message into {field_number: [raw values]}."""
+    fields = {}
+    pos = 0
+    while pos < len(buf):
+        key, pos = _read_varint(buf, pos)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == 1:
+            value, pos = buf[pos:pos + 8], pos + 8
+        elif wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            value, pos = buf[pos:pos + length], pos + length
+        elif wire_type == 5:
+            value, pos = buf[pos:pos + 4], pos + 4
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+        fields.setdefault(field, []).append(value)
+    return fields
+
+
+def _first(fields: Dict[int, List], field: int, default=None):
+    values = fields.get(field)
+    return values[0] if values else default
+
+
+def _packed_varints(values: List) -> List[int]:
+    out = []
+    for value in values:
+        if isinstance(value, int):
+            out.append(value)
+            continue
+        pos = 0
+        while pos < len(value):
+            item, pos = _read_varint(value, pos)
+            out.append(item)
+    return out
+
+
+def _lz4_block_size(src: bytes) -> int:
+    """Decompressed size of an LZ4 block, from its sequence headers alone."""
+    size = 0
+    pos = 0
+    while pos < len(src):
+        token = src[pos]
+        pos += 1
+        literal_len = token >> 4
+        if literal_len == 15:
+            while True:
+                extra = src[pos]
+                pos += 1
+                literal_len += extra
+                if extra != 255:
+                    break
+        size += literal_len
+        pos += literal_len
+        if pos >= len(src):
+            break
+        # Skip the match offset
+        pos += 2
+        match_len = token & 0x0F
+        if match_len == 15:
+            while True:
+                extra = src[pos]
+                pos += 1
+                match_len += extra
+                if extra != 255:
+                    break
+        size += match_len + 4
+    return size
+
+
+def _zstd_content_size(src: bytes) -> int:
+    descriptor = src[4]
+    fcs_flag = descriptor >> 6
+    single_segment = (descriptor >> 5) & 1
+    pos = 5 + (0 if single_segment else 1) + (0, 1, 2, 4)[descriptor & 0x3]
+    size_bytes = (1 if single_segment else 0, 2, 4, 8)[fcs_flag]
+    if size_bytes == 0:
+        raise ValueError("ZSTD frame does not record its content size")
+    size = int.from_bytes(src[pos:pos + size_bytes], "little")
+    return size + 256 if size_bytes == 2 else size
+
+
+def _chunk_size(kind: str, src: bytes) -> int:
+    """Decompressed size of a compressed chunk; only ZLIB, which records no size, is inflated."""
+    if kind == "ZLIB":
+        return len(zlib.decompress(src, -15))
+    if kind == "SNAPPY":
+        return _read_varint(src, 0)[0]
+    if kind == "ZSTD":
+        return _zstd_content_size(src)
+    if kind == "LZ4":
+        return _lz4_block_size(src)
+    raise ValueError(f"Unsupported ORC compression: {kind}")
+
+
+def _decompress_chunk(kind: str, src: bytes) -> bytes:
+    if kind == "ZLIB":
+        return zlib.decompress(src, -15)
+    codec = {"SNAPPY": "snappy", "ZSTD": "zstd", "LZ4": "lz4_raw"}.get(kind)
+    if codec is None:
+        raise ValueError(f"Unsupported ORC compression: {kind}")
+    return pa.decompress(src, decompressed_size=_chunk_size(kind, src), codec=codec, asbytes=True)
+
+
+def _stream_chunks(buf: bytes):
+    """(is_original, chunk) for each chunk of a compressed stream."""
+    pos = 0
+    while pos < len(buf):
+        header = buf[pos] | (buf[pos + 1] << 8) | (buf[pos + 2] << 16)
+        pos += 3
+        length = header >> 1
+        yield bool(header & 1), buf[pos:pos + length]
+        pos += length
+
+
+def _decompress_stream(kind: str, buf: bytes) -> bytes:
+    if kind == "NONE":
+        return buf
+    return b"".join(chunk if original else _decompress_chunk(kind, chunk)
+                    for original, chunk in _stream_chunks(buf))
+
+
+def _stream_size(kind: str, buf: bytes) -> int:
+    if kind == "NONE":
+        return len(buf)
+    return sum(len(chunk) if original else _chunk_size(kind, chunk) for original, chunk in _stream_chunks(buf))
+
+
+def _parse_column_statistics(buf: bytes) -> Dict:
+    fields = _parse_message(buf)
+    stats = {
+        'num_values': _first(fields, 1, 0),
+        'has_null': bool(_first(fields, 10, 0)),
+        'bytes_on_disk': _first(fields, 11),
+        'min': None,
+        'max': None,
+        'sum': None,
+    }
+
+    if 2 in fields:
+        int_stats = _parse_message(_first(fields, 2))
+        for key, field in (('min', 1), ('max', 2), ('sum', 3)):
+            if field in int_stats:
+                stats[key] = _zigzag(_first(int_stats, field))
+    elif 3 in fields:
+        double_stats = _parse_message(_first(fields, 3))
+        for key, field in (('min', 1), ('max', 2), ('sum', 3)):
+            if field in double_stats:
+                stats[key] = struct.unpack('<d', _first(double_stats, field))[0]
+    elif 4 in fields:
+        string_stats = _parse_message(_first(fields, 4))
+        for key, field in (('min', 1), ('max', 2)):
+            if field in string_stats:
+                stats[key] = _first(string_stats, field).decode('utf-8', errors='replace')
+        if 3 in string_stats:
+            stats['sum'] = _zigzag(_first(string_stats, 3))
+
+    return stats
+
+
+def read_orc_metadata(filepath: str) -> Dict:
+    """Read the stripe layout and file/stripe column statistics (by top-level column) of an ORC file."""
+    file_size = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        read_size = min(file_size, _TAIL_READ_SIZE)
+        f.seek(file_size - read_size)
+        tail = f.read(read_size)
+
+        ps_length = tail[-1]
+        postscript = _parse_message(tail[-1 - ps_length:-1])
+        compression = COMPRESSION_KINDS.get(_first(postscript, 2, 0), "UNKNOWN")
+        footer_length = _first(postscript, 1, 0)
+        metadata_length = _first(postscript, 5, 0)
+
+        needed = 1 + ps_length + footer_length + metadata_length
+        if needed > len(tail):
+            f.seek(file_size - needed)
+            tail = f.read(needed)
+
+    footer_end = len(tail) - 1 - ps_length
+    footer_start = footer_end - footer_length
+    footer = _parse_message(_decompress_stream(compression, tail[footer_start:footer_end]))
+    metadata = _parse_message(
+        _decompress_stream(compression, tail[footer_start - metadata_length:footer_start])
+    )
+
+    types = [_parse_message(t) for t in footer.get(4, [])]
+    root = types[0] if types else {}
+    column_ids = _packed_varints(root.get(2, []))
+    column_names = [name.decode('utf-8') for name in root.get(3, [])]
+    column_types = {
+        name: TYPE_KINDS.get(_first(types[col_id], 1, 0), "unknown")
+        for name, col_id in zip(column_names, column_ids)
+    }
+
+    def by_name(stats_list: List[bytes]) -> Dict[str, Dict]:
+        return {
+            name: _parse_column_statistics(stats_list[col_id])
+            for name, col_id in zip(column_names, column_ids)
+            if col_id < len(stats_list)
+        }
+
+    stripes = []
+    for stripe in footer.get(3, []):
+        info = _parse_message(stripe)
+        stripes.append({
+            'offset': _first(info, 1, 0),
+            'index_length': _first(info, 2, 0),
+            'data_length': _first(info, 3, 0),
+            'footer_length': _first(info, 4, 0),
+            'num_rows': _first(info, 5, 0),
+        })
+
+    stripe_statistics = [by_name(_parse_message(s).get(1, [])) for s in metadata.get(1, [])]
+
+    return {
+        'compression': compression,
+        'compression_block_size': _first(postscript, 3),
+        'num_rows': _first(footer, 6, 0),
+        'row_index_stride': _first(footer, 8),
+        'columns': column_names,
+        'column_ids': dict(zip(column_names, column_ids)),
+        'column_types': column_types,
+        'stripes': stripes,
+        'file_statistics': by_name(footer.get(7, [])),
+        'stripe_statistics': stripe_statistics,
+        'tail_bytes': needed,
+    }
+
+
+def read_orc_column_sizes(filepath: str, metadata: Optional[Dict] = None) -> Dict[str, int]:
+    """On-disk bytes per top-level column, summed over the streams in every stripe footer."""
+    if metadata is None:
+        metadata = read_orc_metadata(filepath)
+    with open(filepath, 'rb') as f:
+        sizes = {}
+        for stripe in metadata['stripes']:
+            f.seek(stripe['offset'] + stripe['index_length'] + stripe['data_length'])
+            stripe_footer = _parse_message(
+                _decompress_stream(metadata['compression'], f.read(stripe['footer_length']))
+            )
+            for stream in stripe_footer.get(1, []):
+                info = _parse_message(stream)
+                col_id = _first(info, 2, 0)
+                sizes[col_id] = sizes.get(col_id, 0) + _first(info, 3, 0)
+
+    # Streams of nested children are not folded into their top-level column.
+    return {name: sizes.get(col_id, 0) for name, col_id in metadata['column_ids'].items()}
+
+
+def read_orc_column_layout(filepath: str, metadata: Optional[Dict] = None) -> Dict[str, Dict]:
+    """Per top-level column: on-disk and decompressed stream bytes, encodings and dictionary bytes."""
+    # Uncompressed files are sized from the stripe footers alone; compressed streams from their chunk headers.
+    if metadata is None:
+        metadata = read_orc_metadata(filepath)
+    compression = metadata['compression']
+    layout = {
+        col_id: {'compressed_bytes': 0, 'uncompressed_bytes': 0, 'encodings': {},
+                 'dictionary_bytes': 0, 'dictionary_entries': 0}
+        for col_id in metadata['column_ids'].values()
+    }
+    with open(filepath, 'rb') as f:
+        for stripe in metadata['stripes']:
+            f.seek(stripe['offset'] + stripe['index_length'] + stripe['data_length'])
+            stripe_footer = _parse_message(_decompress_stream(compression, f.read(stripe['footer_length'])))
+
+            # Streams are stored back to back, in footer order, from the start of the stripe.
+            offset = stripe['offset']
+            for stream in stripe_footer.get(1, []):
+                info = _parse_message(stream)
+                kind = STREAM_KINDS.get(_first(info, 1, 0), "UNKNOWN")
+                col_id = _first(info, 2, 0)
+                length = _first(info, 3, 0)
+                offset += length
+                column = layout.get(col_id)
+                if column is None or kind in ("ROW_INDEX", "BLOOM_FILTER", "BLOOM_FILTER_UTF8"):
+                    continue
+                column['compressed_bytes'] += length
+                if compression == "NONE":
+                    column['uncompressed_bytes'] += length
+                else:
+                    f.seek(offset - length)
+                    column['uncompressed_bytes'] += _stream_size(compression, f.read(length))
+                if kind == "DICTIONARY_DATA":
+                    column['dictionary_bytes'] += length
+
+            for col_id, encoding in enumerate(stripe_footer.get(2, [])):
+                column = layout.get(col_id)
+                if column is None:
+                    continue
+                info = _parse_message(encoding)
+                name = COLUMN_ENCODINGS.get(_first(info, 1, 0), "UNKNOWN")
+                column['encodings'][name] = column['encodings'].get(name, 0) + 1
+                column['dictionary_entries'] += _first(info, 2, 0)
+
+    return {name: layout[col_id] for name, col_id in metadata['column_ids'].items()}
+
+
+def stats_usable(stats: Optional[Dict]) -> bool:
+    """Whether column statistics carry a min/max that bounds the values."""
+    # A NaN in the stripe makes the writer's double min/max meaningless.
+    return stats is not None and stats['min'] is not None and stats['min'] == stats['min']
+
+
+def stripe_may_match(stats: Optional[Dict], value, predicate: str = "range") -> bool:
+    """Whether a stripe's statistics allow rows matching `range` (< value), `equality`, `in_list` or `is_null`."""
+    if stats is None:
+        return True
+    if predicate == "is_null":
+        return stats['has_null']
+    if stats['min'] is None:
+        return stats['num_values'] > 0
+    if not stats_usable(stats):
+        return True
+    if predicate == "range":
+        return stats['min'] < value
+    if predicate == "equality":
+        return stats['min'] <= value <= stats['max']
+    if predicate == "in_list":
+        return any(stats['min'] <= v <= stats['max'] for v in value)
+    raise ValueError(f"Unsupported predicate: {predicate}")
@@ -0,0 +1,341 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import scipy
+
+from benchmark_runner import (DEFAULT_SUITES, SCALE_IN_MEMORY_MAX_ROWS, SCALE_ROW_COUNTS, SCALE_SCAN_ENGINE,
+                              BenchmarkRunner)
+from format_converter import convert_to_orc
+from visualizer import BenchmarkVisualizer
+from workload_config import WORKLOADS, dataset_path, load_workload_config
+from workload_generator import BASE_SEED, DEFAULT_BATCH_SIZE, SAMPLED_SORTEDNESS_ERROR_BOUND, WorkloadGenerator
+
+# Stages are nodes of a small DAG. A node's key hashes its declared inputs together
+# with the keys of the nodes it depends on, so a change anywhere upstream reaches
+# everything downstream of it and nothing else. Return values are stored in the
+# cache under their key, and the manifest records, per key, the mtimes of the files
+# the node wrote; a node is skipped while those still match. Entries of other keys
+# stay, so switching back to an earlier row count or config finds its stages cached.
+MANIFEST_FILE = "manifest.json"
+FORMATS = ("parquet", "orc")
+SCALING_FIGURE = "scaling_curves.png"
+FIGURES = ("file_size_comparison.png", "full_scan_performance.png", "selection_latency_0.1.png")
+
+
+def library_versions() -> Dict[str, str]:
+    return {
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'pyarrow': pa.__version__,
+        'scipy': scipy.__version__,
+    }
+
+
+def content_key(inputs: Dict) -> str:
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class Pipeline:
+    """Runs stages in dependency order, rerunning only those whose key changed."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.stages = {}
+        # Called once run() returns or fails, e.g. to shut down a worker pool the stages share
+        self.cleanups = []
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+    def add(self, name: str, run: Callable[..., Any], inputs: Dict = None, deps: List[str] = (),
+            outputs: List[str] = ()):
+        """Register a stage; `run` is called with the values of `deps`, in order."""
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage {name} depends on unknown stage {dep}")
+        self.stages[name] = {'run': run, 'inputs': inputs or {}, 'deps': list(deps), 'outputs': list(outputs)}
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, "objects", f"{key}.json")
+
+    def _outputs_state(self, outputs: List[str]) -> Dict[str, int]:
+        return {path: os.stat(path).st_mtime_ns for path in outputs if os.path.exists(path)}
+
+    def _fresh(self, name: str, key: str) -> bool:
+        entry = self.manifest.get(key)
+        if entry is None or not os.path.exists(self._object_path(key)):
+            return False
+        outputs = self.stages[name]['outputs']
+        return len(entry['outputs']) == len(outputs) and self._outputs_state(outputs) == entry['outputs']
+
+    def _save_manifest(self):
+        with open(self.manifest_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def run(self, targets: List[str] = None, force: bool = False) -> Dict[str, Any]:
+        """Bring `targets` (default: all) and their dependencies up to date; returns each visited stage's value."""
+        keys = {}
+        values = {}
+        reran = set()
+
+        def visit(name: str):
+            if name in values:
+                return
+            stage = self.stages[name]
+            for dep in stage['deps']:
+                visit(dep)
+            key = content_key({'stage': name, 'inputs': stage['inputs'],
+                               'deps': [keys[dep] for dep in stage['deps']]})
+            keys[name] = key
+
+            if not force and self._fresh(name, key):
+                with open(self._object_path(key), 'r') as f:
+                    values[name] = json.load(f)
+                print(f"[cached] {name}")
+                return
+
+            print(f"[run] {name}")
+            value = stage['run'](*[values[dep] for dep in stage['deps']])
+            # Round-trip through JSON so fresh and cached values look the same downstream.
+            values[name] = json.loads(json.dumps(value, default=str))
+            with open(self._object_path(key), 'w') as f:
+                json.dump(values[name], f)
+            self.manifest[key] = {'stage': name, 'outputs': self._outputs_state(stage['outputs'])}
+            self._save_manifest()
+            reran.add(name)
+
+        try:
+            for name in targets or list(self.stages):
+                visit(name)
+        finally:
+            for cleanup in self.cleanups:
+                cleanup()
+        print(f"Pipeline: {len(reran)} stage(s) rerun, {len(values) - len(reran)} cached")
+        return values
+
+
+def build_benchmark_pipeline(data_dir: str = "data", results_dir: str = "results", config_dir: str = "configs",
+                             figures_dir: str = "figures", n_rows: int = None, workloads: List[str] = None,
+                             formats: tuple = FORMATS, runner: BenchmarkRunner = None,
+                             cache_dir: str = None, jobs: int = 1, suites: tuple = DEFAULT_SUITES) -> Pipeline:
+    """generate -> convert -> benchmark per workload, then the combined `results` and `visualize`."""
+    workloads = workloads or WORKLOADS
+    runner = runner or BenchmarkRunner(data_dir=data_dir, results_dir=results_dir, row_count=n_rows,
+                                       config_dir=config_dir, suites=suites)
+    generator = WorkloadGenerator(config_dir=config_dir, n_rows=n_rows)
+    pipeline = Pipeline(cache_dir or os.path.join(data_dir, ".pipeline"))
+    versions = library_versions()
+    os.makedirs(data_dir, exist_ok=True)
+
+    # With `jobs` > 1 a generate stage fans its columns out to a process pool (as
+    # generate_all_workloads does) and queues its ORC conversion there, so converting
+    # one workload overlaps generating the next. The output is the same as a serial run.
+    pool = {}
+    conversions = {}
+
+    def executor() -> ProcessPoolExecutor:
+        if 'executor' not in pool:
+            pool['executor'] = ProcessPoolExecutor(max_workers=jobs)
+        return pool['executor']
+
+    def shutdown():
+        if 'executor' in pool:
+            pool.pop('executor').shutdown(cancel_futures=True)
+        conversions.clear()
+
+    pipeline.cleanups.append(shutdown)
+
+    def generate(workload, parquet_path):
+        def run():
+            streams = generator.submit_columns(executor(), workload, output_dir=data_dir) if jobs > 1 else None
+            metadata = generator.generate_workload(workload, data_dir, column_streams=streams)
+            if jobs > 1:
+                conversions[workload] = executor().submit(convert_to_orc, parquet_path)
+            return generator._report_workload(metadata)
+        return run
+
+    def convert(workload, parquet_path):
+        def run(generated):
+            if workload in conversions:
+                return conversions.pop(workload).result()
+            return convert_to_orc(parquet_path)
+        return run
+
+    def benchmark(workload, fmt):
+        return lambda *deps: runner.benchmark_workload(workload, fmt)
+
+    benchmark_stages = []
+    for workload in workloads:
+        config = load_workload_config(workload, config_dir)
+        rows = n_rows or config['data']['rows']
+        parquet_path = dataset_path(data_dir, workload, rows, config['data']['columns'], "parquet")
+
+        pipeline.add(
+            f"generate:{workload}", generate(workload, parquet_path),
+            inputs={
+                'config': {k: v for k, v in config.items() if k != 'queries'},
+                'seed': BASE_SEED,
+                'n_rows': rows,
+                'batch_size': DEFAULT_BATCH_SIZE,
+                'string_encoding': generator.string_encoding,
+                'versions': versions,
+            },
+            outputs=[dataset_path(data_dir, workload, rows, config['data']['columns'], "arrow"), parquet_path],
+        )
+        pipeline.add(
+            f"convert:{workload}", convert(workload, parquet_path),
+            inputs={'versions': versions}, deps=[f"generate:{workload}"],
+            outputs=[dataset_path(data_dir, workload, rows, config['data']['columns'], "orc")],
+        )
+        for fmt in formats:
+            deps = [f"generate:{workload}"] + ([f"convert:{workload}"] if fmt == 'orc' else [])
+            name = f"benchmark:{workload}:{fmt}"
+            pipeline.add(
+                name, benchmark(workload, fmt),
+                inputs={
+                    'queries': config.get('queries', []),
+                    'environment': runner.environment,
+                    'scan_engine': runner.scan_engine,
+                    'cache_mode': runner.cache_mode,
+                    'io_strategy': runner.io_strategy,
+                    'suites': list(runner.suites),
+                    'projection_widths': list(runner.projection_widths),
+                    'projection_per_column': runner.projection_per_column,
+                    'versions': versions,
+                },
+                deps=deps,
+            )
+            benchmark_stages.append(name)
+
+    def collect(*results):
+        all_results = {}
+        for name, result in zip(benchmark_stages, results):
+            if result:
+                _, workload, fmt = name.split(':')
+                all_results.setdefault(workload, {})[fmt] = result
+        runner.save_results(all_results)
+        return all_results
+
+    def visualize(all_results):
+        parquet_results = {w: r['parquet'] for w, r in all_results.items() if 'parquet' in r}
+        orc_results = {w: r['orc'] for w, r in all_results.items() if 'orc' in r}
+        if not parquet_results or parquet_results.keys() != orc_results.keys():
+            print("  Skipping visualization - missing results for one or both formats")
+            return []
+        if not all({'full_scan', 'selection_queries'} <= r.keys() for r in (*parquet_results.values(),
+                                                                            *orc_results.values())):
+            print("  Skipping visualization - the full_scan and selection suites were not run")
+            return []
+        visualizer = BenchmarkVisualizer(results_dir, figures_dir)
+        visualizer.plot_file_sizes(parquet_results, orc_results)
+        visualizer.plot_full_scan_performance(parquet_results, orc_results)
+        visualizer.plot_selection_latency(parquet_results, orc_results)
+        return FIGURES
+
+    pipeline.add(
+        "results", collect, deps=benchmark_stages,
+        outputs=[os.path.join(results_dir, f"benchmark_results_{runner.environment}.json")],
+    )
+    pipeline.add(
+        "visualize", visualize, deps=["results"],
+        outputs=[os.path.join(figures_dir, figure) for figure in FIGURES],
+    )
+    return pipeline
+
+
+def build_scale_sweep_pipeline(row_counts: tuple = SCALE_ROW_COUNTS, data_dir: str = os.path.join("data", "scale"),
+                               results_dir: str = "results", config_dir: str = "configs",
+                               figures_dir: str = "figures", workloads: List[str] = None,
+                               formats: tuple = FORMATS, runner: BenchmarkRunner = None,
+                               cache_dir: str = None) -> Pipeline:
+    """Generate and benchmark every workload at each row count, then fit scaling curves."""
+    workloads = workloads or WORKLOADS
+    runner = runner or BenchmarkRunner(data_dir=data_dir, results_dir=results_dir, config_dir=config_dir)
+    generator = WorkloadGenerator(config_dir=config_dir, sortedness_error_bound=SAMPLED_SORTEDNESS_ERROR_BOUND)
+    pipeline = Pipeline(cache_dir or os.path.join(data_dir, ".pipeline"))
+    versions = library_versions()
+    os.makedirs(data_dir, exist_ok=True)
+
+    def generate(workload, n_rows):
+        def run():
+            metadata = generator.write_workload_streaming(workload, n_rows, data_dir, formats=formats)
+            print(f"  {workload} @ {n_rows:,} rows: {metadata['file_size_mb']:.2f} MB")
+            return {fmt: metadata[f'{fmt}_file'] for fmt in formats}
+        return run
+
+    def measure(fmt):
+        return lambda paths: runner.measure_scale_point(paths[fmt])
+
+    point_stages = []
+    for workload in workloads:
+        config = load_workload_config(workload, config_dir)
+        for n_rows in row_counts:
+            generate_stage = f"scale_generate:{workload}:r{n_rows}"
+            pipeline.add(
+                generate_stage, generate(workload, n_rows),
+                inputs={
+                    'config': {k: v for k, v in config.items() if k != 'queries'},
+                    'seed': BASE_SEED,
+                    'n_rows': n_rows,
+                    'batch_size': DEFAULT_BATCH_SIZE,
+                    'string_encoding': generator.string_encoding,
+                    'sortedness_error_bound': generator.sortedness_error_bound,
+                    'formats': list(formats),
+                    'versions': versions,
+                },
+                outputs=[dataset_path(data_dir, workload, n_rows, config['data']['columns'], fmt)
+                         for fmt in formats],
+            )
+            for fmt in formats:
+                name = f"scale_benchmark:{workload}:{fmt}:r{n_rows}"
+                pipeline.add(
+                    name, measure(fmt),
+                    inputs={
+                        'environment': runner.environment,
+                        'scan_engine': SCALE_SCAN_ENGINE,
+                        'in_memory_max_rows': SCALE_IN_MEMORY_MAX_ROWS,
+                        'cache_mode': runner.cache_mode,
+                        'io_strategy': runner.io_strategy,
+                        'versions': versions,
+                    },
+                    deps=[generate_stage],
+                )
+                point_stages.append(name)
+
+    def fit(*points):
+        curves = {}
+        for name, point in zip(point_stages, points):
+            _, workload, fmt, _ = name.split(':')
+            curves.setdefault(workload, {}).setdefault(fmt, {'points': []})['points'].append(point)
+        for workload, by_format in curves.items():
+            for fmt, curve in by_format.items():
+                curve['fits'] = runner.fit_scaling(curve['points'])
+                flagged = [metric for metric, f in curve['fits'].items() if f['super_linear']]
+                exponents = ", ".join(f"{metric} ~ n^{f['exponent']:.2f}" for metric, f in curve['fits'].items())
+                print(f"  {workload}/{fmt}: {exponents}")
+                if flagged:
+                    print(f"    super-linear: {', '.join(flagged)}")
+        runner.save_scale_sweep(curves, row_counts)
+        return curves
+
+    def visualize(curves):
+        BenchmarkVisualizer(results_dir, figures_dir).plot_scaling_curves(curves)
+        return [SCALING_FIGURE]
+
+    pipeline.add(
+        "scale_fit", fit, inputs={'row_counts': list(row_counts)}, deps=point_stages,
+        outputs=[os.path.join(results_dir, f"scale_sweep_results_{runner.environment}.json")],
+    )
+    pipeline.add("scale_visualize", visualize, deps=["scale_fit"],
+                 outputs=[os.path.join(figures_dir, SCALING_FIGURE)])
+    return pipeline
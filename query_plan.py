@@ -0,0 +1,98 @@
+from typing import Dict, List
+
+from column_statistics import QuantileSketch
+from workload_config import COLUMN_KINDS, column_kinds, load_workload_config
+
+PREDICATES = ("range", "equality", "in_list", "is_null")
+
+# Used when a selection entry does not say which columns or predicate shapes to run
+DEFAULT_COLUMN_KINDS = ("float_int",)
+DEFAULT_PREDICATES = ("range",)
+
+# Figure 6 compares formats on this query, so it is planned for every workload
+REFERENCE_QUERY = {'predicate': 'range', 'column_kind': 'float_int', 'selectivity': 0.1}
+
+
+def is_reference_query(query: Dict) -> bool:
+    """Whether a selection result is the REFERENCE_QUERY shape (results predating query plans are)."""
+    return (query.get('predicate', 'range') == REFERENCE_QUERY['predicate']
+            and query.get('column_kind', 'float_int') == REFERENCE_QUERY['column_kind'])
+
+
+def load_workload_queries(config_dir: str, workload: str) -> List[Dict]:
+    """The `queries` section of a workload's YAML config ([] when there is none)."""
+    return load_workload_config(workload, config_dir).get('queries', [])
+
+
+class QueryPlanner:
+    """Expands the `selection` entries of a workload config into concrete predicates."""
+
+    def __init__(self, config_dir: str = "configs"):
+        self.config_dir = config_dir
+
+    def selection_specs(self, workload: str) -> List[Dict]:
+        specs = []
+        for query in load_workload_queries(self.config_dir, workload):
+            if query.get('type') != 'selection':
+                continue
+            kinds = query.get('column_kinds', DEFAULT_COLUMN_KINDS)
+            predicates = query.get('predicates', DEFAULT_PREDICATES)
+            for kind in kinds:
+                if kind not in COLUMN_KINDS:
+                    raise ValueError(f"Unknown column kind in {workload} config: {kind}")
+                for predicate in predicates:
+                    if predicate not in PREDICATES:
+                        raise ValueError(f"Unknown predicate in {workload} config: {predicate}")
+                    selectivities = [None] if predicate == 'is_null' else query.get('selectivity', [])
+                    for selectivity in selectivities:
+                        spec = {'predicate': predicate, 'column_kind': kind, 'selectivity': selectivity}
+                        if spec not in specs:
+                            specs.append(spec)
+
+        if REFERENCE_QUERY not in specs:
+            specs.append(dict(REFERENCE_QUERY))
+        return specs
+
+    def plan(self, workload: str, sketches: Dict[str, QuantileSketch]) -> List[Dict]:
+        """Concrete queries over the columns in `sketches` (column name -> its sketch)."""
+        # Equality and IN-list targets that resolve to the same values are planned once; range queries always.
+        columns = {}
+        kinds = column_kinds(load_workload_config(workload, self.config_dir), list(sketches))
+        for name, kind in kinds.items():
+            columns.setdefault(kind, name)
+
+        queries = []
+        planned_predicates = set()
+        for spec in self.selection_specs(workload):
+            column = columns.get(spec['column_kind'])
+            if column is None:
+                continue
+            sketch = sketches[column]
+
+            selectivity = spec['selectivity']
+            if spec['predicate'] == 'range':
+                value, planned = sketch.threshold(selectivity), selectivity
+            elif spec['predicate'] == 'equality':
+                value, planned = sketch.equality_value(selectivity)
+            elif spec['predicate'] == 'in_list':
+                value, planned = sketch.in_list(selectivity)
+            else:
+                value, planned = None, sketch.null_fraction
+                selectivity = planned
+            if value is None and spec['predicate'] != 'is_null':
+                continue
+            if spec['predicate'] in ('equality', 'in_list'):
+                key = (column, spec['predicate'], tuple(value) if isinstance(value, list) else value)
+                if key in planned_predicates:
+                    continue
+                planned_predicates.add(key)
+
+            queries.append({
+                'predicate': spec['predicate'],
+                'column': column,
+                'column_kind': spec['column_kind'],
+                'selectivity': selectivity,
+                'planned_selectivity': planned,
+                'value': value,
+            })
+        return queries
@@ -7,39 +7,44 @@ Usage:
 """
 
 import os
-import pandas as pd
-from format_converter import FormatConverter
+from format_converter import FormatConverter, convert_to_parquet, csv_column_names
 from benchmark_runner import BenchmarkRunner
+from workload_config import WORKLOADS, column_types, load_workload_config, workload_dataset_path
 
 ROW_COUNT = 1000000
 DATA_DIR = "data"
-WORKLOADS = ["core", "bi", "classic", "geo", "log", "ml"]
 
 print("=" * 60)
 print(f"LARGE-SCALE BENCHMARKS ({ROW_COUNT:,} rows)")
 print("=" * 60)
 
-print("\n[1/3] Converting CSV to Parquet...")
+print("\n[1/3] Converting staged data to Parquet...")
 parquet_files = []
 for workload in WORKLOADS:
-    csv_file = os.path.join(DATA_DIR, f"{workload}_r{ROW_COUNT}_c20_generated.csv")
-    parquet_file = os.path.join(DATA_DIR, f"{workload}_r{ROW_COUNT}_c20_generated.parquet")
+    base_path = os.path.splitext(workload_dataset_path(workload, "parquet", DATA_DIR, ROW_COUNT))[0]
+    parquet_file = f"{base_path}.parquet"
+    # Prefer the Arrow IPC staging file; CSV is only written on request.
+    staged_file = next((f"{base_path}.{ext}" for ext in ("arrow", "csv") if os.path.exists(f"{base_path}.{ext}")),
+                       None)
     
-    if os.path.exists(csv_file):
-        if not os.path.exists(parquet_file):
-            print(f"  Converting {workload} CSV to Parquet...")
-            df = pd.read_csv(csv_file)
-            df.to_parquet(parquet_file, index=False)
-            print(f"    ✓ Created {parquet_file} ({os.path.getsize(parquet_file) / (1024*1024):.2f} MB)")
-        else:
-            print(f"  ✓ {workload} Parquet already exists")
+    if os.path.exists(parquet_file):
+        print(f"  ✓ {workload} Parquet already exists")
+        parquet_files.append(parquet_file)
+    elif staged_file is not None:
+        print(f"  Converting {staged_file} to Parquet...")
+        csv_types = None
+        if staged_file.endswith('.csv'):
+            csv_types = column_types(load_workload_config(workload), csv_column_names(staged_file))
+        convert_to_parquet(staged_file, parquet_file, csv_types)
+        print(f"    ✓ Created {parquet_file} ({os.path.getsize(parquet_file) / (1024*1024):.2f} MB)")
         parquet_files.append(parquet_file)
     else:
-        print(f"  ⚠ {workload} CSV not found: {csv_file}")
+        print(f"  ⚠ {workload} staged data not found: {base_path}.arrow "
+              f"(python workload_generator.py --rows {ROW_COUNT})")
 
 if not parquet_files:
-    print("\n  ERROR: No CSV files found to convert!")
-    print(f"  Expected format: data/{{workload}}_r{ROW_COUNT}_c20_generated.csv")
+    print("\n  ERROR: No staged data found to convert!")
+    print(f"  Expected format: data/{{workload}}_r{ROW_COUNT}_c20_generated.arrow (or .csv)")
     exit(1)
 
 print("\n[2/3] Converting Parquet to ORC...")
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from workload_generator import WorkloadGenerator  # noqa: E402
+
+CONFIG_DIR = os.path.join(REPO_ROOT, "configs")
+TEST_ROWS = 20000
+# Small batches, so every file has several row groups for pushdown to prune
+TEST_BATCH_ROWS = 4096
+
+
+@pytest.fixture(scope="session")
+def core_files(tmp_path_factory):
+    """The core workload at TEST_ROWS rows, written as Parquet and ORC."""
+    output_dir = str(tmp_path_factory.mktemp("data"))
+    generator = WorkloadGenerator(config_dir=CONFIG_DIR, n_rows=TEST_ROWS)
+    metadata = generator.write_workload_streaming("core", output_dir=output_dir, batch_size=TEST_BATCH_ROWS,
+                                                  formats=("parquet", "orc"))
+    return {'parquet': metadata['parquet_file'], 'orc': metadata['orc_file'], 'metadata': metadata}
@@ -0,0 +1,105 @@
+import os
+
+import numpy as np
+import pytest
+
+from benchmark_runner import (PROJECTION_WIDTHS, SCALE_ROW_COUNTS, BenchmarkRunner, fit_power_law,
+                              mark_pareto_optimal)
+from conftest import CONFIG_DIR, TEST_ROWS
+from query_plan import is_reference_query
+from timing_harness import TimingHarness
+
+
+def _variant(name, size, scan, write):
+    return {'id': name, 'file_size_mb': size, 'scan_time_ms': scan, 'write_time_ms': write}
+
+
+def test_dominated_variants_leave_the_pareto_front():
+    variants = mark_pareto_optimal([
+        _variant('small', 1.0, 9.0, 5.0),
+        _variant('fast', 3.0, 2.0, 5.0),
+        _variant('worse', 3.0, 9.0, 5.0),
+        _variant('worst', 4.0, 10.0, 6.0),
+    ])
+    assert [v['id'] for v in variants if v['pareto_optimal']] == ['small', 'fast']
+
+
+def test_ties_do_not_dominate_each_other():
+    variants = mark_pareto_optimal([_variant('a', 1.0, 2.0, 3.0), _variant('b', 1.0, 2.0, 3.0)])
+    assert all(v['pareto_optimal'] for v in variants)
+
+
+def test_objectives_can_be_narrowed():
+    variants = [_variant('small', 1.0, 9.0, 5.0), _variant('fast', 3.0, 2.0, 5.0)]
+    mark_pareto_optimal(variants, objectives=('file_size_mb',))
+    assert [v['pareto_optimal'] for v in variants] == [True, False]
+
+
+def test_power_law_recovers_exponent_and_coefficient():
+    rows = np.array(SCALE_ROW_COUNTS, dtype=float)
+    fit = fit_power_law(rows, 3e-4 * rows ** 1.25)
+    assert fit['exponent'] == pytest.approx(1.25)
+    assert fit['coefficient'] == pytest.approx(3e-4)
+    assert fit['r_squared'] == pytest.approx(1.0)
+
+
+def test_scaling_fits_flag_super_linear_tails(tmp_path):
+    runner = BenchmarkRunner(data_dir=str(tmp_path), results_dir=str(tmp_path))
+    points = [{
+        'num_rows': n,
+        'file_size_mb': 1e-5 * n,
+        # Linear at first, then quadratic over the largest points
+        'scan_time_ms': 1e-3 * n if n <= 100_000 else 1e-3 * 100_000 * (n / 100_000) ** 2,
+        'scan_rows_per_sec': 1e6 * n ** -0.5,
+        'selection_time_ms': None,
+        'pushdown_time_ms': 2.0,
+    } for n in reversed(SCALE_ROW_COUNTS)]
+    fits = runner.fit_scaling(points)
+
+    assert set(fits) == {'file_size_mb', 'scan_time_ms', 'scan_rows_per_sec', 'pushdown_time_ms'}
+    assert fits['file_size_mb']['exponent'] == pytest.approx(1.0)
+    assert not fits['file_size_mb']['super_linear']
+    assert fits['scan_time_ms']['tail_exponent'] == pytest.approx(2.0)
+    assert fits['scan_time_ms']['super_linear']
+    # A rate falling as fast as this means cost grows faster than rows
+    assert fits['scan_rows_per_sec']['super_linear']
+    assert fits['pushdown_time_ms']['exponent'] == pytest.approx(0.0)
+    assert not fits['pushdown_time_ms']['super_linear']
+
+
+def test_projection_scans_the_configured_widths(core_files, tmp_path):
+    runner = BenchmarkRunner(data_dir=str(tmp_path), results_dir=str(tmp_path), config_dir=CONFIG_DIR,
+                             harness=TimingHarness(warmup=0, min_iterations=1, max_iterations=1))
+    projection = runner.benchmark_projection(core_files['parquet'])
+    assert {s['n_columns'] for s in projection['subsets']} == set(PROJECTION_WIDTHS)
+    assert 'per_column' not in projection
+
+    projection = runner.benchmark_projection(core_files['parquet'], widths=(2,), per_column=True)
+    assert {s['n_columns'] for s in projection['subsets']} == {2}
+    assert len(projection['per_column']) == core_files['metadata']['shape'][1]
+    assert sum(k['columns'] for k in projection['per_kind'].values()) == len(projection['per_column'])
+
+
+def test_workload_benchmark_runs_only_the_chosen_suites(core_files, tmp_path):
+    runner = BenchmarkRunner(data_dir=os.path.dirname(core_files['parquet']), results_dir=str(tmp_path),
+                             row_count=TEST_ROWS, config_dir=CONFIG_DIR, suites=("projection", "full_scan"),
+                             harness=TimingHarness(warmup=0, min_iterations=1, max_iterations=1))
+    results = runner.benchmark_workload("core", "orc")
+
+    assert results['suites'] == ["full_scan", "projection"]
+    assert {'full_scan', 'projection'} <= results.keys()
+    assert not {'layout', 'write', 'io_strategies', 'aggregation_queries', 'selection_queries'} & results.keys()
+    with pytest.raises(ValueError):
+        BenchmarkRunner(results_dir=str(tmp_path), suites=("everything",))
+
+
+def test_selection_suite_times_the_reference_queries_only(core_files, tmp_path):
+    runner = BenchmarkRunner(data_dir=os.path.dirname(core_files['parquet']), results_dir=str(tmp_path),
+                             row_count=TEST_ROWS, config_dir=CONFIG_DIR, suites=("selection",),
+                             harness=TimingHarness(warmup=0, min_iterations=1, max_iterations=1))
+    queries = runner.benchmark_workload("core", "parquet")['selection_queries']
+    assert queries and all(is_reference_query(q) for q in queries)
+
+    runner.suites = ("query_plan",)
+    queries = runner.benchmark_workload("core", "parquet")['selection_queries']
+    assert not all(is_reference_query(q) for q in queries)
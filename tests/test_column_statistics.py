@@ -0,0 +1,19 @@
+import pyarrow as pa
+
+from column_statistics import QuantileSketch, column_sketches, load_file_statistics
+from conftest import CONFIG_DIR
+from query_plan import QueryPlanner
+
+
+def test_frequency_ties_break_by_value():
+    for sample in ([3.0, 1.0, 2.0, 1.0, 3.0, 2.0], [2.0, 3.0, 1.0, 2.0, 1.0, 3.0]):
+        assert QuantileSketch.from_sample(pa.array(sample)).frequent_values == [1.0, 2.0, 3.0]
+
+
+def test_parquet_and_orc_plan_the_same_queries(core_files):
+    planner = QueryPlanner(CONFIG_DIR)
+    plans = {
+        format_type: planner.plan("core", column_sketches(load_file_statistics(core_files[format_type])))
+        for format_type in ("parquet", "orc")
+    }
+    assert plans['parquet'] == plans['orc']
@@ -0,0 +1,28 @@
+import pyarrow.orc as orc
+import pyarrow.parquet as pq
+
+from file_inspector import inspect_file
+from orc_metadata import read_orc_column_sizes
+
+
+def test_parquet_layout_matches_the_footer(core_files):
+    layout = inspect_file(core_files['parquet'])
+    metadata = pq.read_metadata(core_files['parquet'])
+
+    assert layout['num_rows'] == metadata.num_rows
+    assert layout['num_zones'] == metadata.num_row_groups > 1
+    assert layout['compressed_bytes'] == sum(metadata.row_group(rg).column(i).total_compressed_size
+                                             for rg in range(metadata.num_row_groups)
+                                             for i in range(metadata.num_columns))
+
+
+def test_orc_layout_matches_the_stripe_footers(core_files):
+    layout = inspect_file(core_files['orc'])
+    sizes = read_orc_column_sizes(core_files['orc'])
+
+    assert layout['num_rows'] == orc.ORCFile(core_files['orc']).nrows
+    assert layout['num_zones'] == orc.ORCFile(core_files['orc']).nstripes
+    # Sizes also count row indexes, which the layout leaves out
+    for name, column in layout['columns'].items():
+        assert 0 < column['compressed_bytes'] <= sizes[name]
+        assert column['min_max_overlap'] is None or 0.0 <= column['min_max_overlap'] <= 1.0
@@ -0,0 +1,135 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.orc as orc
+import pytest
+
+from orc_metadata import (STREAM_KINDS, _decompress_chunk, _decompress_stream, _lz4_block_size, _parse_message,
+                          _zstd_content_size, read_orc_column_layout, read_orc_column_sizes, read_orc_metadata)
+
+CODECS = {"uncompressed": "NONE", "zlib": "ZLIB", "snappy": "SNAPPY", "zstd": "ZSTD", "lz4": "LZ4"}
+ROWS = 50000
+
+
+def _table() -> pa.Table:
+    rng = np.random.default_rng(0)
+    nulls = rng.random(ROWS) < 0.1
+    return pa.table({
+        'i': pa.array(rng.integers(-1000, 1000, ROWS), mask=nulls),
+        'd': pa.array(rng.normal(size=ROWS), mask=np.roll(nulls, 1)),
+        's': pa.array([f"str_{v:04d}" for v in rng.integers(0, 5000, ROWS)], mask=np.roll(nulls, 2)),
+    })
+
+
+def _expected_statistics(table: pa.Table) -> dict:
+    expected = {}
+    for name in table.column_names:
+        column = table[name]
+        bounds = pc.min_max(column)
+        expected[name] = {
+            'num_values': len(column) - column.null_count,
+            'has_null': column.null_count > 0,
+            'min': bounds['min'].as_py(),
+            'max': bounds['max'].as_py(),
+        }
+    expected['i']['sum'] = pc.sum(table['i']).as_py()
+    return expected
+
+
+def _check_statistics(parsed: dict, expected: dict):
+    for name, want in expected.items():
+        assert {key: parsed[name][key] for key in want} == want, name
+
+
+@pytest.fixture(scope="module", params=list(CODECS))
+def orc_file(request, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("orc") / f"{request.param}.orc")
+    # Small stripes, so every codec writes several
+    orc.write_table(_table(), path, compression=request.param, stripe_size=64 * 1024)
+    return request.param, path
+
+
+def test_tail_matches_pyarrow(orc_file):
+    codec, path = orc_file
+    metadata = read_orc_metadata(path)
+    reader = orc.ORCFile(path)
+
+    assert metadata['compression'] == CODECS[codec]
+    assert metadata['num_rows'] == reader.nrows == ROWS
+    assert metadata['columns'] == reader.schema.names
+    assert metadata['column_types'] == {'i': 'long', 'd': 'double', 's': 'string'}
+    assert len(metadata['stripes']) == reader.nstripes > 1
+    assert [s['num_rows'] for s in metadata['stripes']] == [reader.read_stripe(i).num_rows
+                                                             for i in range(reader.nstripes)]
+
+
+def test_statistics_match_the_data(orc_file):
+    _, path = orc_file
+    metadata = read_orc_metadata(path)
+    reader = orc.ORCFile(path)
+
+    _check_statistics(metadata['file_statistics'], _expected_statistics(_table()))
+    assert len(metadata['stripe_statistics']) == reader.nstripes
+    for i, stripe_statistics in enumerate(metadata['stripe_statistics']):
+        stripe = pa.Table.from_batches([reader.read_stripe(i)])
+        _check_statistics(stripe_statistics, _expected_statistics(stripe))
+
+
+def test_column_sizes_cover_the_stripes(orc_file):
+    _, path = orc_file
+    metadata = read_orc_metadata(path)
+    sizes = read_orc_column_sizes(path, metadata)
+
+    assert set(sizes) == {'i', 'd', 's'} and all(size > 0 for size in sizes.values())
+    stripe_bytes = sum(s['index_length'] + s['data_length'] for s in metadata['stripes'])
+    assert sum(sizes.values()) <= stripe_bytes
+
+
+def _payloads() -> list:
+    rng = np.random.default_rng(0)
+    return [
+        b"",
+        b"a",
+        # Short and long literal runs, long matches and everything in between
+        bytes(rng.integers(0, 256, 300, dtype=np.uint8)),
+        b"abc" * 50000,
+        b"".join(bytes(rng.integers(0, 4, 40, dtype=np.uint8)) * 20 for _ in range(2000)),
+        np.arange(100000, dtype=np.int64).tobytes(),
+    ]
+
+
+@pytest.mark.parametrize("payload", _payloads(), ids=range(len(_payloads())))
+def test_lz4_blocks_round_trip(payload):
+    compressed = pa.compress(payload, codec="lz4_raw", asbytes=True)
+    assert _lz4_block_size(compressed) == len(payload)
+    assert _decompress_chunk("LZ4", compressed) == payload
+
+
+@pytest.mark.parametrize("size", [0, 1, 255, 256, 300, 65791, 65792, 100000, 1 << 20])
+def test_zstd_frame_header_records_the_content_size(size):
+    payload = np.random.default_rng(size).integers(0, 8, size, dtype=np.uint8).tobytes()
+    compressed = pa.compress(payload, codec="zstd", asbytes=True)
+    assert _zstd_content_size(compressed) == size
+    assert _decompress_chunk("ZSTD", compressed) == payload
+
+
+def test_layout_sizes_match_the_decompressed_streams(orc_file):
+    _, path = orc_file
+    metadata = read_orc_metadata(path)
+    layout = read_orc_column_layout(path, metadata)
+
+    expected = {name: 0 for name in metadata['columns']}
+    names = {col_id: name for name, col_id in metadata['column_ids'].items()}
+    with open(path, 'rb') as f:
+        for stripe in metadata['stripes']:
+            f.seek(stripe['offset'] + stripe['index_length'] + stripe['data_length'])
+            footer = _parse_message(_decompress_stream(metadata['compression'], f.read(stripe['footer_length'])))
+            f.seek(stripe['offset'])
+            for stream in footer.get(1, []):
+                info = _parse_message(stream)
+                raw = f.read(info[3][0])
+                name = names.get(info.get(2, [0])[0])
+                if name is not None and STREAM_KINDS[info.get(1, [0])[0]] not in ("ROW_INDEX", "BLOOM_FILTER"):
+                    expected[name] += len(_decompress_stream(metadata['compression'], raw))
+
+    assert {name: column['uncompressed_bytes'] for name, column in layout.items()} == expected
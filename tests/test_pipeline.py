@@ -0,0 +1,88 @@
+import re
+
+import pyarrow.orc as orc
+import pyarrow.parquet as pq
+import pytest
+
+from benchmark_runner import BenchmarkRunner
+from conftest import CONFIG_DIR
+from pipeline import Pipeline, build_benchmark_pipeline
+from timing_harness import TimingHarness
+
+EXPENSIVE_STAGES = {"generate:core", "convert:core", "benchmark:core:parquet", "benchmark:core:orc"}
+
+
+def _reran(capsys) -> set:
+    return set(re.findall(r"^\[run\] (\S+)$", capsys.readouterr().out, re.MULTILINE))
+
+
+@pytest.fixture
+def build(tmp_path):
+    def build(n_rows, **kwargs):
+        results_dir = tmp_path / "results"
+        results_dir.mkdir(exist_ok=True)
+        runner = BenchmarkRunner(data_dir=str(tmp_path / "data"), results_dir=str(results_dir), row_count=n_rows,
+                                 harness=TimingHarness(warmup=0, min_iterations=1, max_iterations=1),
+                                 config_dir=CONFIG_DIR)
+        return build_benchmark_pipeline(str(tmp_path / "data"), str(results_dir), CONFIG_DIR,
+                                        str(tmp_path / "figures"), n_rows=n_rows, workloads=["core"],
+                                        runner=runner, **kwargs)
+    return build
+
+
+def test_alternating_row_counts_hit_the_cache(build, capsys):
+    for n_rows in (2000, 3000):
+        build(n_rows).run()
+        assert EXPENSIVE_STAGES <= _reran(capsys)
+
+    for n_rows in (2000, 3000):
+        build(n_rows).run()
+        # Only the stages that rewrite the shared results JSON and figures run again
+        assert _reran(capsys) == {"results", "visualize"}
+
+
+def test_stages_rerun_when_their_inputs_or_outputs_change(tmp_path):
+    calls = []
+    output = tmp_path / "a.txt"
+
+    def build(a_input):
+        def write_a():
+            calls.append("a")
+            output.write_text(a_input)
+            return a_input
+
+        pipeline = Pipeline(str(tmp_path / "cache"))
+        pipeline.add("a", write_a, inputs={'value': a_input}, outputs=[str(output)])
+        pipeline.add("b", lambda a: calls.append("b") or a + "!", deps=["a"])
+        pipeline.add("c", lambda: calls.append("c") or "c")
+        return pipeline
+
+    assert build("x").run() == {'a': "x", 'b': "x!", 'c': "c"}
+    assert calls == ["a", "b", "c"]
+
+    calls.clear()
+    assert build("y").run()['b'] == "y!"
+    assert calls == ["a", "b"]
+
+    calls.clear()
+    output.unlink()
+    build("y").run()
+    assert calls == ["a"]
+
+    calls.clear()
+    build("y").run(force=True)
+    assert calls == ["a", "b", "c"]
+
+
+def test_parallel_generation_matches_serial(tmp_path):
+    tables = {}
+    for jobs in (1, 2):
+        data_dir = tmp_path / f"jobs{jobs}"
+        pipeline = build_benchmark_pipeline(str(data_dir), str(tmp_path / "results"), CONFIG_DIR, n_rows=3000,
+                                            workloads=["core"], jobs=jobs)
+        values = pipeline.run(targets=["convert:core"])
+        orc_path = values['convert:core']
+        tables[jobs] = {'parquet': pq.read_table(orc_path[:-len(".orc")] + ".parquet"),
+                        'orc': orc.read_table(orc_path)}
+    assert tables[1]['parquet'].equals(tables[2]['parquet'])
+    assert tables[1]['orc'].equals(tables[2]['orc'])
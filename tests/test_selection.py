@@ -0,0 +1,29 @@
+import pytest
+
+from benchmark_runner import BenchmarkRunner
+from column_statistics import column_sketches, load_file_statistics
+from conftest import CONFIG_DIR
+from query_plan import PREDICATES, QueryPlanner
+from timing_harness import TimingHarness
+
+
+@pytest.fixture
+def runner(tmp_path):
+    harness = TimingHarness(warmup=0, min_iterations=1, max_iterations=1)
+    return BenchmarkRunner(data_dir=str(tmp_path), results_dir=str(tmp_path / "results"), harness=harness,
+                           config_dir=CONFIG_DIR)
+
+
+@pytest.mark.parametrize("format_type", ["parquet", "orc"])
+def test_in_memory_and_pushdown_select_the_same_rows(core_files, runner, format_type):
+    filepath = core_files[format_type]
+    queries = QueryPlanner(CONFIG_DIR).plan("core", column_sketches(load_file_statistics(filepath)))
+    assert {q['predicate'] for q in queries} == set(PREDICATES)
+    assert {'float_int', 'noisy_float', 'string'} <= {q['column_kind'] for q in queries}
+
+    df = runner._read_file(filepath)
+    for query in queries:
+        plan = {k: query[k] for k in ('column', 'selectivity', 'predicate', 'value')}
+        in_memory = runner.measure_selection_query(filepath, iterations=1, df=df, **plan)
+        pushdown = runner.measure_pushdown_selection(filepath, iterations=1, **plan)
+        assert in_memory['rows_selected'] == pushdown['rows_selected'], query
@@ -0,0 +1,69 @@
+import itertools
+
+import numpy as np
+
+from timing_harness import TimingHarness
+
+
+def _durations(values):
+    """A callable that returns the next of `values` each time, like a timed run."""
+    values = iter(values)
+    return lambda: next(values)
+
+
+def test_steady_durations_stop_at_the_minimum():
+    harness = TimingHarness(warmup=2, min_iterations=5, max_iterations=30)
+    result = harness.run(_durations(itertools.repeat(0.01)))
+
+    assert result['converged']
+    assert len(result['samples']['total']) == 5
+    assert len(result['warmup']) == 2
+
+
+def test_noisy_durations_run_to_the_maximum():
+    rng = np.random.default_rng(0)
+    harness = TimingHarness(warmup=0, min_iterations=5, max_iterations=12)
+    result = harness.run(_durations(rng.uniform(0.001, 0.1, size=100)))
+
+    assert not result['converged']
+    assert len(result['samples']['total']) == 12
+
+
+def test_noise_is_sampled_until_the_interval_narrows():
+    rng = np.random.default_rng(0)
+    harness = TimingHarness(warmup=0, min_iterations=5, max_iterations=1000, target_ci_width=0.05)
+    result = harness.run(_durations(rng.normal(1.0, 0.1, size=1000)))
+
+    assert result['converged']
+    samples = result['samples']['total']
+    assert 5 < len(samples) < 1000
+    low, high = harness.bootstrap_ci(samples)
+    assert (high - low) / np.mean(samples) <= 0.05
+
+
+def test_per_call_minimum_overrides_the_harness():
+    harness = TimingHarness(warmup=0, min_iterations=2, max_iterations=3)
+    result = harness.run(_durations(itertools.repeat(0.01)), min_iterations=8)
+    assert len(result['samples']['total']) == 8
+
+
+def test_phases_are_kept_and_summed():
+    harness = TimingHarness(warmup=1, min_iterations=3, max_iterations=3)
+    result = harness.run(lambda: {'read': 0.002, 'decode': 0.003})
+
+    assert result['samples']['read'] == [0.002] * 3
+    assert result['samples']['decode'] == [0.003] * 3
+    assert np.allclose(result['samples']['total'], 0.005)
+    assert np.allclose(result['warmup'], 0.005)
+
+
+def test_report_is_in_milliseconds_with_the_mean_inside_the_interval():
+    rng = np.random.default_rng(1)
+    harness = TimingHarness(warmup=0, min_iterations=20, max_iterations=20)
+    report = harness.report(harness.run(_durations(rng.normal(0.05, 0.005, size=20))))
+
+    assert report['iterations'] == 20 and report['warmup_iterations'] == 0
+    assert len(report['samples_ms']) == 20
+    assert report['ci_low_ms'] <= report['mean_time_ms'] <= report['ci_high_ms']
+    assert report['p50_time_ms'] <= report['p90_time_ms'] <= report['p99_time_ms'] <= report['max_time_ms']
+    assert 40 < report['mean_time_ms'] < 60
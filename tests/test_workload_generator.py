@@ -0,0 +1,114 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import yaml
+
+import workload_generator
+from conftest import CONFIG_DIR, TEST_BATCH_ROWS, TEST_ROWS
+from workload_generator import (SAMPLED_SORTEDNESS_ERROR_BOUND, WorkloadGenerator, _count_inversions,
+                                calculate_sortedness, string_values)
+
+ERROR_BOUND = 0.01
+
+
+def test_count_inversions_matches_brute_force():
+    values = np.random.default_rng(0).integers(0, 50, 300)
+    expected = sum(int(values[i] > values[j]) for i in range(len(values)) for j in range(i + 1, len(values)))
+    assert _count_inversions(values) == expected
+
+
+def test_calculate_sortedness_skips_nulls():
+    assert calculate_sortedness(np.array([1.0, np.nan, 2.0, 3.0])) == 1.0
+    assert calculate_sortedness(np.array([3.0, 2.0, np.nan, 1.0])) == 0.0
+
+
+def test_strings_sort_as_their_codes():
+    codes = np.array([9, 10, 0, 123])
+    strings = string_values(codes, width=3).to_pylist()
+    assert strings == ["str_009", "str_010", "str_000", "str_123"]
+    assert np.argsort(strings, kind='stable').tolist() == np.argsort(codes, kind='stable').tolist()
+
+
+def test_sorted_string_column_is_measured_sorted(tmp_path):
+    config = yaml.safe_load(open(os.path.join(CONFIG_DIR, "core.yaml")))
+    config['columns'] = {2: {'type': 'string', 'sortedness': 1.0, 'ndv_ratio': 0.5}}
+    with open(tmp_path / "core.yaml", "w") as f:
+        yaml.safe_dump(config, f)
+
+    generator = WorkloadGenerator(config_dir=str(tmp_path), n_rows=TEST_ROWS)
+    metadata = generator.write_workload_streaming("core", output_dir=str(tmp_path), batch_size=TEST_BATCH_ROWS)
+    assert metadata['columns'][2]['actual_sortedness'] == 1.0
+
+    values = pc.drop_null(pq.read_table(metadata['parquet_file'], columns=['col_2'])['col_2']).to_pylist()
+    assert values == sorted(values)
+
+
+def test_sampled_sortedness_is_within_bound_of_exact(core_files, tmp_path):
+    generator = WorkloadGenerator(config_dir=CONFIG_DIR, n_rows=TEST_ROWS, sortedness_error_bound=ERROR_BOUND)
+    sampled = generator.write_workload_streaming("core", output_dir=str(tmp_path), batch_size=TEST_BATCH_ROWS)
+    exact = core_files['metadata']
+
+    # Sampling only changes how sortedness is measured, never the data
+    assert pq.read_table(sampled['parquet_file']).equals(pq.read_table(exact['parquet_file']))
+    # The bound holds per column at 95% confidence; at twice the bound Hoeffding's
+    # failure probability is below 1e-6, so no column should miss it.
+    for exact_column, sampled_column in zip(exact['columns'], sampled['columns']):
+        assert abs(exact_column['actual_sortedness'] - sampled_column['actual_sortedness']) <= 2 * ERROR_BOUND
+
+
+def test_long_workloads_sample_sortedness(core_files, tmp_path, monkeypatch):
+    monkeypatch.setattr(workload_generator, "EXACT_SORTEDNESS_MAX_ROWS", TEST_ROWS - 1)
+    generator = WorkloadGenerator(config_dir=CONFIG_DIR, n_rows=TEST_ROWS)
+    metadata = generator.write_workload_streaming("core", output_dir=str(tmp_path), batch_size=TEST_BATCH_ROWS)
+
+    assert metadata['sortedness_measurement'] == 'sampled'
+    assert metadata['sortedness_error_bound'] == SAMPLED_SORTEDNESS_ERROR_BOUND
+    assert core_files['metadata']['sortedness_measurement'] == 'exact'
+    assert core_files['metadata']['sortedness_error_bound'] is None
+
+
+def test_column_tasks_match_a_serial_run(core_files, tmp_path):
+    generator = WorkloadGenerator(config_dir=CONFIG_DIR, n_rows=TEST_ROWS)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        streams = generator.submit_columns(executor, "core", output_dir=str(tmp_path), batch_size=TEST_BATCH_ROWS)
+        parallel = generator.write_workload_streaming("core", output_dir=str(tmp_path), batch_size=TEST_BATCH_ROWS,
+                                                      formats=("parquet", "orc"), column_streams=streams)
+    serial = core_files['metadata']
+
+    for format_type in ("parquet", "orc"):
+        with open(parallel[f'{format_type}_file'], 'rb') as a, open(serial[f'{format_type}_file'], 'rb') as b:
+            assert a.read() == b.read()
+    assert parallel['columns'] == serial['columns']
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.arrows')]
+
+
+def test_recorded_row_groups_match_the_file(core_files):
+    metadata = core_files['metadata']
+    parquet = pq.ParquetFile(metadata['parquet_file']).metadata
+    written = [parquet.row_group(i).num_rows for i in range(parquet.num_row_groups)]
+    assert metadata['row_group_rows'] == TEST_BATCH_ROWS == max(written)
+    for column in metadata['columns']:
+        assert len(column['row_group_overlap']) == parquet.num_row_groups
+        assert column['mean_row_group_overlap'] is not None
+
+
+def test_exact_ndv_matches_the_file_and_bounds_the_estimate(core_files, tmp_path):
+    metadata = core_files['metadata']
+    table = pq.read_table(metadata['parquet_file'])
+    for column in metadata['columns']:
+        values = table[f"col_{column['column']}"]
+        if pa.types.is_dictionary(values.type):
+            values = values.cast(values.type.value_type)
+        exact = pc.count_distinct(values).as_py()
+        assert column['actual_ndv'] == exact
+        # Three standard errors
+        assert abs(column['estimated_ndv'] - exact) <= 3 * column['ndv_error_bound'] * exact
+
+    generator = WorkloadGenerator(config_dir=CONFIG_DIR, n_rows=TEST_ROWS, sortedness_error_bound=ERROR_BOUND)
+    sampled = generator.write_workload_streaming("core", output_dir=str(tmp_path), batch_size=TEST_BATCH_ROWS)
+    assert all(c['actual_ndv'] is None for c in sampled['columns'])
+    assert [c['estimated_ndv'] for c in sampled['columns']] == [c['estimated_ndv'] for c in metadata['columns']]
@@ -0,0 +1,109 @@
+import time
+from typing import Callable, Dict, List, Tuple, Union
+
+import numpy as np
+
+# Iteration counts adapt to the noise: after `min_iterations` timed runs, sampling
+# continues until the bootstrap CI of the mean is narrower than `target_ci_width`
+# (relative to the mean) or `max_iterations` is reached.
+DEFAULT_WARMUP = 1
+DEFAULT_MIN_ITERATIONS = 5
+DEFAULT_MAX_ITERATIONS = 30
+DEFAULT_TARGET_CI_WIDTH = 0.05
+
+PERCENTILES = (50, 90, 99)
+
+
+def timed(fn: Callable) -> Callable[[], float]:
+    """Wrap a zero-argument callable so it returns its own wall-clock duration in seconds."""
+    def run() -> float:
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+    return run
+
+
+class TimingHarness:
+    def __init__(self, warmup: int = DEFAULT_WARMUP, min_iterations: int = DEFAULT_MIN_ITERATIONS,
+                 max_iterations: int = DEFAULT_MAX_ITERATIONS, target_ci_width: float = DEFAULT_TARGET_CI_WIDTH,
+                 confidence: float = 0.95, n_bootstrap: int = 1000, seed: int = 0):
+        self.warmup = warmup
+        self.min_iterations = min_iterations
+        self.max_iterations = max(max_iterations, min_iterations)
+        self.target_ci_width = target_ci_width
+        self.confidence = confidence
+        self.n_bootstrap = n_bootstrap
+        self.seed = seed
+
+    def bootstrap_ci(self, samples) -> Tuple[float, float]:
+        """Percentile bootstrap confidence interval of the mean."""
+        samples = np.asarray(samples, dtype=float)
+        if len(samples) < 2:
+            return float(samples[0]), float(samples[0])
+        rng = np.random.default_rng(self.seed)
+        means = rng.choice(samples, size=(self.n_bootstrap, len(samples))).mean(axis=1)
+        tail = (1 - self.confidence) / 2 * 100
+        low, high = np.percentile(means, [tail, 100 - tail])
+        return float(low), float(high)
+
+    def _converged(self, samples: List[float]) -> bool:
+        mean = np.mean(samples)
+        low, high = self.bootstrap_ci(samples)
+        return bool(mean > 0 and (high - low) / mean <= self.target_ci_width)
+
+    def run(self, fn: Callable[[], Union[float, Dict[str, float]]], min_iterations: int = None) -> Dict:
+        """Call `fn` (returning seconds, or a dict of per-phase seconds) through warmup and timed iterations."""
+        min_iterations = min_iterations or self.min_iterations
+        max_iterations = max(self.max_iterations, min_iterations)
+
+        warmup = []
+        for _ in range(self.warmup):
+            phases = fn()
+            warmup.append(sum(phases.values()) if isinstance(phases, dict) else phases)
+
+        samples = {'total': []}
+        converged = False
+        while len(samples['total']) < max_iterations:
+            phases = fn()
+            if isinstance(phases, dict):
+                for name, seconds in phases.items():
+                    samples.setdefault(name, []).append(seconds)
+                samples['total'].append(sum(phases.values()))
+            else:
+                samples['total'].append(phases)
+
+            if len(samples['total']) >= min_iterations:
+                converged = self._converged(samples['total'])
+                if converged:
+                    break
+
+        return {'samples': samples, 'warmup': warmup, 'converged': converged}
+
+    def summarize(self, samples: List[float], prefix: str = "") -> Dict:
+        """Mean/std, percentiles, max, bootstrap CI and raw samples, all in milliseconds."""
+        ms = np.asarray(samples, dtype=float) * 1000
+        low, high = self.bootstrap_ci(ms)
+        summary = {
+            f'{prefix}mean_time_ms': float(np.mean(ms)),
+            f'{prefix}std_time_ms': float(np.std(ms)),
+        }
+        for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+            summary[f'{prefix}p{p}_time_ms'] = float(value)
+        summary.update({
+            f'{prefix}max_time_ms': float(np.max(ms)),
+            f'{prefix}ci_low_ms': low,
+            f'{prefix}ci_high_ms': high,
+            f'{prefix}samples_ms': ms.tolist(),
+        })
+        return summary
+
+    def report(self, result: Dict) -> Dict:
+        """Summary of a run()'s total time plus iteration bookkeeping."""
+        summary = self.summarize(result['samples']['total'])
+        summary.update({
+            'iterations': len(result['samples']['total']),
+            'warmup_iterations': len(result['warmup']),
+            'converged': result['converged'],
+            'confidence': self.confidence,
+        })
+        return summary
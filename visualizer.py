@@ -4,6 +4,8 @@ from typing import Dict, List
 import matplotlib.pyplot as plt
 import numpy as np
 
+from query_plan import is_reference_query
+
 
 class BenchmarkVisualizer:
     def __init__(self, results_dir: str = "results", figures_dir: str = "figures"):
@@ -78,10 +80,10 @@ class BenchmarkVisualizer:
 
         for w in workloads:
             p_query = next(
-                q for q in parquet_results[w]["selection_queries"] if q["selectivity"] == selectivity
+                q for q in parquet_results[w]["selection_queries"] if q["selectivity"] == selectivity and is_reference_query(q)
             )
             o_query = next(
-                q for q in orc_results[w]["selection_queries"] if q["selectivity"] == selectivity
+                q for q in orc_results[w]["selection_queries"] if q["selectivity"] == selectivity and is_reference_query(q)
             )
             parquet_latencies.append(p_query["mean_time_ms"])
             orc_latencies.append(o_query["mean_time_ms"])
@@ -94,3 +96,30 @@ class BenchmarkVisualizer:
             title=f"Selection Query Latency (Selectivity={selectivity})",
             filename=f"selection_latency_{selectivity}.png",
         )
+
+    def plot_scaling_curves(self, curves: Dict, filename: str = "scaling_curves.png"):
+        """Log-log scan latency, file size and scan throughput against row count."""
+        metrics = [
+            ("scan_time_ms", "Full Scan Latency (ms)"),
+            ("file_size_mb", "File Size (MB)"),
+            ("scan_rows_per_sec", "Throughput (rows/sec)"),
+        ]
+        fig, axes = plt.subplots(1, len(metrics), figsize=(18, 5))
+        for ax, (metric, ylabel) in zip(axes, metrics):
+            for workload, by_format in curves.items():
+                for fmt, curve in by_format.items():
+                    points = sorted(curve["points"], key=lambda p: p["num_rows"])
+                    fit = curve["fits"].get(metric)
+                    label = f"{workload}/{fmt}" + (f" (n^{fit['exponent']:.2f})" if fit else "")
+                    ax.plot([p["num_rows"] for p in points], [p[metric] for p in points],
+                            marker="o", linestyle="-" if fmt == "parquet" else "--", label=label)
+            ax.set_xscale("log")
+            ax.set_yscale("log")
+            ax.set_xlabel("Rows")
+            ax.set_ylabel(ylabel)
+            ax.set_title(ylabel.split(" (")[0] + " Scaling")
+        axes[0].legend(fontsize=7)
+
+        plt.tight_layout()
+        plt.savefig(os.path.join(self.figures_dir, filename))
+        plt.close()
@@ -0,0 +1,118 @@
+import os
+from typing import Dict, List
+
+import pyarrow as pa
+import yaml
+
+# configs/<workload>.yaml is the single source of truth for what a workload looks
+# like: row and column counts, the NDV/null/skew ranges columns are drawn from, and
+# optional per-column specs. Everything that generates, names or interprets a
+# dataset goes through this module.
+
+WORKLOADS = ["core", "bi", "classic", "geo", "log", "ml"]
+
+# Columns cycle through these kinds by index unless a column spec says otherwise:
+# integer values stored as float, continuous floats, and strings.
+COLUMN_KINDS = ("float_int", "noisy_float", "string")
+SKEW_TYPES = ("uniform", "zipf", "hotspot")
+
+# Skew parameters: Zipf exponent, and the share of values that are hot and of rows
+# that take a hot value. Set in `characteristics` for a workload or per column.
+DISTRIBUTION_PARAMS = ("zipf_alpha", "hotspot_ratio", "hot_fraction")
+
+# How the in-order rows of a column are laid out: one global sort with random rows
+# mixed in, independently sorted runs of `run_length` rows (appended sorted files,
+# LSM flushes), or time order with a fraction of rows arriving `late_delay` rows late
+# on average (event-time logs).
+SORTEDNESS_MODES = ("global", "runs", "late_arrivals")
+SORTEDNESS_PARAMS = ("sortedness_mode", "run_length", "late_delay")
+
+# Keys a `columns` entry may set; anything left out is drawn from `characteristics`.
+COLUMN_SPEC_KEYS = (("type", "distribution", "ndv_ratio", "null_ratio", "sortedness")
+                    + DISTRIBUTION_PARAMS + SORTEDNESS_PARAMS)
+
+
+def column_kind(col_idx: int) -> str:
+    return COLUMN_KINDS[col_idx % len(COLUMN_KINDS)]
+
+
+def load_workload_config(workload: str, config_dir: str = "configs") -> Dict:
+    """The parsed configs/<workload>.yaml ({} when there is none)."""
+    config_path = os.path.join(config_dir, f"{workload}.yaml")
+    if not os.path.exists(config_path):
+        return {}
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def dataset_path(data_dir: str, workload: str, n_rows: int, n_cols: int, ext: str) -> str:
+    return os.path.join(data_dir, f"{workload}_r{n_rows}_c{n_cols}_generated.{ext}")
+
+
+def workload_dataset_path(workload: str, ext: str, data_dir: str = "data", n_rows: int = None,
+                          config_dir: str = "configs") -> str:
+    """Path of a generated dataset; `n_rows` defaults to the rows in the workload's config."""
+    data = load_workload_config(workload, config_dir)['data']
+    return dataset_path(data_dir, workload, n_rows or data['rows'], data['columns'], ext)
+
+
+def column_spec(config: Dict, col_idx: int) -> Dict:
+    """The `columns` entry for a column (keyed by index), validated; {} when there is none."""
+    spec = (config.get('columns') or {}).get(col_idx, {})
+    unknown = set(spec) - set(COLUMN_SPEC_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown keys in spec of column {col_idx}: {sorted(unknown)}")
+    if spec.get('type', COLUMN_KINDS[0]) not in COLUMN_KINDS:
+        raise ValueError(f"Unknown column type for column {col_idx}: {spec['type']}")
+    if spec.get('distribution', SKEW_TYPES[0]) not in SKEW_TYPES:
+        raise ValueError(f"Unknown distribution for column {col_idx}: {spec['distribution']}")
+    return spec
+
+
+def distribution_params(config: Dict, col_idx: int, defaults: Dict[str, float]) -> Dict[str, float]:
+    """DISTRIBUTION_PARAMS of a column: its spec, else `characteristics`, else `defaults`."""
+    characteristics = config.get('characteristics', {})
+    spec = column_spec(config, col_idx)
+    params = {key: float(spec.get(key, characteristics.get(key, defaults[key]))) for key in DISTRIBUTION_PARAMS}
+    if params['zipf_alpha'] <= 0:
+        raise ValueError(f"zipf_alpha must be positive for column {col_idx}: {params['zipf_alpha']}")
+    for key in ("hotspot_ratio", "hot_fraction"):
+        if not 0 < params[key] < 1:
+            raise ValueError(f"{key} must be in (0, 1) for column {col_idx}: {params[key]}")
+    return params
+
+
+def sortedness_params(config: Dict, col_idx: int, defaults: Dict) -> Dict:
+    """SORTEDNESS_PARAMS of a column: its spec, else `characteristics`, else `defaults`."""
+    characteristics = config.get('characteristics', {})
+    spec = column_spec(config, col_idx)
+    params = {key: spec.get(key, characteristics.get(key, defaults[key])) for key in SORTEDNESS_PARAMS}
+    if params['sortedness_mode'] not in SORTEDNESS_MODES:
+        raise ValueError(f"Unknown sortedness mode for column {col_idx}: {params['sortedness_mode']}")
+    params['run_length'] = int(params['run_length'])
+    params['late_delay'] = float(params['late_delay'])
+    if params['run_length'] < 1 or params['late_delay'] <= 0:
+        raise ValueError(f"run_length and late_delay must be positive for column {col_idx}")
+    return params
+
+
+def row_group_rows(config: Dict, default: int) -> int:
+    """Rows per Parquet row group of the workload's generated files."""
+    return int(config.get('data', {}).get('row_group_rows', default))
+
+
+def column_kinds(config: Dict, names: List[str] = None) -> Dict[str, str]:
+    """Kind of each `col_<i>` column: its spec's `type`, else the index convention."""
+    if names is None:
+        names = [f'col_{i}' for i in range(config['data']['columns'])]
+    kinds = {}
+    for name in names:
+        col_idx = int(name.split('_')[-1])
+        kinds[name] = column_spec(config, col_idx).get('type', column_kind(col_idx)) if config else column_kind(col_idx)
+    return kinds
+
+
+def column_types(config: Dict, names: List[str] = None) -> Dict[str, pa.DataType]:
+    """Arrow type of each generated column, for readers that would otherwise infer it."""
+    return {name: pa.string() if kind == 'string' else pa.float64()
+            for name, kind in column_kinds(config, names).items()}
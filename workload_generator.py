@@ -1,179 +1,645 @@
+import argparse
 import pandas as pd
 import numpy as np
-import yaml
 import os
-from typing import Dict, List, Tuple, Any
-from scipy import stats
+from typing import Dict, List, Optional, Tuple
 import json
+import zlib
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 
-class WorkloadGenerator:
-    def __init__(self, config_dir: str = "configs"):
-        self.config_dir = config_dir
-        self.workloads = ["core", "bi", "classic", "geo", "log", "ml"]
-        self.results = {}
-        
-    def load_config(self, workload: str) -> Dict:
-        config_path = os.path.join(self.config_dir, f"{workload}.yaml")
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
-    
-    def generate_zipf_distribution(self, n_rows: int, ndv: int, alpha: float = 1.5) -> np.ndarray:
-        x = np.arange(1, ndv + 1)
-        weights = 1 / (x ** alpha)
-        weights = weights / weights.sum()
-        return np.random.choice(ndv, size=n_rows, p=weights)
-    
-    def generate_hotspot_distribution(self, n_rows: int, ndv: int, hotspot_ratio: float = 0.1) -> np.ndarray:
-        hotspot_size = max(1, int(ndv * hotspot_ratio))
-        cold_size = max(1, ndv - hotspot_size)
-        hotspot_values = np.random.randint(0, hotspot_size, int(n_rows * 0.8))
-        cold_values = np.random.randint(hotspot_size, ndv, int(n_rows * 0.2))
-        return np.concatenate([hotspot_values, cold_values])[:n_rows]
-    
-    def generate_uniform_distribution(self, n_rows: int, ndv: int) -> np.ndarray:
-        return np.random.randint(0, ndv, n_rows)
-    
-    def apply_sortedness(self, values: np.ndarray, sortedness: float) -> np.ndarray:
-        if sortedness >= 1.0:
-            return np.sort(values)
-        elif sortedness <= 0.0:
-            return values
-        
-        n_shuffles = int(len(values) * (1 - sortedness))
-        indices = np.random.choice(len(values), size=n_shuffles, replace=False)
-        shuffled_values = values.copy()
-        np.random.shuffle(shuffled_values[indices])
-        return shuffled_values
-    
-    def generate_column(self, workload: str, col_idx: int, n_rows: int, config: Dict) -> Tuple[np.ndarray, Dict]:
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.orc as orc
+import pyarrow.parquet as pq
+
+from column_statistics import NDVSketch, load_file_statistics, zone_overlaps
+from format_converter import decode_dictionaries, orc_dictionary_threshold
+from workload_config import (WORKLOADS, column_kind, column_kinds, column_spec, dataset_path, distribution_params,
+                             load_workload_config, row_group_rows, sortedness_params)
+
+BASE_SEED = 42
+DEFAULT_BATCH_SIZE = 1 << 20
+# Sortedness is counted exactly up to EXACT_SORTEDNESS_MAX_ROWS rows, which holds each
+# column's values in memory; longer workloads (and the scale sweep) estimate it from
+# sampled pairs within this bound, so memory does not grow with the row count.
+SAMPLED_SORTEDNESS_ERROR_BOUND = 0.005
+EXACT_SORTEDNESS_MAX_ROWS = 1_000_000
+# Output formats of a generated workload; Arrow IPC is the staging format
+STREAMING_FORMATS = ("arrow", "parquet", "orc", "csv")
+# Skew parameters used when a config does not set them (see workload_config.distribution_params)
+DEFAULT_ZIPF_ALPHA = 1.5
+DEFAULT_HOTSPOT_RATIO = 0.1
+DEFAULT_HOT_FRACTION = 0.8
+DISTRIBUTION_DEFAULTS = {
+    'zipf_alpha': DEFAULT_ZIPF_ALPHA,
+    'hotspot_ratio': DEFAULT_HOTSPOT_RATIO,
+    'hot_fraction': DEFAULT_HOT_FRACTION,
+}
+SORTEDNESS_DEFAULTS = {
+    'sortedness_mode': 'global',
+    'run_length': 1 << 16,
+    'late_delay': 1 << 12,
+}
+# pyarrow's own default, for configs without `data.row_group_rows`
+DEFAULT_ROW_GROUP_ROWS = 1 << 20
+# How string columns are written: Arrow dictionary arrays with dictionary-encoded
+# Parquet/ORC pages, or plain strings with dictionary encoding turned off.
+STRING_ENCODINGS = ("dictionary", "plain")
+
+
+# Works one bit of the (dense, non-negative) ranks at a time from the most significant
+# down: within each group sharing the higher bits, every 1 before a 0 is an inversion;
+# the group is then stably partitioned on the bit for the next level.
+def _count_inversions(ranks: np.ndarray) -> int:
+    """Count pairs i < j with ranks[i] > ranks[j] in O(n log ndv)."""
+    a = np.asarray(ranks, dtype=np.int64)
+    n = len(a)
+    if n < 2:
+        return 0
+
+    inversions = 0
+    for bit_pos in range(int(a.max()).bit_length() - 1, -1, -1):
+        bit = (a >> bit_pos) & 1
+        prefix = a >> (bit_pos + 1)
+        new_group = np.empty(n, dtype=bool)
+        new_group[0] = True
+        np.not_equal(prefix[1:], prefix[:-1], out=new_group[1:])
+        starts = np.flatnonzero(new_group)
+        group = np.cumsum(new_group) - 1
+
+        ones_before = np.cumsum(bit) - bit
+        ones_before -= ones_before[starts][group]
+        inversions += int(ones_before[bit == 0].sum())
+
+        zeros = 1 - bit
+        zeros_before = np.cumsum(zeros) - zeros
+        zeros_in_group = np.add.reduceat(zeros, starts)
+        zeros_before -= zeros_before[starts][group]
+
+        new_pos = np.where(bit == 0,
+                           starts[group] + zeros_before,
+                           starts[group] + zeros_in_group[group] + ones_before)
+        partitioned = np.empty_like(a)
+        partitioned[new_pos] = a
+        a = partitioned
+
+    return inversions
+
+
+def calculate_sortedness(values: np.ndarray) -> float:
+    """Fraction of non-null value pairs in order (1.0 = sorted, 0.0 = reversed; ties count as in order)."""
+    ranks, _ = pd.factorize(values, sort=True)
+    ranks = ranks[ranks >= 0]
+    n = len(ranks)
+    max_inversions = n * (n - 1) // 2
+    if max_inversions == 0:
+        return 1.0
+    return 1.0 - _count_inversions(ranks) / max_inversions
+
+
+def _pairs_for_error_bound(error_bound: float, confidence: float) -> int:
+    """Number of sampled pairs for which Hoeffding's inequality guarantees the bound."""
+    if not 0 < error_bound < 1:
+        raise ValueError(f"error_bound must be in (0, 1), got {error_bound}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    return int(np.ceil(np.log(2 / (1 - confidence)) / (2 * error_bound ** 2)))
+
+
+def _count_inverted_pairs(first_values: np.ndarray, second_values: np.ndarray) -> Tuple[int, int]:
+    """Return (inverted, compared) over the pairs where neither value is null."""
+    ranks, _ = pd.factorize(np.concatenate([first_values, second_values]), sort=True)
+    first_ranks, second_ranks = ranks[:len(first_values)], ranks[len(first_values):]
+    non_null = (first_ranks >= 0) & (second_ranks >= 0)
+    return int((first_ranks[non_null] > second_ranks[non_null]).sum()), int(non_null.sum())
+
+
+def _widen_range(bounds: List[float], target: Optional[float]) -> List[float]:
+    if target is None:
+        return list(bounds)
+    return [min(bounds[0], target), max(bounds[1], target)]
+
+
+def workload_seed_sequence(workload: str) -> np.random.SeedSequence:
+    """Seed for a workload that is stable across processes (unlike hash(str))."""
+    return np.random.SeedSequence([BASE_SEED, zlib.crc32(workload.encode())])
+
+
+# Inverse CDFs of the value distributions: map u in [0, 1) to a value index in
+# [0, ndv). Sampling through them (rather than drawing values directly) lets the
+# streaming generator emit a globally sorted column one batch at a time by feeding
+# each batch its own slice of sorted u.
+
+def _uniform_inverse_cdf(u: np.ndarray, ndv: int) -> np.ndarray:
+    return np.minimum((u * ndv).astype(np.int64), ndv - 1)
+
+
+def _hotspot_inverse_cdf(u: np.ndarray, ndv: int, hotspot_ratio: float = DEFAULT_HOTSPOT_RATIO,
+                         hot_fraction: float = DEFAULT_HOT_FRACTION) -> np.ndarray:
+    """`hot_fraction` of the rows, interleaved, take one of the first `hotspot_ratio` of the values."""
+    hotspot_size = max(1, int(ndv * hotspot_ratio))
+    cold_size = ndv - hotspot_size
+    if cold_size <= 0:
+        return _uniform_inverse_cdf(u, ndv)
+    hot = u < hot_fraction
+    return np.where(
+        hot,
+        _uniform_inverse_cdf(u / hot_fraction, hotspot_size),
+        hotspot_size + _uniform_inverse_cdf((u - hot_fraction) / (1 - hot_fraction), cold_size)
+    )
+
+
+def _expm1_ratio(t: np.ndarray) -> np.ndarray:
+    """expm1(t) / t, continuous at t = 0."""
+    t = np.asarray(t, dtype=np.float64)
+    safe = np.where(np.abs(t) > 1e-8, t, 1.0)
+    return np.where(np.abs(t) > 1e-8, np.expm1(safe) / safe, 1.0 + t / 2)
+
+
+def _log1p_ratio(t: np.ndarray) -> np.ndarray:
+    """log1p(t) / t, continuous at t = 0."""
+    t = np.asarray(t, dtype=np.float64)
+    safe = np.where(np.abs(t) > 1e-8, t, 1.0)
+    return np.where(np.abs(t) > 1e-8, np.log1p(safe) / safe, 1.0 - t / 2)
+
+
+# The first `head` ranks use exact cumulative weights. The tail is inverted through H(x),
+# the integral of x^-alpha that rejection-inversion samplers (Hoermann and Derflinger) use
+# as their hat: rank k gets the mass of H over [k - 0.5, k + 0.5], with relative error
+# below alpha * (alpha + 1) / (24 * head^2). Rejection itself is not used, as it consumes
+# a variable number of uniforms per value and sorted slices need a monotone map from u.
+class _ZipfInverseCDF:
+    """Zipf(alpha) over ranks 1..ndv without a dense weight vector."""
+
+    def __init__(self, ndv: int, alpha: float = DEFAULT_ZIPF_ALPHA, head: int = 1 << 10):
+        if alpha <= 0:
+            raise ValueError(f"Zipf alpha must be positive, got {alpha}")
+        self.ndv = ndv
+        self.alpha = alpha
+        self.head = min(ndv, head)
+        self.head_cdf = np.cumsum(np.arange(1, self.head + 1, dtype=np.float64) ** -alpha)
+        self.tail_start = self.head + 0.5
+        tail_mass = 0.0
+        if ndv > self.head:
+            tail_mass = float(self._integral(ndv + 0.5) - self._integral(self.tail_start))
+        self.total = self.head_cdf[-1] + tail_mass
+
+    def _integral(self, x):
+        """H(x) = (x^(1 - alpha) - 1) / (1 - alpha), or log(x) at alpha = 1."""
+        log_x = np.log(x)
+        return log_x * _expm1_ratio((1 - self.alpha) * log_x)
+
+    def _inverse_integral(self, y):
+        return np.exp(y * _log1p_ratio((1 - self.alpha) * y))
+
+    def __call__(self, u: np.ndarray) -> np.ndarray:
+        mass = u * self.total
+        out = np.searchsorted(self.head_cdf, mass, side='right')
+        in_tail = out >= self.head
+        if in_tail.any():
+            remaining = mass[in_tail] - self.head_cdf[-1]
+            x = self._inverse_integral(self._integral(self.tail_start) + remaining)
+            out[in_tail] = np.floor(x - 0.5).astype(np.int64)
+        return np.minimum(out, self.ndv - 1)
+
+
+def random_mask(n: int, k: int, rng: np.random.Generator) -> np.ndarray:
+    """Boolean mask with exactly `k` uniformly placed True entries, without a permutation."""
+    if k > n // 2:
+        return ~random_mask(n, n - k, rng)
+    mask = np.zeros(n, dtype=bool)
+    count = 0
+    while count < k:
+        mask[rng.integers(0, n, k - count)] = True
+        count = np.count_nonzero(mask)
+    return mask
+
+
+def compact_codes(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(sorted distinct codes, each code's index among them), with memory following the batch size."""
+    used, indices = np.unique(codes, return_inverse=True)
+    return used, indices.reshape(-1)
+
+
+class NullInjector:
+    """Place exactly `n_nulls` nulls among `n_rows` rows, handed out batch by batch (hypergeometric per batch)."""
+
+    def __init__(self, n_rows: int, n_nulls: int, rng: np.random.Generator):
+        self.rows_left = n_rows
+        self.nulls_left = n_nulls
+        self.rng = rng
+
+    def next_mask(self, batch_rows: int) -> np.ndarray:
+        n_nulls = 0
+        if self.nulls_left > 0:
+            n_nulls = self.rng.hypergeometric(self.nulls_left, self.rows_left - self.nulls_left, batch_rows)
+        mask = random_mask(batch_rows, n_nulls, self.rng)
+        self.rows_left -= batch_rows
+        self.nulls_left -= n_nulls
+        return mask
+
+
+def string_width(ndv: int) -> int:
+    """Digits of the largest code, which every code is zero-padded to."""
+    return len(str(max(ndv - 1, 0)))
+
+
+def string_values(codes: np.ndarray, null_mask: Optional[np.ndarray] = None, width: int = 1) -> pa.Array:
+    """Build the 'str_<code>' column from integer codes, zero-padded to `width` so strings sort as codes."""
+    digits = pc.utf8_lpad(pc.cast(pa.array(codes, mask=null_mask), pa.string()), width=width, padding="0")
+    return pc.binary_join_element_wise("str_", digits, "")
+
+
+def dictionary_string_values(codes: np.ndarray, null_mask: Optional[np.ndarray] = None,
+                             width: int = 1) -> pa.DictionaryArray:
+    """Like string_values, but only the distinct codes are turned into strings."""
+    used, indices = compact_codes(codes)
+    return pa.DictionaryArray.from_arrays(pa.array(indices.astype(np.int32), mask=null_mask),
+                                          string_values(used, width=width))
+
+
+# A column's `sortedness` fraction of rows is laid out in order per `sortedness_mode`:
+# global takes the sorted quantiles falling on the row's position, runs does the same within
+# each `run_length` run, and late_arrivals uses the position of a row an exponential
+# `late_delay` rows earlier for the out-of-order rows. Sortedness is counted exactly over
+# the kept non-null values, or with `n_sortedness_pairs` estimated from random pairs drawn
+# from a child of `seed`, so both ways generate the same data.
+class _ColumnGenerator:
+    """Generation state for one column of a workload, producing it batch by batch."""
+
+    def __init__(self, workload: str, col_idx: int, n_rows: int, config: Dict,
+                 seed: np.random.SeedSequence, n_sortedness_pairs: Optional[int] = None,
+                 string_encoding: str = "dictionary", zone_rows: int = DEFAULT_ROW_GROUP_ROWS):
         ndv_min, ndv_max = config['characteristics']['ndv_range']
         null_min, null_max = config['characteristics']['null_range']
-        skew_types = config['characteristics']['skew_types']
-        
-        ndv_ratio = np.random.uniform(ndv_min, ndv_max)
-        ndv = max(1, int(n_rows * ndv_ratio))
-        null_ratio = np.random.uniform(null_min, null_max)
-        sortedness = np.random.uniform(0.0, 0.8)
-        
-        skew_type = np.random.choice(skew_types)
-        
-        if col_idx % 3 == 0:
-            dtype = 'float64'
-            if skew_type == 'zipf':
-                values = self.generate_zipf_distribution(n_rows, ndv).astype(float)
-            elif skew_type == 'hotspot':
-                values = self.generate_hotspot_distribution(n_rows, ndv).astype(float)
-            else:
-                values = self.generate_uniform_distribution(n_rows, ndv).astype(float)
-        elif col_idx % 3 == 1:
-            dtype = 'float64'
-            if skew_type == 'zipf':
-                base_values = self.generate_zipf_distribution(n_rows, ndv)
-                values = base_values.astype(float) + np.random.normal(0, 0.1, n_rows)
-            elif skew_type == 'hotspot':
-                base_values = self.generate_hotspot_distribution(n_rows, ndv)
-                values = base_values.astype(float) + np.random.normal(0, 0.1, n_rows)
-            else:
-                values = np.random.uniform(0, ndv, n_rows)
-        else:
-            dtype = 'object'
-            unique_vals = [f'str_{j}' for j in range(ndv)]
-            if skew_type == 'zipf':
-                indices = self.generate_zipf_distribution(n_rows, ndv)
-            elif skew_type == 'hotspot':
-                indices = self.generate_hotspot_distribution(n_rows, ndv)
-            else:
-                indices = self.generate_uniform_distribution(n_rows, ndv)
-            values = np.array([unique_vals[i] for i in indices])
-        
-        values = self.apply_sortedness(values, sortedness)
-        
-        if null_ratio > 0:
-            null_indices = np.random.choice(n_rows, size=int(n_rows * null_ratio), replace=False)
-            if dtype == 'object':
-                values[null_indices] = None
-            else:
-                values[null_indices] = np.nan
-        
-        metadata = {
+        spec = column_spec(config, col_idx)
+        rng = np.random.default_rng(seed)
+
+        # Every target is drawn even when the spec fixes it, so a spec on one column
+        # leaves the others' random streams (and values) untouched.
+        ndv_ratio = rng.uniform(ndv_min, ndv_max)
+        null_ratio = rng.uniform(null_min, null_max)
+        sortedness = rng.uniform(0.0, 0.8)
+        skew_type = str(rng.choice(config['characteristics']['skew_types']))
+
+        self.rng = rng
+        self.n_rows = n_rows
+        self.string_encoding = string_encoding
+        self.kind = spec.get('type', column_kind(col_idx))
+        self.ndv_ratio = spec.get('ndv_ratio', ndv_ratio)
+        self.ndv = max(1, int(n_rows * self.ndv_ratio))
+        self.string_width = string_width(self.ndv)
+        self.null_ratio = spec.get('null_ratio', null_ratio)
+        self.sortedness = spec.get('sortedness', sortedness)
+        self.skew_type = spec.get('distribution', skew_type)
+        params = distribution_params(config, col_idx, DISTRIBUTION_DEFAULTS)
+        layout = sortedness_params(config, col_idx, SORTEDNESS_DEFAULTS)
+        self.sortedness_mode = layout['sortedness_mode']
+        self.run_length = min(layout['run_length'], n_rows)
+        self.late_delay = layout['late_delay']
+        self.zone_rows = zone_rows
+        self.metadata = {
             'workload': workload,
             'column': col_idx,
-            'dtype': dtype,
-            'ndv_ratio': ndv_ratio,
-            'actual_ndv': len(np.unique(values[~pd.isna(values)])) if dtype != 'object' else len(set(v for v in values if v is not None)),
-            'null_ratio': null_ratio,
-            'actual_null_ratio': np.isnan(values).sum() / len(values) if dtype != 'object' else sum(1 for v in values if v is None) / len(values),
-            'skew_type': skew_type,
-            'sortedness': sortedness,
-            'actual_sortedness': self.calculate_sortedness(values)
+            'kind': self.kind,
+            'dtype': 'object' if self.kind == 'string' else 'float64',
+            'ndv_ratio': self.ndv_ratio,
+            'null_ratio': self.null_ratio,
+            'skew_type': self.skew_type,
+            'sortedness': self.sortedness,
+            'sortedness_mode': self.sortedness_mode,
         }
+        if self.sortedness_mode == 'runs':
+            self.metadata['run_length'] = self.run_length
+        elif self.sortedness_mode == 'late_arrivals':
+            self.metadata['late_delay'] = self.late_delay
+
+        if self.skew_type == 'zipf':
+            self.metadata['zipf_alpha'] = params['zipf_alpha']
+            self.inverse_cdf = _ZipfInverseCDF(self.ndv, params['zipf_alpha'])
+        elif self.skew_type == 'hotspot':
+            self.metadata.update({k: params[k] for k in ('hotspot_ratio', 'hot_fraction')})
+            self.inverse_cdf = lambda u: _hotspot_inverse_cdf(u, self.ndv, params['hotspot_ratio'],
+                                                              params['hot_fraction'])
+        else:
+            self.inverse_cdf = lambda u: _uniform_inverse_cdf(u, self.ndv)
+
+        self.nulls = NullInjector(n_rows, int(n_rows * self.null_ratio), rng)
+        self.n_null = 0
+        self.ndv_sketch = NDVSketch()
+        self.zone_mins = []
+        self.zone_maxs = []
+
+        self.sortedness_values = []
+        self.pair_positions = None
+        if n_sortedness_pairs is not None:
+            pair_rng = np.random.default_rng(seed.spawn(1)[0])
+            first = pair_rng.integers(0, n_rows, n_sortedness_pairs)
+            second = pair_rng.integers(0, n_rows, n_sortedness_pairs)
+            distinct = first != second
+            self.pair_first = np.minimum(first, second)[distinct]
+            self.pair_second = np.maximum(first, second)[distinct]
+            self.pair_positions = np.unique(np.concatenate([self.pair_first, self.pair_second]))
+            self.pair_values = np.empty(len(self.pair_positions), dtype=object)
+
+    def _ordered_quantiles(self, start: int, end: int) -> np.ndarray:
+        """Quantile u in [0, 1) of each row in the batch, laid out per sortedness_mode."""
+        batch_rows = end - start
+        u = self.rng.random(batch_rows)
+        if self.sortedness_mode == 'global':
+            in_order = self.rng.random(batch_rows) < self.sortedness
+            u[in_order] = np.sort(self.rng.uniform(start / self.n_rows, end / self.n_rows, in_order.sum()))
+            return u
+
+        rows = np.arange(start, end)
+        if self.sortedness_mode == 'runs':
+            # Row r of a run of length L draws from [r / L, (r + 1) / L): in order within the run
+            in_order = self.rng.random(batch_rows) < self.sortedness
+            positions = rows[in_order]
+            run_start = positions - positions % self.run_length
+            run_rows = np.minimum(self.run_length, self.n_rows - run_start)
+            u[in_order] = (positions - run_start + u[in_order]) / run_rows
+            return u
+
+        late = self.rng.random(batch_rows) >= self.sortedness
+        positions = rows.astype(np.float64)
+        positions[late] = np.maximum(positions[late] - self.rng.exponential(self.late_delay, late.sum()), 0)
+        return np.minimum((positions + u) / self.n_rows, np.nextafter(1.0, 0.0))
+
+    def _record_zones(self, values: np.ndarray, null_mask: np.ndarray):
+        """Min/max of each zone_rows slice of the batch (batches are written as whole row groups)."""
+        for offset in range(0, len(values), self.zone_rows):
+            zone = values[offset:offset + self.zone_rows][~null_mask[offset:offset + self.zone_rows]]
+            if not len(zone):
+                continue
+            if self.kind == 'string':
+                # Zero-padded strings sort as their codes do
+                bounds = string_values(np.array([zone.min(), zone.max()]), width=self.string_width)
+                self.zone_mins.append(bounds[0].as_py())
+                self.zone_maxs.append(bounds[1].as_py())
+            else:
+                self.zone_mins.append(float(zone.min()))
+                self.zone_maxs.append(float(zone.max()))
+
+    def next_batch(self, start: int, end: int) -> pa.Array:
+        batch_rows = end - start
+        u = self._ordered_quantiles(start, end)
+
+        if self.kind == 'noisy_float' and self.skew_type == 'uniform':
+            values = u * self.ndv
+        else:
+            values = self.inverse_cdf(u)
+            if self.kind == 'noisy_float':
+                values = values + self.rng.normal(0, 0.1, batch_rows)
+
+        null_mask = self.nulls.next_mask(batch_rows)
+        self.n_null += int(null_mask.sum())
+        self.ndv_sketch.update(values[~null_mask])
+        self._record_zones(values, null_mask)
+
+        if self.kind == 'string' and self.string_encoding == 'dictionary':
+            array = dictionary_string_values(values, null_mask, self.string_width)
+        elif self.kind == 'string':
+            array = string_values(values, null_mask, self.string_width)
+        else:
+            array = pa.array(values.astype(np.float64), mask=null_mask)
+
+        if self.pair_positions is None:
+            self.sortedness_values.append(values[~null_mask])
+        else:
+            lo, hi = np.searchsorted(self.pair_positions, [start, end])
+            self.pair_values[lo:hi] = array.take(self.pair_positions[lo:hi] - start).to_numpy(zero_copy_only=False)
+        return array
+
+    def _actual_sortedness(self, values: Optional[np.ndarray]) -> float:
+        if self.pair_positions is None:
+            return calculate_sortedness(values)
+
+        def lookup(positions):
+            return self.pair_values[np.searchsorted(self.pair_positions, positions)]
+
+        inverted, compared = _count_inverted_pairs(lookup(self.pair_first), lookup(self.pair_second))
+        return 1.0 - inverted / compared if compared else 1.0
+
+    def finish(self) -> Dict:
+        overlaps = zone_overlaps(self.zone_mins, self.zone_maxs)
+        # Exact sortedness keeps every non-null value, so the exact NDV comes with it;
+        # otherwise only the sketch's estimate is known.
+        values = None
+        if self.pair_positions is None:
+            values = np.concatenate(self.sortedness_values) if self.sortedness_values else np.empty(0)
+            self.sortedness_values = []
+
+        self.metadata.update({
+            'actual_ndv': len(pd.unique(values)) if values is not None else None,
+            'estimated_ndv': self.ndv_sketch.estimate(),
+            'ndv_error_bound': self.ndv_sketch.relative_error(),
+            'actual_null_ratio': self.n_null / self.n_rows,
+            'actual_sortedness': self._actual_sortedness(values),
+            'row_group_rows': self.zone_rows,
+            'row_group_overlap': overlaps.round(4).tolist(),
+            'mean_row_group_overlap': float(overlaps.mean()) if len(overlaps) > 1 else None,
+        })
+        return self.metadata
+
+
+class WorkloadGenerator:
+    """The one producer of datasets, writing configs/<workload>.yaml batch by batch to STREAMING_FORMATS."""
+
+    def __init__(self, config_dir: str = "configs", sortedness_error_bound: Optional[float] = None,
+                 n_rows: int = None, string_encoding: str = "dictionary", write_csv: bool = False):
+        if string_encoding not in STRING_ENCODINGS:
+            raise ValueError(f"Unsupported string encoding: {string_encoding}")
+        self.config_dir = config_dir
+        # None: the `data.rows` of each workload's config
+        self.n_rows = n_rows
+        self.string_encoding = string_encoding
+        self.write_csv = write_csv
+        # None: count each column's sortedness exactly up to EXACT_SORTEDNESS_MAX_ROWS rows;
+        # a bound in (0, 1): estimate it from sampled pairs, within the bound at 95%
+        # confidence, in bounded memory
+        self.sortedness_error_bound = sortedness_error_bound
+        self.workloads = list(WORKLOADS)
+        self.results = {}
         
-        return values, metadata
-    
-    def calculate_sortedness(self, values: np.ndarray) -> float:
-        if len(values) <= 1:
-            return 1.0
-        
-        sample_size = min(10000, len(values))
-        sample_indices = np.random.choice(len(values), size=sample_size, replace=False)
-        sample_values = values[sample_indices]
-        
-        sorted_sample = np.sort(sample_values)
-        inversions = 0
-        n = len(sample_values)
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                if sample_values[i] > sample_values[j]:
-                    inversions += 1
-        
-        max_inversions = n * (n - 1) // 2
-        if max_inversions == 0:
-            return 1.0
-        
-        return 1.0 - (inversions / max_inversions)
+    def load_config(self, workload: str) -> Dict:
+        config = load_workload_config(workload, self.config_dir)
+        if not config:
+            raise FileNotFoundError(os.path.join(self.config_dir, f"{workload}.yaml"))
+        return config
     
-    def generate_workload(self, workload: str, output_dir: str = "data") -> Dict:
+    def _parquet_use_dictionary(self, schema: pa.Schema):
+        """Parquet use_dictionary: everything, or only the non-string columns for plain strings."""
+        if self.string_encoding == 'dictionary':
+            return True
+        return [field.name for field in schema if not pa.types.is_string(field.type)]
+
+    def _string_type(self) -> pa.DataType:
+        return pa.dictionary(pa.int32(), pa.string()) if self.string_encoding == 'dictionary' else pa.string()
+
+    def _row_group_rows(self, config: Dict, n_rows: int, batch_size: int) -> int:
+        """Rows per Parquet row group as written: the config's size capped by the batch size and row count."""
+        return min(row_group_rows(config, DEFAULT_ROW_GROUP_ROWS), batch_size, n_rows)
+
+    def _sortedness_error_bound(self, n_rows: int) -> Optional[float]:
+        """The error bound sortedness is sampled within at `n_rows` rows; None when counted exactly."""
+        if self.sortedness_error_bound is None and n_rows > EXACT_SORTEDNESS_MAX_ROWS:
+            return SAMPLED_SORTEDNESS_ERROR_BOUND
+        return self.sortedness_error_bound
+
+    def _column_generator(self, workload: str, col_idx: int, n_rows: int, config: Dict,
+                          batch_size: int = DEFAULT_BATCH_SIZE) -> _ColumnGenerator:
+        """The generator of one column, on that column's own seeded random stream."""
+        n_pairs = None
+        error_bound = self._sortedness_error_bound(n_rows)
+        if error_bound:
+            n_pairs = _pairs_for_error_bound(error_bound, 0.95)
+        seed = workload_seed_sequence(workload).spawn(config['data']['columns'])[col_idx]
+        zone_rows = self._row_group_rows(config, n_rows, batch_size)
+        return _ColumnGenerator(workload, col_idx, n_rows, config, seed, n_pairs, self.string_encoding, zone_rows)
+
+    def _column_generators(self, workload: str, n_rows: int, config: Dict,
+                           batch_size: int = DEFAULT_BATCH_SIZE) -> List[_ColumnGenerator]:
+        return [self._column_generator(workload, col_idx, n_rows, config, batch_size)
+                for col_idx in range(config['data']['columns'])]
+
+    def write_column_stream(self, workload: str, col_idx: int, n_rows: int, path: str,
+                            batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+        """Generate one column into an Arrow IPC stream at `path` (a parallel run's task); returns its metadata."""
+        config = self.load_config(workload)
+        column = self._column_generator(workload, col_idx, n_rows, config, batch_size)
+        schema = pa.schema([(f'col_{col_idx}', self._string_type() if column.kind == 'string' else pa.float64())])
+        with pa.ipc.new_stream(path, schema) as writer:
+            for start in range(0, n_rows, batch_size):
+                end = min(start + batch_size, n_rows)
+                writer.write_batch(pa.RecordBatch.from_arrays([column.next_batch(start, end)], schema=schema))
+        return column.finish()
+
+    def submit_columns(self, executor: Executor, workload: str, n_rows: int = None, output_dir: str = "data",
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> List[Tuple[str, Future]]:
+        """Queue every column of a workload on `executor`; returns (stream path, metadata future) per column."""
+        config = self.load_config(workload)
+        n_rows = n_rows or self.n_rows or config['data']['rows']
+        os.makedirs(output_dir, exist_ok=True)
+        streams = []
+        for col_idx in range(config['data']['columns']):
+            path = os.path.join(output_dir, f".{workload}_r{n_rows}_col{col_idx}.arrows")
+            streams.append((path, executor.submit(self.write_column_stream, workload, col_idx, n_rows, path,
+                                                  batch_size)))
+        return streams
+
+    def _read_column_streams(self, sources: List[pa.NativeFile], names: List[str]):
+        """Zip the per-column streams back into record batches (their batch boundaries match)."""
+        readers = [pa.ipc.open_stream(source) for source in sources]
+        for parts in zip(*readers):
+            yield pa.RecordBatch.from_arrays([part.column(0) for part in parts], names=names)
+
+    def iter_workload_batches(self, workload: str, n_rows: int = None,
+                              batch_size: int = DEFAULT_BATCH_SIZE,
+                              columns: List[_ColumnGenerator] = None):
+        """Yield the workload as record batches of at most `batch_size` rows, in memory bounded by the batch."""
+        config = self.load_config(workload)
+        n_rows = n_rows or self.n_rows or config['data']['rows']
+        if columns is None:
+            columns = self._column_generators(workload, n_rows, config, batch_size)
+        names = [f'col_{i}' for i in range(len(columns))]
+
+        for start in range(0, n_rows, batch_size):
+            end = min(start + batch_size, n_rows)
+            yield pa.RecordBatch.from_arrays([c.next_batch(start, end) for c in columns], names=names)
+
+    def generate_workload(self, workload: str, output_dir: str = "data", n_rows: int = None,
+                          batch_size: int = DEFAULT_BATCH_SIZE,
+                          column_streams: List[Tuple[str, Future]] = None) -> Dict:
+        """Generate a workload into its staging (Arrow IPC) and Parquet files, plus CSV if asked for."""
+        formats = ("arrow", "parquet", "csv") if self.write_csv else ("arrow", "parquet")
+        return self.write_workload_streaming(workload, n_rows, output_dir, batch_size, formats, column_streams)
+
+    def write_workload_streaming(self, workload: str, n_rows: int = None, output_dir: str = "data",
+                                 batch_size: int = DEFAULT_BATCH_SIZE,
+                                 formats: tuple = ("parquet",),
+                                 column_streams: List[Tuple[str, Future]] = None) -> Dict:
+        """Generate a workload batch by batch (or read back `column_streams`), appending to every format."""
+        unknown = set(formats) - set(STREAMING_FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported formats: {sorted(unknown)}")
+
         config = self.load_config(workload)
-        n_rows = 1000
+        n_rows = n_rows or self.n_rows or config['data']['rows']
         n_cols = config['data']['columns']
-        
-        np.random.seed(42 + hash(workload) % 1000)
-        
-        data = {}
-        metadata_list = []
-        
-        for col_idx in range(n_cols):
-            col_name = f'col_{col_idx}'
-            values, metadata = self.generate_column(workload, col_idx, n_rows, config)
-            data[col_name] = values
-            metadata_list.append(metadata)
-        
-        df = pd.DataFrame(data)
-        
-        csv_path = os.path.join(output_dir, f"{workload}_r{n_rows}_c{n_cols}_generated.csv")
-        df.to_csv(csv_path, index=False)
-        
-        parquet_path = csv_path.replace('.csv', '.parquet')
-        df.to_parquet(parquet_path, index=False)
-        
+        zone_rows = self._row_group_rows(config, n_rows, batch_size)
+        kinds = column_kinds(config)
+        schema = pa.schema([(name, self._string_type() if kind == 'string' else pa.float64())
+                            for name, kind in kinds.items()])
+
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {fmt: dataset_path(output_dir, workload, n_rows, n_cols, fmt) for fmt in formats}
+        columns = None
+        sources = []
+        writers = {}
+        try:
+            if column_streams is None:
+                columns = self._column_generators(workload, n_rows, config, batch_size)
+                batches = self.iter_workload_batches(workload, n_rows, batch_size, columns)
+            else:
+                column_metadata = [future.result() for _, future in column_streams]
+                sources = [pa.memory_map(path) for path, _ in column_streams]
+                batches = self._read_column_streams(sources, schema.names)
+
+            if 'arrow' in paths:
+                # Every batch has its own string dictionary, which the IPC file format
+                # cannot replace mid-file, so the staging file holds plain strings.
+                writers['arrow'] = pa.ipc.new_file(paths['arrow'], decode_dictionaries(schema.empty_table()).schema)
+            if 'parquet' in paths:
+                writers['parquet'] = pq.ParquetWriter(paths['parquet'], schema,
+                                                      use_dictionary=self._parquet_use_dictionary(schema))
+            if 'orc' in paths:
+                writers['orc'] = orc.ORCWriter(
+                    paths['orc'],
+                    dictionary_key_size_threshold=orc_dictionary_threshold(self.string_encoding == 'dictionary')
+                )
+            if 'csv' in paths:
+                writers['csv'] = pa_csv.CSVWriter(paths['csv'], schema)
+
+            for batch in batches:
+                table = pa.Table.from_batches([batch])
+                for fmt, writer in writers.items():
+                    if fmt == 'parquet':
+                        # Row groups restart at every batch, matching the zones the columns record
+                        writer.write(table, row_group_size=zone_rows)
+                    else:
+                        writer.write(decode_dictionaries(table) if fmt in ('arrow', 'orc') else table)
+        finally:
+            for writer in writers.values():
+                writer.close()
+            for source in sources:
+                source.close()
+            for path, _ in column_streams or []:
+                if os.path.exists(path):
+                    os.remove(path)
+
         workload_metadata = {
             'workload': workload,
-            'shape': df.shape,
-            'csv_file': csv_path,
-            'parquet_file': parquet_path,
-            'columns': metadata_list,
-            'file_size_mb': os.path.getsize(parquet_path) / (1024 * 1024),
+            'shape': (n_rows, n_cols),
+            'string_encoding': self.string_encoding,
+            'sortedness_measurement': 'sampled' if self._sortedness_error_bound(n_rows) else 'exact',
+            'sortedness_error_bound': self._sortedness_error_bound(n_rows),
+            'row_group_rows': zone_rows,
+            'columns': [c.finish() for c in columns] if columns is not None else column_metadata,
             'config_used': config
         }
-        
+        for fmt, path in paths.items():
+            workload_metadata[f'{fmt}_file'] = path
+        size_path = paths.get('parquet', next(iter(paths.values())))
+        workload_metadata['file_size_mb'] = os.path.getsize(size_path) / (1024 * 1024)
+
         return workload_metadata
-    
-    def validate_distributions(self, metadata: Dict) -> Dict:
+
+    def validate_distributions(self, metadata: Dict, statistics: Dict = None) -> Dict:
+        """Check each column's NDV and null ratios against the config ranges, from metadata or `statistics`."""
         workload = metadata['workload']
         config = metadata['config_used']
-        expected_ndv_range = config['characteristics']['ndv_range']
-        expected_null_range = config['characteristics']['null_range']
         
         validation_results = {
             'workload': workload,
@@ -184,20 +650,33 @@ class WorkloadGenerator:
         }
         
         for col_meta in metadata['columns']:
-            ndv_valid = expected_ndv_range[0] <= col_meta['ndv_ratio'] <= expected_ndv_range[1]
-            null_valid = expected_null_range[0] <= col_meta['actual_null_ratio'] <= expected_null_range[1]
+            # A column spec may pin a ratio outside the workload-wide range
+            spec = column_spec(config, col_meta['column'])
+            expected_ndv_range = _widen_range(config['characteristics']['ndv_range'], spec.get('ndv_ratio'))
+            expected_null_range = _widen_range(config['characteristics']['null_range'], spec.get('null_ratio'))
+            ndv_ratio = col_meta['ndv_ratio']
+            null_ratio = col_meta['actual_null_ratio']
+            if statistics is not None:
+                col_stats = statistics['columns'][f"col_{col_meta['column']}"]
+                ndv_ratio = col_stats['ndv'] / statistics['num_rows']
+                null_ratio = col_stats['null_count'] / statistics['num_rows']
+
+            ndv_valid = expected_ndv_range[0] <= ndv_ratio <= expected_ndv_range[1]
+            if statistics is not None and col_meta['kind'] == 'noisy_float':
+                ndv_valid = True
+            null_valid = expected_null_range[0] <= null_ratio <= expected_null_range[1]
             
             validation_results['ndv_validations'].append({
                 'column': col_meta['column'],
                 'expected_range': expected_ndv_range,
-                'actual': col_meta['ndv_ratio'],
+                'actual': ndv_ratio,
                 'valid': ndv_valid
             })
             
             validation_results['null_validations'].append({
                 'column': col_meta['column'],
                 'expected_range': expected_null_range,
-                'actual': col_meta['actual_null_ratio'],
+                'actual': null_ratio,
                 'valid': null_valid
             })
             
@@ -206,31 +685,30 @@ class WorkloadGenerator:
         
         return validation_results
     
-    def generate_all_workloads(self, output_dir: str = "data") -> Dict:
+    def generate_all_workloads(self, output_dir: str = "data", n_rows: int = None,
+                               batch_size: int = DEFAULT_BATCH_SIZE, jobs: int = 1) -> Dict:
+        """Generate every workload in batches, each column its own pool task with `jobs` > 1."""
         os.makedirs(output_dir, exist_ok=True)
         
         all_results = {}
-        
-        for workload in self.workloads:
-            print(f"Generating {workload} workload...")
-            metadata = self.generate_workload(workload, output_dir)
-            validation = self.validate_distributions(metadata)
-            
-            all_results[workload] = {
-                'metadata': metadata,
-                'validation': validation
-            }
-            
-            print(f"  Shape: {metadata['shape']}")
-            print(f"  File size: {metadata['file_size_mb']:.2f} MB")
-            print(f"  Validation: {'PASSED' if validation['overall_valid'] else 'FAILED'}")
-            
-            if not validation['overall_valid']:
-                ndv_failures = sum(1 for v in validation['ndv_validations'] if not v['valid'])
-                null_failures = sum(1 for v in validation['null_validations'] if not v['valid'])
-                print(f"    NDV failures: {ndv_failures}/{len(validation['ndv_validations'])}")
-                print(f"    Null failures: {null_failures}/{len(validation['null_validations'])}")
-            print()
+        executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        pending = {}
+        try:
+            if executor is not None:
+                for workload in self.workloads:
+                    pending[workload] = self.submit_columns(executor, workload, n_rows, output_dir, batch_size)
+
+            for workload in self.workloads:
+                print(f"Generating {workload} workload...")
+                metadata = self.generate_workload(workload, output_dir, n_rows, batch_size, pending.get(workload))
+                all_results[workload] = self._report_workload(metadata)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+                # Streams of workloads an error kept from being written
+                for path, _ in (stream for streams in pending.values() for stream in streams):
+                    if os.path.exists(path):
+                        os.remove(path)
         
         results_file = os.path.join(output_dir, "workload_generation_results.json")
         with open(results_file, 'w') as f:
@@ -239,9 +717,61 @@ class WorkloadGenerator:
         print(f"Results saved to {results_file}")
         return all_results
 
+    def _report_workload(self, metadata: Dict) -> Dict:
+        validation = self.validate_distributions(metadata)
+        # Also caches the statistics sidecar the benchmark runner plans its queries from.
+        file_validation = None
+        if 'parquet_file' in metadata:
+            file_validation = self.validate_distributions(metadata, load_file_statistics(metadata['parquet_file']))
+        
+        print(f"  Shape: {metadata['shape']}")
+        print(f"  File size: {metadata['file_size_mb']:.2f} MB")
+        overlaps = [c['mean_row_group_overlap'] for c in metadata['columns']
+                    if c['mean_row_group_overlap'] is not None]
+        if overlaps:
+            print(f"  Row-group min/max overlap: {np.mean(overlaps):.2f} mean, {min(overlaps):.2f} min "
+                  f"({metadata['row_group_rows']:,} rows per row group)")
+        print(f"  Validation: {'PASSED' if validation['overall_valid'] else 'FAILED'}")
+        if file_validation is not None:
+            print(f"  File validation: {'PASSED' if file_validation['overall_valid'] else 'FAILED'}")
+        
+        if not validation['overall_valid']:
+            ndv_failures = sum(1 for v in validation['ndv_validations'] if not v['valid'])
+            null_failures = sum(1 for v in validation['null_validations'] if not v['valid'])
+            print(f"    NDV failures: {ndv_failures}/{len(validation['ndv_validations'])}")
+            print(f"    Null failures: {null_failures}/{len(validation['null_validations'])}")
+        print()
+        
+        return {
+            'metadata': metadata,
+            'validation': validation,
+            'file_validation': file_validation
+        }
+
 def main():
-    generator = WorkloadGenerator()
-    results = generator.generate_all_workloads()
+    parser = argparse.ArgumentParser(description="Generate benchmark workloads")
+    parser.add_argument("--output-dir", default="data")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Rows per workload (default: rows in each config)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Rows generated and written per batch")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Worker processes; output is identical to a serial run")
+    parser.add_argument("--string-encoding", choices=STRING_ENCODINGS, default="dictionary",
+                        help="Write string columns dictionary-encoded or plain")
+    parser.add_argument("--csv", action="store_true",
+                        help="Also write each workload as CSV")
+    parser.add_argument("--sortedness-error-bound", type=float, default=None,
+                        help="Estimate sortedness from sampled pairs within this bound instead of counting "
+                             "inversions exactly (which holds each column in memory; default: exact up to "
+                             f"{EXACT_SORTEDNESS_MAX_ROWS:,} rows, sampled within "
+                             f"{SAMPLED_SORTEDNESS_ERROR_BOUND} beyond)")
+    args = parser.parse_args()
+
+    generator = WorkloadGenerator(sortedness_error_bound=args.sortedness_error_bound,
+                                  string_encoding=args.string_encoding, write_csv=args.csv)
+    results = generator.generate_all_workloads(args.output_dir, n_rows=args.rows, batch_size=args.batch_size,
+                                               jobs=args.jobs)
     
     print("\n=== SUMMARY ===")
     total_valid = sum(1 for r in results.values() if r['validation']['overall_valid'])